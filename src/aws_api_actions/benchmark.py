@@ -0,0 +1,477 @@
+"""Scale scenarios crawling the synthetic documentation server.
+
+Each scenario serves a synthetic catalog ``scale`` times the size of today's
+with :mod:`aws_api_actions.mock_server`, scrapes it through the same pipeline
+as the ``scrape`` command, exports it, and reports the throughput and the
+memory used. Running the 1x, 10x and 100x scenarios shows where the scraper
+stops scaling before AWS grows the catalog that much.
+
+The memory reported is the peak resident set size of the process and of the
+parse processes. Peaks only grow within a process, so the scenarios are run
+from the smallest scale up.
+
+The browser backends can also be compared on the same server: the time each
+takes to start a webdriver, and to load and render a page in it.
+
+Usage example:
+    benchmark --scales 1 10 100 --latency 0.02 --report benchmark.json
+    benchmark --scales 1 --compare-backends firefox chromium --rendered 1
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from functools import partial
+from typing import (
+    Any,
+    Callable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from selenium.common.exceptions import WebDriverException
+
+from aws_api_actions.constants import BROWSER_BACKENDS, DEFAULT_BROWSER_BACKEND
+from aws_api_actions.exceptions import OutputError, ScrapingError
+from aws_api_actions.exporter import fan_out, get_sink, iter_records
+from aws_api_actions.fetcher import BrowserFetcher
+from aws_api_actions.logger import logger
+from aws_api_actions.mock_server import MockDocsServer, generate_catalog
+from aws_api_actions.pipeline import DEFAULT_FETCH_WORKERS, run_pipeline
+from aws_api_actions.profiling import Profiler
+from aws_api_actions.scraper import (
+    FetcherFactory,
+    create_fetcher,
+    scrape_service_urls,
+)
+
+
+# Approximate size of the Service Authorization Reference today.
+BASELINE_SERVICES = 400
+BASELINE_ACTIONS = 40
+DEFAULT_SCALES = (1, 10, 100)
+DEFAULT_OUTPUTS = ("actions.json.gz", "actions.csv.gz")
+# Webdrivers started, and pages loaded, to measure each browser backend.
+DEFAULT_BACKEND_RUNS = 3
+DEFAULT_BACKEND_PAGES = 20
+
+
+class ScenarioResult(NamedTuple):
+    """The measurements of a scenario."""
+
+    scale: int
+    services: int
+    pages: int
+    failed: int
+    seconds: float
+    pages_per_second: float
+    peak_rss_mb: float
+    peak_children_rss_mb: float
+
+
+class BackendResult(NamedTuple):
+    """The measurements of a browser backend, in seconds."""
+
+    backend: str
+    startup_mean: float
+    startup_min: float
+    pages: int
+    failed: int
+    page_mean: float
+    page_p95: float
+
+
+def get_peak_rss() -> Tuple[float, float]:
+    """Returns the peak RSS of the process and of its children, in MiB.
+
+    Returns:
+        Tuple[float, float]: The peaks, 0 where the platform doesn't report
+            them.
+    """
+    if sys.platform == "win32":
+        return 0.0, 0.0
+
+    import resource
+
+    # ru_maxrss is in KiB on Linux, and in bytes on macOS.
+    unit = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return (
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / unit,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / unit,
+    )
+
+
+def run_scenario(
+    scale: int,
+    services: int = BASELINE_SERVICES,
+    actions: int = BASELINE_ACTIONS,
+    latency: float = 0.0,
+    throttle: float = 0.0,
+    rendered: float = 0.0,
+    browser: bool = False,
+    browser_backend: str = DEFAULT_BROWSER_BACKEND,
+    fetch_workers: int = DEFAULT_FETCH_WORKERS,
+    parse_workers: Optional[int] = None,
+    outputs: Sequence[str] = DEFAULT_OUTPUTS,
+    profiler: Optional[Profiler] = None,
+) -> ScenarioResult:
+    """Scrape and export a synthetic catalog, measuring the run.
+
+    Args:
+        scale (int): The size of the catalog, as a multiple of ``services``.
+        services (int, optional): The number of services at scale 1.
+            Defaults to BASELINE_SERVICES.
+        actions (int, optional): The number of actions of each service.
+            Defaults to BASELINE_ACTIONS.
+        latency (float, optional): Delay of each response, in seconds.
+            Defaults to 0.
+        throttle (float, optional): Fraction of the requests throttled.
+            Defaults to 0.
+        rendered (float, optional): Fraction of the pages rendered
+            client-side. Defaults to 0.
+        browser (bool, optional): Whether to render those pages in a browser.
+            Defaults to False.
+        browser_backend (str, optional): The browser rendering them. Defaults
+            to DEFAULT_BROWSER_BACKEND.
+        fetch_workers (int, optional): The number of fetch threads. Defaults
+            to DEFAULT_FETCH_WORKERS.
+        parse_workers (Optional[int], optional): The number of parse
+            processes. Defaults to None, one per CPU.
+        outputs (Sequence[str], optional): The file names exported to.
+            Defaults to DEFAULT_OUTPUTS.
+        profiler (Optional[Profiler], optional): Profiler profiling each
+            stage, which slows the run down. Defaults to None.
+
+    Returns:
+        ScenarioResult: The measurements.
+    """
+    profiler = profiler or Profiler()
+    catalog = generate_catalog(services * scale, actions)
+    with MockDocsServer(
+        catalog, latency=latency, throttle=throttle, rendered=rendered
+    ) as server, tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        with FetcherFactory(
+            browser=browser, browser_backend=browser_backend
+        ) as fetcher_factory:
+            with profiler.stage("index"), fetcher_factory() as fetcher:
+                urls = scrape_service_urls(fetcher, server.url)
+
+            data, failed = run_pipeline(
+                fetcher_factory,
+                urls,
+                fetch_workers=fetch_workers,
+                parse_workers=parse_workers,
+                profiler=profiler,
+            )
+        with profiler.stage("export"):
+            fan_out(
+                iter_records(data),
+                [get_sink(os.path.join(directory, name)) for name in outputs],
+            )
+        seconds = time.perf_counter() - start
+
+    peak_rss, peak_children_rss = get_peak_rss()
+    return ScenarioResult(
+        scale=scale,
+        services=len(data),
+        pages=len(urls),
+        failed=len(failed),
+        seconds=seconds,
+        pages_per_second=len(urls) / seconds if seconds else 0.0,
+        peak_rss_mb=peak_rss,
+        peak_children_rss_mb=peak_children_rss,
+    )
+
+
+def measure_backend(
+    backend: str,
+    urls: Sequence[str],
+    runs: int = DEFAULT_BACKEND_RUNS,
+    driver_factory: Optional[Callable[[], Any]] = None,
+) -> BackendResult:
+    """Measure the startup and page load times of a browser backend.
+
+    Args:
+        backend (str): The name of the browser backend.
+        urls (Sequence[str]): The pages loaded, one after the other in the
+            same webdriver.
+        runs (int, optional): The number of webdrivers started to measure the
+            startup. Defaults to DEFAULT_BACKEND_RUNS.
+        driver_factory (Optional[Callable[[], Any]], optional): Function
+            creating the webdrivers. Defaults to None, in which case the
+            default webdriver of the backend is used.
+
+    Returns:
+        BackendResult: The measurements.
+
+    Raises:
+        WebDriverException: If the webdriver fails to start.
+    """
+    if driver_factory is None:
+        # Imported lazily, so HTTP-only runs never load selenium-wire.
+        from aws_api_actions.browser import setup_default_webdriver
+
+        driver_factory = partial(setup_default_webdriver, backend=backend)
+
+    from aws_api_actions.firefox_profile import measure_startup
+
+    startup = measure_startup(driver_factory, runs)
+
+    driver = driver_factory()
+    timings = []
+    with BrowserFetcher(driver_factory=lambda: driver) as fetcher:
+        for url in urls:
+            start = time.perf_counter()
+            try:
+                fetcher.fetch(url)
+            except ScrapingError as err:
+                logger.error("Failed to load %s: %s", url, err)
+                continue
+            timings.append(time.perf_counter() - start)
+
+    return BackendResult(
+        backend=backend,
+        startup_mean=statistics.mean(startup),
+        startup_min=min(startup),
+        pages=len(urls),
+        failed=len(urls) - len(timings),
+        page_mean=statistics.mean(timings) if timings else 0.0,
+        page_p95=(
+            statistics.quantiles(timings, n=20)[-1]
+            if len(timings) > 1
+            else sum(timings)
+        ),
+    )
+
+
+def compare_backends(
+    backends: Sequence[str],
+    urls: Sequence[str],
+    runs: int = DEFAULT_BACKEND_RUNS,
+) -> List[BackendResult]:
+    """Measure each browser backend, skipping those failing to start.
+
+    Args:
+        backends (Sequence[str]): The names of the browser backends.
+        urls (Sequence[str]): The pages loaded by each backend.
+        runs (int, optional): The number of webdrivers started to measure the
+            startup. Defaults to DEFAULT_BACKEND_RUNS.
+
+    Returns:
+        List[BackendResult]: The measurements of the backends that started.
+    """
+    results = []
+    for backend in backends:
+        logger.info("Measuring the %s backend", backend)
+        try:
+            results.append(measure_backend(backend, urls, runs))
+        except WebDriverException as err:
+            logger.error("Failed to start the %s backend: %s", backend, err)
+
+    return results
+
+
+def log_results(results: List[ScenarioResult]) -> None:
+    """Log the measurements of the scenarios as a table.
+
+    Args:
+        results (List[ScenarioResult]): The measurements.
+    """
+    logger.info(
+        "%6s %9s %7s %9s %10s %10s %12s",
+        "scale",
+        "pages",
+        "failed",
+        "seconds",
+        "pages/s",
+        "rss MiB",
+        "parse MiB",
+    )
+    for result in results:
+        logger.info(
+            "%5dx %9d %7d %9.1f %10.1f %10.0f %12.0f",
+            result.scale,
+            result.pages,
+            result.failed,
+            result.seconds,
+            result.pages_per_second,
+            result.peak_rss_mb,
+            result.peak_children_rss_mb,
+        )
+
+
+def log_backend_results(results: List[BackendResult]) -> None:
+    """Log the measurements of the browser backends as a table.
+
+    Args:
+        results (List[BackendResult]): The measurements.
+    """
+    logger.info(
+        "%10s %10s %10s %7s %7s %10s %10s",
+        "backend",
+        "startup s",
+        "min s",
+        "pages",
+        "failed",
+        "page s",
+        "p95 s",
+    )
+    for result in results:
+        logger.info(
+            "%10s %10.2f %10.2f %7d %7d %10.3f %10.3f",
+            result.backend,
+            result.startup_mean,
+            result.startup_min,
+            result.pages,
+            result.failed,
+            result.page_mean,
+            result.page_p95,
+        )
+
+
+def write_report(
+    file_path: str,
+    results: Union[List[ScenarioResult], List[BackendResult]],
+) -> None:
+    """Write the measurements of the scenarios, or of the backends, as json.
+
+    Args:
+        file_path (str): The path to the report file.
+        results (Union[List[ScenarioResult], List[BackendResult]]): The
+            measurements.
+
+    Raises:
+        OutputError: If the report cannot be written.
+    """
+    try:
+        with open(file_path, "w", encoding="utf-8") as file:
+            json.dump([result._asdict() for result in results], file, indent=4)
+    except OSError as err:
+        raise OutputError(f"Failed to write {file_path}: {err}") from err
+
+
+def _compare_backends(args: argparse.Namespace) -> None:
+    """Compare the browser backends on a server of ``--backend-pages``."""
+    catalog = generate_catalog(args.backend_pages, args.actions)
+    with MockDocsServer(
+        catalog, latency=args.latency, rendered=args.rendered
+    ) as server:
+        with create_fetcher(browser=False) as fetcher:
+            urls = scrape_service_urls(fetcher, server.url)
+
+        results = compare_backends(
+            args.compare_backends, urls, args.backend_runs
+        )
+
+    log_backend_results(results)
+    if args.backend_report is not None:
+        write_report(args.backend_report, results)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the scale scenarios and report their measurements.
+
+    Args:
+        argv (Optional[List[str]], optional): The command line arguments.
+            Defaults to None, in which case ``sys.argv`` is used.
+    """
+    parser = argparse.ArgumentParser(
+        description="Benchmark the scraper against a synthetic catalog."
+    )
+    parser.add_argument(
+        "--scales", type=int, nargs="+", default=list(DEFAULT_SCALES)
+    )
+    parser.add_argument("--services", type=int, default=BASELINE_SERVICES)
+    parser.add_argument("--actions", type=int, default=BASELINE_ACTIONS)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--throttle", type=float, default=0.0)
+    parser.add_argument("--rendered", type=float, default=0.0)
+    parser.add_argument(
+        "--browser",
+        action="store_true",
+        help="Render the client-side pages in a browser.",
+    )
+    parser.add_argument(
+        "--browser-backend",
+        choices=BROWSER_BACKENDS,
+        default=DEFAULT_BROWSER_BACKEND,
+    )
+    parser.add_argument(
+        "--fetch-workers", type=int, default=DEFAULT_FETCH_WORKERS
+    )
+    parser.add_argument("--parse-workers", type=int, default=None)
+    parser.add_argument("--report", default=None, help="JSON report file.")
+    parser.add_argument(
+        "--profile",
+        default=None,
+        metavar="DIR",
+        help="Directory to write a profile of each stage of each scenario to, "
+        "in a subdirectory per scale. Profiling slows the scenarios down.",
+    )
+    parser.add_argument(
+        "--compare-backends",
+        nargs="+",
+        choices=BROWSER_BACKENDS,
+        default=[],
+        metavar="BACKEND",
+        help="Compare the startup and page load times of browser backends.",
+    )
+    parser.add_argument(
+        "--backend-runs",
+        type=int,
+        default=DEFAULT_BACKEND_RUNS,
+        help="Webdrivers started to measure the startup of each backend.",
+    )
+    parser.add_argument(
+        "--backend-pages",
+        type=int,
+        default=DEFAULT_BACKEND_PAGES,
+        help="Pages loaded to measure the page load time of each backend.",
+    )
+    parser.add_argument(
+        "--backend-report",
+        default=None,
+        help="JSON report file of the backend comparison.",
+    )
+    args = parser.parse_args(argv)
+
+    results = []
+    for scale in sorted(args.scales):
+        logger.info("Running the %dx scenario", scale)
+        profiler = Profiler(
+            None
+            if args.profile is None
+            else os.path.join(args.profile, f"{scale}x")
+        )
+        results.append(
+            run_scenario(
+                scale,
+                services=args.services,
+                actions=args.actions,
+                latency=args.latency,
+                throttle=args.throttle,
+                rendered=args.rendered,
+                browser=args.browser,
+                browser_backend=args.browser_backend,
+                fetch_workers=args.fetch_workers,
+                parse_workers=args.parse_workers,
+                profiler=profiler,
+            )
+        )
+        profiler.write()
+
+    log_results(results)
+    if args.report is not None:
+        write_report(args.report, results)
+
+    if args.compare_backends:
+        _compare_backends(args)
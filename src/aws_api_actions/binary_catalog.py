@@ -0,0 +1,395 @@
+"""Compact binary catalog format that can be queried without parsing.
+
+The catalog stores the ``service -> category -> values`` data as three sorted,
+fixed-size record tables and a deduplicated UTF-8 string table, so a reader can
+``mmap`` the file and binary search it directly instead of deserializing the
+whole dataset on every process start.
+
+File layout (all integers are little-endian unsigned 32-bit):
+
+    - Header: magic ``AWSC``, version, service count, category count, value
+      count, and the offset of the string table.
+    - Service records, sorted by name.
+    - Category records, grouped by service and sorted by name.
+    - Value records, grouped by category and sorted by name.
+    - String table.
+
+Every record is ``(name offset, name length, first child, child count)``, where
+the children of a service are its categories and the children of a category
+are its values. Names are sorted by their UTF-8 bytes, which matches the code
+point order of the decoded strings. Duplicate values are kept, so reading a
+catalog back yields the same values as the other formats, only sorted.
+
+Usage example:
+    write_binary_catalog("actions.bin", data)
+
+    with BinaryCatalog("actions.bin") as catalog:
+        catalog.has_value("s3", "actions", "GetObject")
+"""
+
+import mmap
+import struct
+from types import TracebackType
+from typing import Dict, List, Optional, Tuple, Type
+
+from aws_api_actions.compression import COMPRESSION_NONE, get_compression
+from aws_api_actions.exceptions import OutputError, ParsingError
+
+
+MAGIC = b"AWSC"
+VERSION = 1
+HEADER = struct.Struct("<4sIIIII")
+RECORD = struct.Struct("<IIII")
+
+
+class _StringTable:
+    """Deduplicating UTF-8 string table used while writing a catalog."""
+
+    def __init__(self) -> None:
+        """Initialize an empty string table."""
+        self._buffer = bytearray()
+        self._offsets: Dict[bytes, int] = {}
+
+    def add(self, value: bytes) -> Tuple[int, int]:
+        """Add the value to the table and return its offset and length."""
+        offset = self._offsets.get(value)
+        if offset is None:
+            offset = len(self._buffer)
+            self._offsets[value] = offset
+            self._buffer += value
+
+        return offset, len(value)
+
+    def to_bytes(self) -> bytes:
+        """Return the contents of the table."""
+        return bytes(self._buffer)
+
+
+def write_binary_catalog(
+    file_path: str, data: Dict[str, Dict[str, List[str]]]
+) -> None:
+    """Write the data as a binary catalog.
+
+    Args:
+        file_path (str): The path to the file to write to.
+        data (Dict[str, Dict[str, List[str]]]): The data to export.
+    """
+    strings = _StringTable()
+    services: List[bytes] = []
+    categories: List[bytes] = []
+    values: List[bytes] = []
+
+    for service in sorted(data, key=_encode):
+        categories_start = len(categories)
+        service_categories = data[service]
+
+        for category in sorted(service_categories, key=_encode):
+            category_values = sorted(service_categories[category], key=_encode)
+            values_start = len(values)
+
+            for value in category_values:
+                values.append(RECORD.pack(*strings.add(_encode(value)), 0, 0))
+
+            categories.append(
+                RECORD.pack(
+                    *strings.add(_encode(category)),
+                    values_start,
+                    len(category_values),
+                )
+            )
+
+        services.append(
+            RECORD.pack(
+                *strings.add(_encode(service)),
+                categories_start,
+                len(service_categories),
+            )
+        )
+
+    strings_offset = HEADER.size + RECORD.size * (
+        len(services) + len(categories) + len(values)
+    )
+
+    with open(file_path, "wb") as file:
+        file.write(
+            HEADER.pack(
+                MAGIC,
+                VERSION,
+                len(services),
+                len(categories),
+                len(values),
+                strings_offset,
+            )
+        )
+        file.writelines(services)
+        file.writelines(categories)
+        file.writelines(values)
+        file.write(strings.to_bytes())
+
+
+def _encode(value: str) -> bytes:
+    """Return the UTF-8 encoding used for sorting and storing names."""
+    return value.encode("utf-8")
+
+
+class BinaryCatalog:
+    """Read-only, memory-mapped view of a binary catalog."""
+
+    def __init__(self, file_path: str) -> None:
+        """Map the catalog file into memory.
+
+        Args:
+            file_path (str): The path to the catalog file.
+
+        Raises:
+            ParsingError: If the file is not a valid binary catalog.
+        """
+        self.file_path = file_path
+
+        with open(file_path, "rb") as file:
+            try:
+                self._mmap = mmap.mmap(
+                    file.fileno(), 0, access=mmap.ACCESS_READ
+                )
+            except ValueError as err:
+                raise ParsingError(
+                    f"Empty binary catalog: {file_path}"
+                ) from err
+
+        if len(self._mmap) < HEADER.size:
+            self.close()
+            raise ParsingError(f"Truncated binary catalog: {file_path}")
+
+        (
+            magic,
+            version,
+            self._service_count,
+            self._category_count,
+            self._value_count,
+            self._strings_offset,
+        ) = HEADER.unpack_from(self._mmap, 0)
+
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ParsingError(f"Not a binary catalog: {file_path}")
+
+        self._services_offset = HEADER.size
+        self._categories_offset = (
+            self._services_offset + self._service_count * RECORD.size
+        )
+        self._values_offset = (
+            self._categories_offset + self._category_count * RECORD.size
+        )
+
+        if self._strings_offset != (
+            self._values_offset + self._value_count * RECORD.size
+        ) or self._strings_offset > len(self._mmap):
+            self.close()
+            raise ParsingError(f"Truncated binary catalog: {file_path}")
+
+    def __enter__(self) -> "BinaryCatalog":
+        """Return the catalog for use as a context manager."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Unmap the catalog when leaving the context."""
+        self.close()
+
+    def close(self) -> None:
+        """Unmap the catalog file."""
+        self._mmap.close()
+
+    def _record(
+        self, table_offset: int, index: int
+    ) -> Tuple[int, int, int, int]:
+        """Return the record at the given index of a table."""
+        record: Tuple[int, int, int, int] = RECORD.unpack_from(
+            self._mmap, table_offset + index * RECORD.size
+        )
+        return record
+
+    def _children(
+        self, record: Tuple[int, int, int, int], table_count: int
+    ) -> Tuple[int, int]:
+        """Return the range of the children of a record, within their table."""
+        start, count = record[2], record[3]
+        if start + count > table_count:
+            raise ParsingError(f"Corrupt binary catalog: {self.file_path}")
+
+        return start, count
+
+    def _name(self, record: Tuple[int, int, int, int]) -> bytes:
+        """Return the raw name of a record from the string table."""
+        start = self._strings_offset + record[0]
+        end = start + record[1]
+        if end > len(self._mmap):
+            raise ParsingError(f"Truncated binary catalog: {self.file_path}")
+
+        return self._mmap[start:end]
+
+    def _names(self, table_offset: int, start: int, count: int) -> List[str]:
+        """Return the decoded names of a range of records."""
+        return [
+            self._name(self._record(table_offset, index)).decode("utf-8")
+            for index in range(start, start + count)
+        ]
+
+    def _search(
+        self, table_offset: int, start: int, count: int, name: str
+    ) -> Optional[Tuple[int, int, int, int]]:
+        """Binary search a range of records for the given name."""
+        target = _encode(name)
+        low, high = start, start + count
+
+        while low < high:
+            middle = (low + high) // 2
+            record = self._record(table_offset, middle)
+            current = self._name(record)
+
+            if current == target:
+                return record
+            if current < target:
+                low = middle + 1
+            else:
+                high = middle
+
+        return None
+
+    def _category(
+        self, service: str, category: str
+    ) -> Optional[Tuple[int, int, int, int]]:
+        """Return the record of a category of a service."""
+        service_record = self._search(
+            self._services_offset, 0, self._service_count, service
+        )
+        if service_record is None:
+            return None
+
+        return self._search(
+            self._categories_offset,
+            *self._children(service_record, self._category_count),
+            category,
+        )
+
+    def services(self) -> List[str]:
+        """Return the names of all the services.
+
+        Returns:
+            List[str]: The sorted service names.
+        """
+        return self._names(self._services_offset, 0, self._service_count)
+
+    def has_service(self, service: str) -> bool:
+        """Check whether the catalog contains the service.
+
+        Args:
+            service (str): The service name.
+
+        Returns:
+            bool: Whether the service exists.
+        """
+        return (
+            self._search(self._services_offset, 0, self._service_count, service)
+            is not None
+        )
+
+    def categories(self, service: str) -> List[str]:
+        """Return the names of the categories of a service.
+
+        Args:
+            service (str): The service name.
+
+        Returns:
+            List[str]: The sorted category names, empty if the service does
+                not exist.
+        """
+        record = self._search(
+            self._services_offset, 0, self._service_count, service
+        )
+        if record is None:
+            return []
+
+        return self._names(
+            self._categories_offset,
+            *self._children(record, self._category_count),
+        )
+
+    def values(self, service: str, category: str) -> List[str]:
+        """Return the values of a category of a service.
+
+        Args:
+            service (str): The service name.
+            category (str): The category name.
+
+        Returns:
+            List[str]: The sorted values, empty if the category does not
+                exist.
+        """
+        record = self._category(service, category)
+        if record is None:
+            return []
+
+        return self._names(
+            self._values_offset, *self._children(record, self._value_count)
+        )
+
+    def has_value(self, service: str, category: str, value: str) -> bool:
+        """Check whether a category of a service contains the value.
+
+        Args:
+            service (str): The service name.
+            category (str): The category name.
+            value (str): The value to look up.
+
+        Returns:
+            bool: Whether the value exists.
+        """
+        record = self._category(service, category)
+        if record is None:
+            return False
+
+        return (
+            self._search(
+                self._values_offset,
+                *self._children(record, self._value_count),
+                value,
+            )
+            is not None
+        )
+
+    def to_dict(self) -> Dict[str, Dict[str, List[str]]]:
+        """Deserialize the whole catalog.
+
+        Returns:
+            Dict[str, Dict[str, List[str]]]: The catalog data.
+        """
+        return {
+            service: {
+                category: self.values(service, category)
+                for category in self.categories(service)
+            }
+            for service in self.services()
+        }
+
+
+def check_uncompressed(file_path: str, compression: Optional[str]) -> None:
+    """Ensure a binary catalog is not requested with compression.
+
+    Args:
+        file_path (str): The path to the catalog file.
+        compression (Optional[str]): The requested compression codec.
+
+    Raises:
+        OutputError: If compression was requested, since compressed catalogs
+            cannot be memory-mapped.
+    """
+    if get_compression(file_path, compression) != COMPRESSION_NONE:
+        raise OutputError(
+            f"Binary catalogs cannot be compressed, they are memory-mapped: "
+            f"{file_path}"
+        )
@@ -0,0 +1,404 @@
+"""Permission sets of the catalog actions, encoded as bitsets.
+
+Comparing the permissions of thousands of roles as Python sets of action
+strings is slow and takes a lot of memory. Instead, the ``ActionIndex`` gives
+each action of the catalog a stable integer ID, and a ``PermissionSet`` is an
+``int`` with the bit of each of its actions set. Union, intersection and
+difference are then single big-integer operations, and the size of a set is a
+population count. Over the ~15k actions of the catalog, a set takes ~2 KB.
+
+IDs are never reassigned: actions new to a catalog get the next IDs and
+removed actions keep theirs, so sets computed against an older catalog stay
+valid once the index is saved and loaded again.
+
+Usage example:
+    index = ActionIndex.load("actions.idx.json")
+    index.update(data)
+    granted = index.from_policy(policy) | index.from_patterns(["s3:Get*"])
+    writes = index.from_category(data, "access_level:write")
+    print(len(granted & writes), sorted(granted - used))
+"""
+
+import json
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Pattern,
+)
+
+from aws_api_actions.catalog import compile_wildcard, split_action
+from aws_api_actions.compression import (
+    get_decompression_errors,
+    open_compressed,
+)
+from aws_api_actions.constants import ACTIONS_CATEGORY
+from aws_api_actions.exceptions import OutputError, ParsingError
+
+
+class PermissionSet:
+    """Immutable set of actions of an ``ActionIndex``, backed by an int."""
+
+    __slots__ = ("index", "bits")
+
+    def __init__(self, index: "ActionIndex", bits: int = 0) -> None:
+        """Initialize the set.
+
+        Args:
+            index (ActionIndex): The index giving the action of each bit.
+            bits (int, optional): The bits of the actions. Defaults to 0, the
+                empty set.
+        """
+        self.index = index
+        self.bits = bits
+
+    def _check(self, other: Any) -> int:
+        """Returns the bits of another set of the same index."""
+        if not isinstance(other, PermissionSet):
+            raise TypeError(f"Not a PermissionSet: {other!r}")
+        if other.index is not self.index:
+            raise ValueError("Permission sets of different indexes")
+
+        return other.bits
+
+    def __or__(self, other: "PermissionSet") -> "PermissionSet":
+        """Returns the union of the sets."""
+        return PermissionSet(self.index, self.bits | self._check(other))
+
+    def __and__(self, other: "PermissionSet") -> "PermissionSet":
+        """Returns the intersection of the sets."""
+        return PermissionSet(self.index, self.bits & self._check(other))
+
+    def __sub__(self, other: "PermissionSet") -> "PermissionSet":
+        """Returns the actions of this set missing from the other."""
+        return PermissionSet(self.index, self.bits & ~self._check(other))
+
+    def __xor__(self, other: "PermissionSet") -> "PermissionSet":
+        """Returns the actions in either set but not in both."""
+        return PermissionSet(self.index, self.bits ^ self._check(other))
+
+    def __le__(self, other: "PermissionSet") -> bool:
+        """Check whether this set is a subset of the other."""
+        return self.bits & ~self._check(other) == 0
+
+    def __ge__(self, other: "PermissionSet") -> bool:
+        """Check whether this set is a superset of the other."""
+        return self._check(other) & ~self.bits == 0
+
+    def __eq__(self, other: object) -> bool:
+        """Check whether both sets hold the same actions of the same index."""
+        if not isinstance(other, PermissionSet):
+            return NotImplemented
+
+        return self.index is other.index and self.bits == other.bits
+
+    def __hash__(self) -> int:
+        """Returns the hash of the bits."""
+        return hash(self.bits)
+
+    def __len__(self) -> int:
+        """Returns the number of actions, a population count."""
+        return self.bits.bit_count()
+
+    def __bool__(self) -> bool:
+        """Check whether the set holds any action."""
+        return self.bits != 0
+
+    def __contains__(self, action: object) -> bool:
+        """Check whether the set holds an action, case-insensitively."""
+        if not isinstance(action, str):
+            return False
+
+        action_id = self.index.get_id(action)
+        return action_id is not None and bool(self.bits >> action_id & 1)
+
+    def __iter__(self) -> Iterator[str]:
+        """Yield the actions, in the order of their IDs."""
+        return (self.index.actions[action_id] for action_id in self.ids())
+
+    def __repr__(self) -> str:
+        """Returns a short description of the set."""
+        return f"<PermissionSet of {len(self)} actions>"
+
+    def ids(self) -> Iterator[int]:
+        """Yield the IDs of the actions, in increasing order.
+
+        Yields:
+            int: The action IDs.
+        """
+        bits = self.bits
+        while bits:
+            lowest = bits & -bits
+            yield lowest.bit_length() - 1
+            bits ^= lowest
+
+
+class ActionIndex:
+    """Stable assignment of integer IDs to the actions of the catalog."""
+
+    def __init__(self, actions: Optional[Iterable[str]] = None) -> None:
+        """Initialize the index.
+
+        Args:
+            actions (Optional[Iterable[str]], optional): The actions, as
+                ``service:Action``, in the order of their IDs. Defaults to
+                None, an empty index.
+        """
+        self.actions: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._patterns: Dict[str, int] = {}
+        for action in actions or []:
+            self.add(action)
+
+    def __len__(self) -> int:
+        """Returns the number of actions."""
+        return len(self.actions)
+
+    def __contains__(self, action: object) -> bool:
+        """Check whether an action has an ID, case-insensitively."""
+        return isinstance(action, str) and action.lower() in self._ids
+
+    def add(self, action: str) -> int:
+        """Returns the ID of an action, assigning the next one if it's new.
+
+        Args:
+            action (str): The action, as ``service:Action``.
+
+        Returns:
+            int: The ID.
+        """
+        key = action.lower()
+        action_id = self._ids.get(key)
+        if action_id is None:
+            action_id = self._ids[key] = len(self.actions)
+            self.actions.append(action)
+            self._patterns.clear()
+
+        return action_id
+
+    def update(self, data: Dict[str, Dict[str, List[str]]]) -> int:
+        """Assign IDs to the actions of the catalog without one.
+
+        The new actions get the next IDs in sorted order, so indexes updated
+        with the same catalogs agree.
+
+        Args:
+            data (Dict[str, Dict[str, List[str]]]): The catalog data.
+
+        Returns:
+            int: The number of actions added.
+        """
+        count = len(self)
+        for action in sorted(
+            f"{service}:{name}"
+            for service, categories in data.items()
+            for name in categories.get(ACTIONS_CATEGORY, [])
+        ):
+            self.add(action)
+
+        return len(self) - count
+
+    def get_id(self, action: str) -> Optional[int]:
+        """Returns the ID of an action, case-insensitively.
+
+        Args:
+            action (str): The action, as ``service:Action``.
+
+        Returns:
+            Optional[int]: The ID, or None if the action has none.
+        """
+        return self._ids.get(action.lower())
+
+    def empty(self) -> PermissionSet:
+        """Returns the empty set."""
+        return PermissionSet(self)
+
+    def universe(self) -> PermissionSet:
+        """Returns the set of every action of the index."""
+        return PermissionSet(self, (1 << len(self)) - 1)
+
+    def from_actions(self, actions: Iterable[str]) -> PermissionSet:
+        """Returns the set of the given actions.
+
+        Args:
+            actions (Iterable[str]): The actions, as ``service:Action``.
+
+        Returns:
+            PermissionSet: The set, without the actions missing from the
+                index.
+        """
+        bits = 0
+        for action in actions:
+            action_id = self.get_id(action)
+            if action_id is not None:
+                bits |= 1 << action_id
+
+        return PermissionSet(self, bits)
+
+    def _match(self, pattern: str) -> int:
+        """Returns the bits of the actions matching a wildcard pattern."""
+        bits = self._patterns.get(pattern)
+        if bits is not None:
+            return bits
+
+        service_pattern, name_pattern = (
+            compile_wildcard(part) for part in split_action(pattern)
+        )
+        bits = 0
+        for action_id, action in enumerate(self.actions):
+            if _fullmatch(service_pattern, name_pattern, action):
+                bits |= 1 << action_id
+
+        self._patterns[pattern] = bits
+        return bits
+
+    def from_patterns(self, patterns: Iterable[str]) -> PermissionSet:
+        """Returns the set of the actions matching IAM action patterns.
+
+        The actions matched by each pattern are cached, as the same patterns
+        come up in many policies.
+
+        Args:
+            patterns (Iterable[str]): The patterns, e.g. ``s3:Get*``.
+
+        Returns:
+            PermissionSet: The set.
+
+        Raises:
+            ParsingError: If a pattern is not a valid action pattern.
+        """
+        bits = 0
+        for pattern in patterns:
+            bits |= self._match(pattern)
+
+        return PermissionSet(self, bits)
+
+    def from_category(
+        self, data: Dict[str, Dict[str, List[str]]], category: str
+    ) -> PermissionSet:
+        """Returns the set of the actions of a category of the catalog.
+
+        Args:
+            data (Dict[str, Dict[str, List[str]]]): The catalog data.
+            category (str): The category listing action names, e.g.
+                ``access_level:write``.
+
+        Returns:
+            PermissionSet: The set.
+        """
+        return self.from_actions(
+            f"{service}:{name}"
+            for service, categories in data.items()
+            for name in categories.get(category, [])
+        )
+
+    def _statement_bits(self, statement: Dict[str, Any]) -> int:
+        """Returns the bits of the actions a policy statement applies to."""
+        if "NotAction" in statement:
+            patterns = _to_list(statement["NotAction"])
+            return self.universe().bits & ~self.from_patterns(patterns).bits
+
+        return self.from_patterns(_to_list(statement.get("Action", []))).bits
+
+    def from_policy(self, policy: Dict[str, Any]) -> PermissionSet:
+        """Returns the set of the actions an IAM policy document allows.
+
+        The actions of the ``Allow`` statements, minus those of the ``Deny``
+        statements without conditions. Resources and conditions are ignored,
+        so this is an upper bound of what the policy grants.
+
+        Args:
+            policy (Dict[str, Any]): The policy document.
+
+        Returns:
+            PermissionSet: The set.
+
+        Raises:
+            ParsingError: If the document or an action pattern is invalid.
+        """
+        statements = policy.get("Statement", [])
+        if isinstance(statements, dict):
+            statements = [statements]
+        if not isinstance(statements, list):
+            raise ParsingError("Invalid policy: Statement is not a list")
+
+        allowed = denied = 0
+        for statement in statements:
+            effect = statement.get("Effect")
+            if effect == "Allow":
+                allowed |= self._statement_bits(statement)
+            elif effect == "Deny" and "Condition" not in statement:
+                denied |= self._statement_bits(statement)
+
+        return PermissionSet(self, allowed & ~denied)
+
+    def save(self, file_path: str) -> None:
+        """Write the actions in the order of their IDs, as json.
+
+        Args:
+            file_path (str): The path to the index file, compressed according
+                to its extension.
+
+        Raises:
+            OutputError: If the index cannot be written.
+        """
+        try:
+            with open_compressed(file_path, "w") as file:
+                json.dump(self.actions, file, indent=0)
+        except OSError as err:
+            raise OutputError(f"Failed to write {file_path}: {err}") from err
+
+    @classmethod
+    def load(cls, file_path: str) -> "ActionIndex":
+        """Read an index written by ``save``.
+
+        Args:
+            file_path (str): The path to the index file.
+
+        Returns:
+            ActionIndex: The index.
+
+        Raises:
+            ParsingError: If the file is not a readable index.
+        """
+        try:
+            with open_compressed(file_path) as file:
+                actions = json.load(file)
+        except (OSError, json.JSONDecodeError) as err:
+            raise ParsingError(
+                f"Invalid action index {file_path}: {err}"
+            ) from err
+        except get_decompression_errors() as err:
+            raise ParsingError(
+                f"Invalid action index {file_path}: {err}"
+            ) from err
+
+        if not isinstance(actions, list) or not all(
+            isinstance(action, str) for action in actions
+        ):
+            raise ParsingError(f"Invalid action index {file_path}")
+
+        return cls(actions)
+
+
+def _to_list(value: Any) -> List[str]:
+    """Returns a policy element, a string or a list of strings, as a list."""
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, list) and all(isinstance(v, str) for v in value):
+        return value
+
+    raise ParsingError(f"Invalid policy element: {value!r}")
+
+
+def _fullmatch(
+    service_pattern: Pattern[str], name_pattern: Pattern[str], action: str
+) -> bool:
+    """Check whether an action matches the parts of an action pattern."""
+    service, _, name = action.partition(":")
+    return bool(
+        service_pattern.fullmatch(service) and name_pattern.fullmatch(name)
+    )
@@ -0,0 +1,369 @@
+"""Functions to create and drive the Selenium webdriver.
+
+The webdriver can drive one of two browser backends:
+
+    - ``firefox``: Firefox through geckodriver, the default.
+    - ``chromium``: Headless Chromium or Chrome through chromedriver, which
+      starts faster and uses less memory on Linux.
+
+Each backend finds its browser and driver binaries and starts the webdriver
+with its own options. More backends can be added with
+``register_browser_backend``.
+"""
+
+import abc
+import shutil
+import weakref
+from typing import Any, Dict, List, Optional, Type
+
+from selenium.webdriver.chrome.service import Service as ChromiumService
+from selenium.webdriver.firefox.service import Service
+
+# from selenium import webdriver
+from seleniumwire import webdriver
+
+from aws_api_actions.chromedriver import (
+    get_chromedriver_binary_path,
+    install_chromedriver,
+    is_chromedriver_installed,
+)
+from aws_api_actions.constants import (
+    CHROMIUM_BACKEND,
+    DEFAULT_BROWSER_BACKEND,
+    FIREFOX_BACKEND,
+)
+from aws_api_actions.firefox_profile import copy_profile
+from aws_api_actions.geckodriver import (
+    get_geckodriver_binary_path,
+    install_geckodriver,
+    is_geckodriver_installed,
+)
+from aws_api_actions.logger import logger
+from aws_api_actions.utilities import (
+    get_chrome_binary_path,
+    get_firefox_binary_path,
+)
+
+
+DEFAULT_WEBDRIVER_OPTIONS = [
+    "--headless",
+    "--disable-gpu",
+    "--disable-extensions",
+]
+DEFAULT_CHROMIUM_OPTIONS = [
+    "--headless=new",
+    "--disable-gpu",
+    "--disable-extensions",
+    # /dev/shm is too small for Chromium in most containers.
+    "--disable-dev-shm-usage",
+    "--no-first-run",
+    "--no-default-browser-check",
+]
+
+
+if is_geckodriver_installed() is False:
+    logger.warning(
+        "Geckodriver is NOT installed. For 'aws_api_actions' to function properly, "
+        "it must be installed. To install Geckodriver, run the 'gecko_install' "
+        "command or import the 'aws_api_actions.geckodriver.install_geckodriver'"
+        " function."
+    )
+
+
+def setup_webdriver(
+    geckodriver_binary: str,
+    firefox_binary: str,
+    webdriver_options: List[str],
+    profile_path: Optional[str] = None,
+) -> webdriver.Firefox:
+    """Generate a webdriver instance.
+
+    Args:
+        geckodriver_binary str: Path to Geckodriver binary.
+        firefox_binarystr: Path to Firefox binary.
+        webdriver_options List[str]: List of options to pass to the
+            webdriver.
+        profile_path (Optional[str], optional): Profile directory Firefox runs
+            on, in place. Defaults to None, in which case a fresh profile is
+            created.
+
+    Returns:
+        webdriver.Firefox: A webdriver instance.
+    """
+    # Generate the webdriver
+    service = Service(
+        executable_path=geckodriver_binary,
+        # log_path=gecko_logs,
+    )
+    options = webdriver.FirefoxOptions()
+    for option in webdriver_options:
+        options.add_argument(option)
+
+    if profile_path is not None:
+        options.add_argument("-profile")
+        options.add_argument(profile_path)
+
+    options.binary_location = firefox_binary
+    driver = webdriver.Firefox(
+        options=options,
+        service=service,
+    )
+    return driver
+
+
+def setup_chromium_webdriver(
+    chromedriver_binary: str,
+    chromium_binary: str,
+    webdriver_options: List[str],
+    profile_path: Optional[str] = None,
+) -> webdriver.Chrome:
+    """Generate a Chromium webdriver instance.
+
+    Args:
+        chromedriver_binary (str): Path to the chromedriver binary.
+        chromium_binary (str): Path to the Chromium or Chrome binary.
+        webdriver_options (List[str]): List of options to pass to the
+            webdriver.
+        profile_path (Optional[str], optional): User data directory Chromium
+            runs on, in place. Defaults to None, in which case a fresh one is
+            created.
+
+    Returns:
+        webdriver.Chrome: A webdriver instance.
+    """
+    service = ChromiumService(executable_path=chromedriver_binary)
+    options = webdriver.ChromeOptions()
+    for option in webdriver_options:
+        options.add_argument(option)
+
+    if profile_path is not None:
+        options.add_argument(f"--user-data-dir={profile_path}")
+
+    options.binary_location = chromium_binary
+    driver = webdriver.Chrome(
+        options=options,
+        service=service,
+    )
+    return driver
+
+
+class BrowserBackend(abc.ABC):
+    """Base class of the browsers the webdrivers can drive."""
+
+    name = ""
+    default_options: List[str] = []
+
+    @abc.abstractmethod
+    def get_driver_binary_path(self) -> str:
+        """Returns the path to the driver binary, e.g. geckodriver."""
+
+    @abc.abstractmethod
+    def get_browser_binary_path(self) -> str:
+        """Returns the path to the browser binary."""
+
+    @abc.abstractmethod
+    def is_driver_installed(self) -> bool:
+        """Checks whether the driver binary is available."""
+
+    @abc.abstractmethod
+    def install_driver(self, force: bool = False) -> bool:
+        """Downloads the driver binary.
+
+        Args:
+            force (bool, optional): Whether to force the download. Defaults
+                to False.
+        """
+
+    @abc.abstractmethod
+    def setup_webdriver(
+        self, webdriver_options: List[str], profile_path: Optional[str] = None
+    ) -> Any:
+        """Generate a webdriver instance using the installed binaries.
+
+        Args:
+            webdriver_options (List[str]): List of options to pass to the
+                webdriver.
+            profile_path (Optional[str], optional): Profile directory the
+                browser runs on, in place. Defaults to None.
+        """
+
+
+class FirefoxBackend(BrowserBackend):
+    """Firefox, driven through geckodriver."""
+
+    name = FIREFOX_BACKEND
+    default_options = DEFAULT_WEBDRIVER_OPTIONS
+
+    def get_driver_binary_path(self) -> str:
+        """Returns the path to the geckodriver binary."""
+        return get_geckodriver_binary_path()
+
+    def get_browser_binary_path(self) -> str:
+        """Returns the path to the Firefox binary."""
+        return get_firefox_binary_path()
+
+    def is_driver_installed(self) -> bool:
+        """Checks whether the geckodriver binary is downloaded."""
+        return is_geckodriver_installed()
+
+    def install_driver(self, force: bool = False) -> bool:
+        """Downloads the latest geckodriver binary.
+
+        Args:
+            force (bool, optional): Whether to force the download. Defaults
+                to False.
+
+        Returns:
+            bool: Whether the download was successful.
+        """
+        return install_geckodriver(force)
+
+    def setup_webdriver(
+        self, webdriver_options: List[str], profile_path: Optional[str] = None
+    ) -> webdriver.Firefox:
+        """Generate a Firefox webdriver instance.
+
+        Args:
+            webdriver_options (List[str]): List of options to pass to the
+                webdriver.
+            profile_path (Optional[str], optional): Profile directory Firefox
+                runs on, in place. Defaults to None.
+
+        Returns:
+            webdriver.Firefox: A webdriver instance.
+        """
+        return setup_webdriver(
+            self.get_driver_binary_path(),
+            self.get_browser_binary_path(),
+            webdriver_options=webdriver_options,
+            profile_path=profile_path,
+        )
+
+
+class ChromiumBackend(BrowserBackend):
+    """Chromium or Chrome, driven through chromedriver."""
+
+    name = CHROMIUM_BACKEND
+    default_options = DEFAULT_CHROMIUM_OPTIONS
+
+    def get_driver_binary_path(self) -> str:
+        """Returns the path to the chromedriver binary."""
+        return get_chromedriver_binary_path()
+
+    def get_browser_binary_path(self) -> str:
+        """Returns the path to the Chromium or Chrome binary."""
+        return get_chrome_binary_path()
+
+    def is_driver_installed(self) -> bool:
+        """Checks whether the chromedriver binary is available."""
+        return is_chromedriver_installed()
+
+    def install_driver(self, force: bool = False) -> bool:
+        """Downloads the chromedriver binary matching the browser.
+
+        Args:
+            force (bool, optional): Whether to force the download. Defaults
+                to False.
+
+        Returns:
+            bool: Whether the download was successful.
+        """
+        return install_chromedriver(force)
+
+    def setup_webdriver(
+        self, webdriver_options: List[str], profile_path: Optional[str] = None
+    ) -> webdriver.Chrome:
+        """Generate a Chromium webdriver instance.
+
+        Args:
+            webdriver_options (List[str]): List of options to pass to the
+                webdriver.
+            profile_path (Optional[str], optional): User data directory
+                Chromium runs on, in place. Defaults to None.
+
+        Returns:
+            webdriver.Chrome: A webdriver instance.
+        """
+        return setup_chromium_webdriver(
+            self.get_driver_binary_path(),
+            self.get_browser_binary_path(),
+            webdriver_options=webdriver_options,
+            profile_path=profile_path,
+        )
+
+
+BROWSER_BACKENDS: Dict[str, Type[BrowserBackend]] = {
+    FIREFOX_BACKEND: FirefoxBackend,
+    CHROMIUM_BACKEND: ChromiumBackend,
+}
+
+
+def register_browser_backend(
+    name: str, backend_class: Type[BrowserBackend]
+) -> None:
+    """Register a browser backend under the given name.
+
+    Args:
+        name (str): The name of the backend, e.g. ``edge``.
+        backend_class (Type[BrowserBackend]): The backend class.
+    """
+    BROWSER_BACKENDS[name.lower()] = backend_class
+
+
+def get_browser_backend(name: str = DEFAULT_BROWSER_BACKEND) -> BrowserBackend:
+    """Create the browser backend registered under the given name.
+
+    Args:
+        name (str, optional): The name of the backend. Defaults to
+            DEFAULT_BROWSER_BACKEND.
+
+    Returns:
+        BrowserBackend: The backend.
+
+    Raises:
+        ValueError: If no backend is registered under the name.
+    """
+    backend_class = BROWSER_BACKENDS.get(name.lower())
+    if backend_class is None:
+        raise ValueError(f"Unknown browser backend: {name}")
+
+    return backend_class()
+
+
+def setup_default_webdriver(
+    profile_path: Optional[str] = None,
+    profile_template: Optional[str] = None,
+    backend: str = DEFAULT_BROWSER_BACKEND,
+) -> Any:
+    """Generate a headless webdriver using the installed binaries.
+
+    Args:
+        profile_path (Optional[str], optional): Profile directory the browser
+            runs on, in place. Defaults to None.
+        profile_template (Optional[str], optional): Profile template copied
+            for this webdriver, see :mod:`aws_api_actions.firefox_profile`.
+            The copy is removed with the webdriver. Defaults to None.
+        backend (str, optional): The name of the browser backend. Defaults to
+            DEFAULT_BROWSER_BACKEND.
+
+    Returns:
+        Any: A webdriver instance.
+    """
+    browser_backend = get_browser_backend(backend)
+    profile_copy = None
+    if profile_template is not None:
+        profile_path = profile_copy = copy_profile(profile_template)
+
+    try:
+        driver = browser_backend.setup_webdriver(
+            browser_backend.default_options, profile_path=profile_path
+        )
+    except BaseException:
+        if profile_copy is not None:
+            shutil.rmtree(profile_copy, ignore_errors=True)
+        raise
+
+    if profile_copy is not None:
+        weakref.finalize(driver, shutil.rmtree, profile_copy, True)
+
+    return driver
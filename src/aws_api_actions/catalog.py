@@ -0,0 +1,94 @@
+"""Helpers to query the ``service -> category -> values`` action catalog.
+
+IAM action names are case-insensitive and written as ``service:Action``, with
+``*`` and ``?`` wildcards allowed in both the service prefix and the action
+name, e.g. ``s3:Get*`` or ``*:Describe*``. Like IAM, no other wildcard syntax
+is supported, so ``[`` and ``]`` only match themselves.
+
+Usage example:
+    expand_action(data, "s3:Get*")
+"""
+
+import re
+from typing import Dict, List, Pattern, Tuple
+
+from aws_api_actions.constants import ACTIONS_CATEGORY
+from aws_api_actions.exceptions import ParsingError
+
+
+def split_action(action: str) -> Tuple[str, str]:
+    """Split an IAM action into its service prefix and action name.
+
+    Args:
+        action (str): The action, e.g. ``s3:GetObject``.
+
+    Returns:
+        Tuple[str, str]: The service prefix and the action name.
+
+    Raises:
+        ParsingError: If the action is not of the form ``service:Action``.
+    """
+    service, separator, name = action.partition(":")
+    if separator == "" or service == "" or name == "":
+        if action == "*":
+            return "*", "*"
+        raise ParsingError(f"Invalid action: {action}")
+
+    return service, name
+
+
+def get_actions(
+    data: Dict[str, Dict[str, List[str]]], service: str
+) -> List[str]:
+    """Return the action names of a service.
+
+    Args:
+        data (Dict[str, Dict[str, List[str]]]): The catalog data.
+        service (str): The service prefix.
+
+    Returns:
+        List[str]: The action names, empty if the service does not exist.
+    """
+    return data.get(service, {}).get(ACTIONS_CATEGORY, [])
+
+
+def compile_wildcard(pattern: str) -> Pattern[str]:
+    """Compile an IAM wildcard pattern into a case-insensitive regex.
+
+    Args:
+        pattern (str): The pattern, where ``*`` matches any characters and
+            ``?`` matches a single character.
+
+    Returns:
+        Pattern[str]: The compiled regex, to be used with ``fullmatch``.
+    """
+    regex = re.escape(pattern).replace(r"\*", ".*").replace(r"\?", ".")
+    return re.compile(regex, re.IGNORECASE | re.DOTALL)
+
+
+def expand_action(
+    data: Dict[str, Dict[str, List[str]]], pattern: str
+) -> List[str]:
+    """Expand an action pattern into the matching actions of the catalog.
+
+    Args:
+        data (Dict[str, Dict[str, List[str]]]): The catalog data.
+        pattern (str): The action pattern, e.g. ``s3:Get*``.
+
+    Returns:
+        List[str]: The sorted matching actions, as ``service:Action``.
+    """
+    service_pattern, name_pattern = (
+        compile_wildcard(part) for part in split_action(pattern)
+    )
+
+    matches = []
+    for service in data:
+        if not service_pattern.fullmatch(service):
+            continue
+
+        for name in get_actions(data, service):
+            if name_pattern.fullmatch(name):
+                matches.append(f"{service}:{name}")
+
+    return sorted(matches)
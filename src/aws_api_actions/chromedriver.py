@@ -0,0 +1,283 @@
+"""Functions to download, install, and manage the chromedriver binary.
+
+The chromedriver must match the major version of the browser it drives, so the
+version installed is the latest release of the milestone of the Chromium or
+Chrome binary found, from the Chrome for Testing downloads. Linux
+distributions packaging Chromium usually package the matching chromedriver
+too, which is used when none is installed in the virtual environment.
+"""
+
+import os
+import platform
+import re
+import shutil
+import subprocess  # noqa: S404
+import urllib.error
+import urllib.request
+import zipfile
+from io import BytesIO
+from typing import Optional
+
+from aws_api_actions.geckodriver import make_executable
+from aws_api_actions.logger import logger
+from aws_api_actions.utilities import (
+    get_chrome_binary_path,
+    get_sys_arch,
+    get_sys_platform,
+    get_venv_path,
+)
+
+
+CHROMEDRIVER_REPOSITORY_URL = (
+    "https://storage.googleapis.com/chrome-for-testing-public/{version}"
+    "/{platform}/chromedriver-{platform}.zip"
+)
+CHROMEDRIVER_REPOSITORY_LATEST_URL = (
+    "https://googlechromelabs.github.io/chrome-for-testing/"
+    "LATEST_RELEASE_STABLE"
+)
+CHROMEDRIVER_REPOSITORY_MILESTONE_URL = (
+    "https://googlechromelabs.github.io/chrome-for-testing/"
+    "LATEST_RELEASE_{milestone}"
+)
+BROWSER_VERSION_PATTERN = re.compile(r"\b(\d+)\.\d+\.\d+(?:\.\d+)?\b")
+
+
+def get_chromedriver_filename() -> str:
+    """Returns the filename of the binary for the current platform.
+
+    Args:
+        None
+
+    Returns:
+        str: The filename of the binary for the current platform.
+    """
+    name = "chromedriver"
+    if get_sys_platform() == "win":
+        name += ".exe"
+
+    return name
+
+
+def get_chromedriver_binary_path() -> str:
+    """Returns the path to the chromedriver binary.
+
+    The binary installed in the virtual environment is preferred to one on
+    the PATH.
+
+    Returns:
+        str: The path to the chromedriver binary.
+    """
+    venv_path = get_venv_path()
+    chromedriver_filename = get_chromedriver_filename()
+    chromedriver_path = os.path.join(venv_path, chromedriver_filename)
+    if not os.path.exists(chromedriver_path):
+        return shutil.which(chromedriver_filename) or chromedriver_path
+
+    return chromedriver_path
+
+
+def get_chromedriver_platform() -> str:
+    """Returns the Chrome for Testing name of the current platform.
+
+    Args:
+        None
+
+    Returns:
+        str: The platform, e.g. linux64 or mac-arm64.
+    """
+    platform_name = get_sys_platform()
+    if platform_name == "macos":
+        arm = platform.machine().lower() in ("arm64", "aarch64")
+        return "mac-arm64" if arm else "mac-x64"
+
+    return f"{platform_name}{get_sys_arch()}"
+
+
+def get_browser_milestone(browser_binary: str) -> Optional[str]:
+    """Returns the major version of a Chromium or Chrome binary.
+
+    Args:
+        browser_binary (str): The path to the browser binary.
+
+    Returns:
+        Optional[str]: The major version, or None if it cannot be read.
+    """
+    try:
+        output = subprocess.run(  # noqa: S603
+            [browser_binary, "--version"],
+            capture_output=True,
+            check=True,
+            text=True,
+            timeout=30,
+        ).stdout
+    except (OSError, subprocess.SubprocessError) as err:
+        logger.debug("Failed to read the browser version: %s", err)
+        return None
+
+    match = BROWSER_VERSION_PATTERN.search(output)
+    return None if match is None else match.group(1)
+
+
+def get_latest_version_number(milestone: Optional[str] = None) -> str:
+    """Returns the latest version of the chromedriver binary.
+
+    Args:
+        milestone (Optional[str], optional): The major version of the
+            browser. Defaults to None, in which case the latest stable
+            version is returned.
+
+    Returns:
+        str: The latest version of the chromedriver binary.
+
+    Raises:
+        RuntimeError: If the download fails.
+    """
+    download_url = CHROMEDRIVER_REPOSITORY_LATEST_URL
+    if milestone is not None:
+        download_url = CHROMEDRIVER_REPOSITORY_MILESTONE_URL.format(
+            milestone=milestone
+        )
+
+    logger.info("Fetching latest chromedriver version from %s", download_url)
+
+    try:
+        with urllib.request.urlopen(download_url) as resp:  # noqa: S310
+            version: str = resp.read().decode("ascii").strip()
+
+    except urllib.error.URLError as err:
+        logger.error("Failed to fetch latest chromedriver version: %s", err)
+        raise RuntimeError(
+            "Failed to fetch latest chromedriver version"
+        ) from err
+
+    logger.info("Latest chromedriver version is %s", version)
+
+    return version
+
+
+def get_version_download_url(version: str) -> str:
+    """Returns the download URL for the given version.
+
+    Args:
+        version (str): The version of the chromedriver binary.
+
+    Returns:
+        str: The download URL for the given version.
+    """
+    return CHROMEDRIVER_REPOSITORY_URL.format(
+        version=version, platform=get_chromedriver_platform()
+    )
+
+
+def is_chromedriver_installed() -> bool:
+    """Checks whether the chromedriver binary is available.
+
+    Args:
+        None
+
+    Returns:
+        bool: Whether the chromedriver binary is available.
+    """
+    return os.path.exists(get_chromedriver_binary_path())
+
+
+def extract_chromedriver(file: BytesIO, binary_path: str) -> None:
+    """Extracts the chromedriver binary of the given archive.
+
+    The archive holds the binary in a directory named after the platform,
+    next to its licenses.
+
+    Args:
+        file (BytesIO): The downloaded archive.
+        binary_path (str): The path to extract the binary to.
+
+    Raises:
+        zipfile.BadZipFile: If the archive holds no chromedriver binary.
+    """
+    filename = os.path.basename(binary_path)
+    with zipfile.ZipFile(file, "r") as zip_ref:
+        for member in zip_ref.namelist():
+            if member.rsplit("/", 1)[-1] == filename:
+                with zip_ref.open(member) as source, open(
+                    binary_path, "wb"
+                ) as target:
+                    shutil.copyfileobj(source, target)
+                return
+
+    raise zipfile.BadZipFile(f"No {filename} in the archive")
+
+
+def install_chromedriver(force: bool = False) -> bool:
+    """Downloads the chromedriver binary matching the installed browser.
+
+    Args:
+        force (bool, optional): Whether to force the download. Defaults to False.
+
+    Raises:
+        RuntimeError: If the download fails.
+
+    Returns:
+        bool: Whether the download was successful.
+    """
+    chromedriver_binary_path = os.path.join(
+        get_venv_path(), get_chromedriver_filename()
+    )
+    binary_dir = os.path.dirname(chromedriver_binary_path)
+
+    if os.path.exists(chromedriver_binary_path):
+        logger.info(
+            "Chromedriver already installed %s", chromedriver_binary_path
+        )
+
+        if force is True:
+            logger.debug(
+                "Force flag specified, deleting existing chromedriver binary."
+            )
+            os.remove(chromedriver_binary_path)
+
+        else:
+            return True
+
+    # Get the version matching the browser and its download URL
+    browser_binary = get_chrome_binary_path()
+    milestone = None
+    if browser_binary:
+        milestone = get_browser_milestone(browser_binary)
+    else:
+        logger.warning("Chromium not found, installing the latest chromedriver")
+
+    latest_version = get_latest_version_number(milestone)
+    download_url = get_version_download_url(latest_version)
+
+    # Download the chromedriver archive
+    logger.info("Downloading chromedriver archive from %s", download_url)
+    try:
+        with urllib.request.urlopen(download_url) as resp:  # noqa: S310
+            raw = resp.read()
+
+    except urllib.error.URLError as err:
+        raise RuntimeError(
+            f"Failed to download chromedriver archive: {download_url}"
+        ) from err
+
+    # Create the install directory if it doesn't exist
+    if os.path.exists(binary_dir) is False:
+        logger.debug("Creating installation directory %s", binary_dir)
+        os.makedirs(binary_dir)
+
+    # Extract the binary to the install dir
+    logger.info("Extracting chromedriver to %s", binary_dir)
+    try:
+        extract_chromedriver(BytesIO(raw), chromedriver_binary_path)
+    except zipfile.BadZipFile as err:
+        logger.error("Failed to extract chromedriver: %s", err)
+        return False
+
+    # Make the binary executable
+    if make_executable(chromedriver_binary_path) is False:
+        return False
+
+    logger.info("Chromedriver installed successfully")
+
+    return True
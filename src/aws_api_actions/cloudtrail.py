@@ -0,0 +1,470 @@
+"""Least-privilege analysis of the actions used in CloudTrail logs.
+
+Each CloudTrail log file is a JSON object holding a ``Records`` array of
+events. The files are streamed through a decompressor and the events decoded
+one at a time, so memory stays flat whatever the size of a file, and the files
+are parsed in parallel by a process pool. Each event is mapped to the IAM
+action it exercised (``s3.amazonaws.com`` and ``GetObject`` to
+``s3:GetObject``) and to the principal behind it: the role of an assumed-role
+session, or the ARN of the identity otherwise.
+
+The actions each principal used are then compared, as bitsets (see
+:mod:`aws_api_actions.bitset`), with those its policies grant, listing the
+granted actions never used, candidates for removal, and the used actions not
+granted.
+
+The policies file maps each principal ARN to its policy documents:
+
+    {"arn:aws:iam::123456789012:role/app": [{"Statement": [...]}]}
+
+Usage example:
+    cloudtrail logs/ --catalog actions.json --policies policies.json
+"""
+
+import argparse
+import json
+import os
+import re
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+)
+
+from aws_api_actions.bitset import ActionIndex, PermissionSet
+from aws_api_actions.compression import (
+    get_decompression_errors,
+    open_compressed,
+)
+from aws_api_actions.exceptions import OutputError, ParsingError
+from aws_api_actions.loader import load_from_file
+from aws_api_actions.logger import logger
+from aws_api_actions.profiling import Profiler, profile_call
+
+
+# Characters decompressed and decoded at a time.
+CHUNK_SIZE = 1024 * 1024
+# Largest event decoded, in characters. CloudTrail events are at most 256 KB.
+MAX_EVENT_SIZE = 16 * 1024 * 1024
+# Characters from the end of the buffer within which a decoding error may be
+# a token cut by the end of a chunk, e.g. ``fal`` or ``\u00``.
+_TOKEN_TAIL = 16
+LOG_FILE_EXTENSIONS = (".json", ".json.gz")
+
+# Event sources whose host differs from the service prefix of their actions.
+EVENT_SOURCE_PREFIXES = {
+    "email": "ses",
+    "monitoring": "cloudwatch",
+    "tagging": "tag",
+}
+# Version suffix of some event names, e.g. Lambda's GetFunction20150331v2.
+EVENT_NAME_VERSION = re.compile(r"\d{8}(?:v\d+)?$")
+# Error codes of the events the principal was not allowed to perform.
+DENIED_ERROR_CODES = re.compile(r"AccessDenied|Unauthorized", re.IGNORECASE)
+
+_DECODER = json.JSONDecoder()
+# Characters between two events of the Records array.
+_SEPARATORS = frozenset(" \t\r\n,")
+
+
+class PrincipalReport(NamedTuple):
+    """The used and granted actions of a principal."""
+
+    used: int
+    granted: int
+    unused: List[str]
+    not_granted: List[str]
+
+
+def _find_records(file: Any, buffer: str, file_path: str) -> str:
+    """Returns the buffer from the start of the ``Records`` array."""
+    while True:
+        key = buffer.find('"Records"')
+        start = buffer.find("[", key) if key >= 0 else -1
+        if start >= 0:
+            return buffer[start + 1 :]
+
+        chunk = file.read(CHUNK_SIZE)
+        if not chunk:
+            raise ParsingError(f"No Records array in {file_path}")
+        buffer += chunk
+
+
+def _is_cut(err: json.JSONDecodeError, buffer: str) -> bool:
+    """Check whether a decoding error may come from an event cut short."""
+    # A cut string is reported from its start, however long it is.
+    if err.msg.startswith("Unterminated string"):
+        return True
+
+    return len(buffer) - err.pos <= _TOKEN_TAIL
+
+
+def _read_more(
+    file: Any,
+    buffer: str,
+    position: int,
+    err: json.JSONDecodeError,
+    file_path: str,
+) -> str:
+    """Returns the event being decoded, continued with the next chunk."""
+    if not _is_cut(err, buffer):
+        raise ParsingError(f"Invalid event in {file_path}: {err}")
+    if len(buffer) - position > MAX_EVENT_SIZE:
+        raise ParsingError(f"Event too large in {file_path}")
+
+    chunk: str = file.read(CHUNK_SIZE)
+    if not chunk:
+        raise ParsingError(f"Truncated log file {file_path}: {err}")
+
+    return buffer[position:] + chunk
+
+
+def iter_cloudtrail_events(file_path: str) -> Iterator[Dict[str, Any]]:
+    """Stream the events of a CloudTrail log file.
+
+    Args:
+        file_path (str): The path to the log file, decompressed according to
+            its extension.
+
+    Yields:
+        Dict[str, Any]: The events.
+
+    Raises:
+        ParsingError: If the file is not a readable CloudTrail log file.
+    """
+    try:
+        with open_compressed(file_path) as file:
+            buffer = _find_records(file, file.read(CHUNK_SIZE), file_path)
+            position = 0
+            while True:
+                while (
+                    position < len(buffer) and buffer[position] in _SEPARATORS
+                ):
+                    position += 1
+                if buffer.startswith("]", position):
+                    return
+
+                try:
+                    event, position = _DECODER.raw_decode(buffer, position)
+                except json.JSONDecodeError as err:
+                    # The event may continue in the next chunk, while an error
+                    # before the end of the buffer is a malformed event.
+                    buffer = _read_more(file, buffer, position, err, file_path)
+                    position = 0
+                    continue
+
+                yield event
+    except OSError as err:
+        raise ParsingError(f"Failed to read {file_path}: {err}") from err
+    except get_decompression_errors() as err:
+        raise ParsingError(f"Failed to read {file_path}: {err}") from err
+
+
+def get_event_action(event: Dict[str, Any]) -> Optional[str]:
+    """Returns the IAM action exercised by an event.
+
+    Args:
+        event (Dict[str, Any]): The CloudTrail event.
+
+    Returns:
+        Optional[str]: The action, as ``service:Action``, or None if the
+            event is not an API call.
+    """
+    source = event.get("eventSource")
+    name = event.get("eventName")
+    if not isinstance(source, str) or not isinstance(name, str):
+        return None
+
+    host = source.split(".", 1)[0]
+    prefix = EVENT_SOURCE_PREFIXES.get(host, host)
+    return f"{prefix}:{EVENT_NAME_VERSION.sub('', name)}"
+
+
+def get_principal(event: Dict[str, Any]) -> Optional[str]:
+    """Returns the principal whose policies allowed an event.
+
+    Args:
+        event (Dict[str, Any]): The CloudTrail event.
+
+    Returns:
+        Optional[str]: The role ARN of an assumed-role session, the ARN of
+            the identity otherwise, or None if there is neither.
+    """
+    identity = event.get("userIdentity") or {}
+    if identity.get("type") == "AssumedRole":
+        issuer = (identity.get("sessionContext") or {}).get("sessionIssuer")
+        if issuer and issuer.get("arn"):
+            return str(issuer["arn"])
+
+    arn = identity.get("arn")
+    return None if arn is None else str(arn)
+
+
+def collect_file_usage(file_path: str) -> Dict[str, Set[str]]:
+    """Returns the actions each principal used in a log file.
+
+    The events the principal was denied are ignored.
+
+    Args:
+        file_path (str): The path to the log file.
+
+    Returns:
+        Dict[str, Set[str]]: The actions used by each principal.
+    """
+    usage: Dict[str, Set[str]] = {}
+    for event in iter_cloudtrail_events(file_path):
+        if DENIED_ERROR_CODES.search(event.get("errorCode") or ""):
+            continue
+
+        action = get_event_action(event)
+        principal = get_principal(event)
+        if action is not None and principal is not None:
+            usage.setdefault(principal, set()).add(action)
+
+    return usage
+
+
+def iter_log_files(paths: Iterable[str]) -> Iterator[str]:
+    """Yield the log files given, and those found under the directories given.
+
+    Args:
+        paths (Iterable[str]): The paths of the files and directories.
+
+    Yields:
+        str: The paths of the log files.
+    """
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+
+        for directory, _, filenames in sorted(os.walk(path)):
+            for filename in sorted(filenames):
+                if filename.endswith(LOG_FILE_EXTENSIONS):
+                    yield os.path.join(directory, filename)
+
+
+def collect_usage(
+    file_paths: Iterable[str],
+    max_workers: Optional[int] = None,
+    profiler: Optional[Profiler] = None,
+) -> Dict[str, Set[str]]:
+    """Returns the actions each principal used, parsing the files in parallel.
+
+    A file failing to parse is logged and skipped.
+
+    Args:
+        file_paths (Iterable[str]): The paths to the log files.
+        max_workers (Optional[int], optional): The number of parse
+            processes. Defaults to None, one per CPU.
+        profiler (Optional[Profiler], optional): Profiler merging the profile
+            of each file as the ``parse`` stage. Defaults to None.
+
+    Returns:
+        Dict[str, Set[str]]: The actions used by each principal.
+    """
+    profiler = profiler or Profiler()
+    usage: Dict[str, Set[str]] = {}
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures: Dict["Future[Any]", str] = {}
+        future: "Future[Any]"
+        for file_path in file_paths:
+            if profiler.enabled:
+                future = executor.submit(
+                    profile_call, collect_file_usage, file_path
+                )
+            else:
+                future = executor.submit(collect_file_usage, file_path)
+            futures[future] = file_path
+
+        for future in as_completed(futures):
+            try:
+                file_usage = future.result()
+            except ParsingError as err:
+                logger.error("Skipped %s: %s", futures[future], err)
+                continue
+
+            if profiler.enabled:
+                file_usage, stats = file_usage
+                profiler.add_stats("parse", stats)
+
+            for principal, actions in file_usage.items():
+                usage.setdefault(principal, set()).update(actions)
+
+    logger.info("Parsed %d log files", len(futures))
+    return usage
+
+
+def load_grants(file_path: str, index: ActionIndex) -> Dict[str, PermissionSet]:
+    """Returns the actions granted to each principal by its policies.
+
+    Args:
+        file_path (str): The path to the policies file, mapping each
+            principal ARN to a policy document or a list of them.
+        index (ActionIndex): The action index.
+
+    Returns:
+        Dict[str, PermissionSet]: The actions granted to each principal.
+
+    Raises:
+        ParsingError: If the file or a policy is invalid.
+    """
+    try:
+        with open_compressed(file_path) as file:
+            policies = json.load(file)
+    except (OSError, json.JSONDecodeError) as err:
+        raise ParsingError(f"Invalid policies file {file_path}: {err}") from err
+    except get_decompression_errors() as err:
+        raise ParsingError(f"Invalid policies file {file_path}: {err}") from err
+
+    if not isinstance(policies, dict):
+        raise ParsingError(f"Invalid policies file {file_path}")
+
+    grants = {}
+    for principal, documents in policies.items():
+        if isinstance(documents, dict):
+            documents = [documents]
+
+        granted = index.empty()
+        for document in documents:
+            if not isinstance(document, dict):
+                raise ParsingError(f"Invalid policy of {principal}")
+            granted |= index.from_policy(document)
+        grants[principal] = granted
+
+    return grants
+
+
+def analyze(
+    usage: Dict[str, Set[str]],
+    grants: Dict[str, PermissionSet],
+    index: ActionIndex,
+) -> Dict[str, PrincipalReport]:
+    """Compare the actions used by each principal with those granted.
+
+    Args:
+        usage (Dict[str, Set[str]]): The actions used by each principal.
+        grants (Dict[str, PermissionSet]): The actions granted to each
+            principal.
+        index (ActionIndex): The action index.
+
+    Returns:
+        Dict[str, PrincipalReport]: The report of each principal.
+    """
+    reports = {}
+    for principal in sorted(set(usage) | set(grants)):
+        actions = usage.get(principal, set())
+        used = index.from_actions(actions)
+        granted = grants.get(principal, index.empty())
+        reports[principal] = PrincipalReport(
+            used=len(actions),
+            granted=len(granted),
+            unused=sorted(granted - used),
+            # Used actions missing from the catalog can't be in a grant.
+            not_granted=sorted(
+                action for action in actions if action not in granted
+            ),
+        )
+
+    return reports
+
+
+def write_report(file_path: str, reports: Dict[str, PrincipalReport]) -> None:
+    """Write the report of each principal as json.
+
+    Args:
+        file_path (str): The path to the report file.
+        reports (Dict[str, PrincipalReport]): The reports.
+
+    Raises:
+        OutputError: If the report cannot be written.
+    """
+    try:
+        with open_compressed(file_path, "w") as file:
+            json.dump(
+                {
+                    principal: report._asdict()
+                    for principal, report in reports.items()
+                },
+                file,
+                indent=4,
+            )
+    except OSError as err:
+        raise OutputError(f"Failed to write {file_path}: {err}") from err
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Analyze the actions used in CloudTrail logs against the grants.
+
+    Args:
+        argv (Optional[List[str]], optional): The command line arguments.
+            Defaults to None, in which case ``sys.argv`` is used.
+    """
+    parser = argparse.ArgumentParser(
+        description="Compare the actions used in CloudTrail logs with the "
+        "actions granted to each principal."
+    )
+    parser.add_argument(
+        "logs", nargs="+", help="Log files, or directories holding them."
+    )
+    parser.add_argument(
+        "--catalog", required=True, help="Exported catalog of the actions."
+    )
+    parser.add_argument(
+        "--policies",
+        default=None,
+        help="JSON file mapping each principal ARN to its policy documents.",
+    )
+    parser.add_argument(
+        "--index",
+        default=None,
+        help="Action index keeping the action IDs stable, updated in place.",
+    )
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--report", default=None, help="JSON report file.")
+    parser.add_argument(
+        "--profile",
+        default=None,
+        metavar="DIR",
+        help="Directory to write a profile of each stage to, logging their "
+        "hotspots.",
+    )
+    args = parser.parse_args(argv)
+    profiler = Profiler(args.profile)
+
+    with profiler.stage("index"):
+        index = ActionIndex()
+        if args.index is not None and os.path.exists(args.index):
+            index = ActionIndex.load(args.index)
+        index.update(load_from_file(args.catalog))
+        if args.index is not None:
+            index.save(args.index)
+
+    grants: Dict[str, PermissionSet] = {}
+    if args.policies is not None:
+        with profiler.stage("grants"):
+            grants = load_grants(args.policies, index)
+
+    usage = collect_usage(iter_log_files(args.logs), args.workers, profiler)
+    with profiler.stage("analyze"):
+        reports = analyze(usage, grants, index)
+    for principal, report in reports.items():
+        logger.info(
+            "%s: used %d, granted %d, %d granted unused, %d used not granted",
+            principal,
+            report.used,
+            report.granted,
+            len(report.unused),
+            len(report.not_granted),
+        )
+
+    if args.report is not None:
+        write_report(args.report, reports)
+
+    profiler.write()
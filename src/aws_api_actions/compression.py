@@ -0,0 +1,176 @@
+"""Streaming compression helpers for the exported datasets.
+
+The compression codec is selected from the file extension of the target path
+unless explicitly requested, so that every exporter and loader can transparently
+read and write plain, gzip or zstd compressed files:
+
+    - ``.gz``: gzip (standard library)
+    - ``.zst`` / ``.zstd``: zstd (requires the optional ``zstandard`` package)
+    - anything else: no compression
+
+Compressed outputs are reproducible: the same contents always compress to the
+same bytes, as the gzip header holds neither the file name nor a timestamp.
+
+Usage example:
+    with open_compressed("actions.json.gz", "w") as file:
+        file.write(contents)
+"""
+
+import gzip
+import io
+import os
+import zlib
+from typing import IO, Optional, Tuple, Type, cast
+
+from aws_api_actions.exceptions import OutputError
+
+
+COMPRESSION_NONE = "none"
+COMPRESSION_GZIP = "gzip"
+COMPRESSION_ZSTD = "zstd"
+
+COMPRESSION_EXTENSIONS = {
+    ".gz": COMPRESSION_GZIP,
+    ".zst": COMPRESSION_ZSTD,
+    ".zstd": COMPRESSION_ZSTD,
+}
+COMPRESSION_FORMATS = (COMPRESSION_NONE, COMPRESSION_GZIP, COMPRESSION_ZSTD)
+
+
+class _ReproducibleGzipFile(gzip.GzipFile):
+    """Gzip file written without the file name and modification time."""
+
+    def __init__(self, file_path: str) -> None:
+        """Open the file for writing.
+
+        Args:
+            file_path (str): The path to the file.
+        """
+        self._raw = io.open(file_path, "wb")
+        try:
+            super().__init__(filename="", mode="wb", fileobj=self._raw, mtime=0)
+        except BaseException:
+            self._raw.close()
+            raise
+
+    def close(self) -> None:
+        """Flush the compressed stream and close the file."""
+        try:
+            super().close()
+        finally:
+            self._raw.close()
+
+
+def get_compression(file_path: str, compression: Optional[str] = None) -> str:
+    """Returns the compression codec to use for the given file.
+
+    Args:
+        file_path (str): The path to the file.
+        compression (Optional[str], optional): The explicitly requested
+            codec. Defaults to None, in which case the codec is selected
+            from the file extension.
+
+    Returns:
+        str: The compression codec, one of ``COMPRESSION_FORMATS``.
+
+    Raises:
+        OutputError: If the requested codec is not supported.
+    """
+    if compression is None:
+        extension = os.path.splitext(file_path)[1].lower()
+        return COMPRESSION_EXTENSIONS.get(extension, COMPRESSION_NONE)
+
+    compression = compression.lower()
+    if compression not in COMPRESSION_FORMATS:
+        raise OutputError(f"Unsupported compression format: {compression}")
+
+    return compression
+
+
+def strip_compression_extension(file_path: str) -> str:
+    """Returns the file path without its compression extension.
+
+    Args:
+        file_path (str): The path to the file.
+
+    Returns:
+        str: The path to the file without the compression extension.
+    """
+    root, extension = os.path.splitext(file_path)
+    if extension.lower() in COMPRESSION_EXTENSIONS:
+        return root
+
+    return file_path
+
+
+def open_compressed(
+    file_path: str, mode: str = "r", compression: Optional[str] = None
+) -> IO[str]:
+    """Opens a text stream to the file through a streaming (de)compressor.
+
+    Args:
+        file_path (str): The path to the file.
+        mode (str, optional): Either "r" or "w". Defaults to "r".
+        compression (Optional[str], optional): The compression codec.
+            Defaults to None, in which case it is selected from the file
+            extension.
+
+    Returns:
+        IO[str]: A text stream reading from or writing to the file.
+
+    Raises:
+        OutputError: If the mode or codec is not supported.
+    """
+    if mode not in ("r", "w"):
+        raise OutputError(f"Unsupported file mode: {mode}")
+
+    codec = get_compression(file_path, compression)
+
+    if codec == COMPRESSION_GZIP and mode == "w":
+        return io.TextIOWrapper(
+            _ReproducibleGzipFile(file_path), encoding="utf-8", newline=""
+        )
+
+    if codec == COMPRESSION_GZIP:
+        return cast(
+            IO[str],
+            gzip.open(file_path, f"{mode}t", encoding="utf-8", newline=""),
+        )
+
+    if codec == COMPRESSION_ZSTD:
+        try:
+            import zstandard
+        except ImportError as err:
+            raise OutputError(
+                "The 'zstandard' package is required for zstd compression."
+            ) from err
+
+        return cast(
+            IO[str],
+            zstandard.open(file_path, f"{mode}t", encoding="utf-8", newline=""),
+        )
+
+    return io.open(file_path, mode, encoding="utf-8", newline="")
+
+
+def get_decompression_errors() -> Tuple[Type[Exception], ...]:
+    """Returns the exceptions raised when reading corrupt or mislabelled data.
+
+    This covers data that is truncated, is not in the expected codec, or does
+    not decode as UTF-8 text.
+
+    Returns:
+        Tuple[Type[Exception], ...]: The exception classes.
+    """
+    errors: Tuple[Type[Exception], ...] = (
+        EOFError,
+        UnicodeDecodeError,
+        gzip.BadGzipFile,
+        zlib.error,
+    )
+    try:
+        import zstandard
+    except ImportError:
+        return errors
+
+    return (*errors, zstandard.ZstdError)
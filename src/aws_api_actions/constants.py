@@ -7,3 +7,24 @@ USER_AGENT = (
     "Mozilla/5.0 (X11; CrOS x86_64 8172.45.0) AppleWebKit/537.36 (KHTML, like"
     " Gecko) Chrome/51.0.2704.64 Safari/537.36"
 )
+
+# Categories of the scraped data for each service.
+ACTIONS_CATEGORY = "actions"
+RESOURCE_TYPES_CATEGORY = "resource_types"
+CONDITION_KEYS_CATEGORY = "condition_keys"
+# The actions of each access level are stored in a category named with this
+# prefix followed by the access level, e.g. "access_level:permissions_management".
+ACCESS_LEVEL_CATEGORY_PREFIX = "access_level:"
+
+# Index of the Service Authorization Reference, linking to a page per service
+# listing its actions, resource types and condition keys.
+SERVICE_AUTHORIZATION_REFERENCE_URL = (
+    "https://docs.aws.amazon.com/service-authorization/latest/reference/"
+    "reference_policies_actions-resources-contextkeys.html"
+)
+
+# Browsers the webdrivers can drive, see :mod:`aws_api_actions.browser`.
+FIREFOX_BACKEND = "firefox"
+CHROMIUM_BACKEND = "chromium"
+BROWSER_BACKENDS = (FIREFOX_BACKEND, CHROMIUM_BACKEND)
+DEFAULT_BROWSER_BACKEND = FIREFOX_BACKEND
@@ -0,0 +1,509 @@
+"""Resident scraper rebuilding the exports on a schedule or on demand.
+
+Each ``scrape`` run pays for the Python and selenium imports, the webdriver
+and browser startup, new HTTP connections and cold caches, which dominate a
+frequent refresh. The daemon pays them once and stays resident, keeping warm
+between rebuilds:
+
+    - The fetchers, with their HTTP sessions, started browsers and learned
+      fetch strategies, through a ``FetcherPool``.
+    - The process pool parsing the pages.
+    - The page store, with the parse results cached in memory.
+
+A rebuild runs every ``--interval`` seconds, when the daemon receives
+``SIGUSR1``, or when ``rebuild`` is sent to its ``--socket``, which answers
+``status`` with the result of the last rebuild. The exports are written to
+temporary files swapped in with ``os.replace`` once all are written, so
+readers never see a partial file, and an export whose contents didn't change
+is left untouched. A rebuild with failed pages keeps the previous exports.
+
+The daemon relies on Unix signals and sockets, so it doesn't run on Windows.
+
+Usage example:
+    daemon -o actions.json.gz --interval 3600 --socket /run/aws_api_actions.sock
+    echo rebuild | socat - UNIX-CONNECT:/run/aws_api_actions.sock
+"""
+
+import argparse
+import json
+import os
+import queue
+import signal
+import socketserver
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+)
+
+from aws_api_actions.constants import (
+    BROWSER_BACKENDS,
+    DEFAULT_BROWSER_BACKEND,
+    SERVICE_AUTHORIZATION_REFERENCE_URL,
+)
+from aws_api_actions.exceptions import (
+    OutputError,
+    ParsingError,
+    ScrapingError,
+)
+from aws_api_actions.exporter import (
+    fan_out,
+    get_sink,
+    get_temp_path,
+    iter_records,
+    replace_if_changed,
+    sort_data,
+)
+from aws_api_actions.fetcher import Fetcher, FetchResult
+from aws_api_actions.logger import logger
+from aws_api_actions.memory import MIB, MemoryMonitor
+from aws_api_actions.page_store import PageStore
+from aws_api_actions.pipeline import DEFAULT_FETCH_WORKERS, run_pipeline
+from aws_api_actions.scraper import FetcherFactory, scrape_service_urls
+
+
+DEFAULT_INTERVAL = 3600.0
+COMMAND_REBUILD = "rebuild"
+COMMAND_STATUS = "status"
+
+
+class BuildResult(NamedTuple):
+    """The outcome of a rebuild."""
+
+    finished: float
+    seconds: float
+    services: int
+    failed: int
+    swapped: bool
+    error: Optional[str] = None
+
+
+class _PooledFetcher(Fetcher):
+    """Fetcher lent by a pool, returned to it instead of being closed."""
+
+    def __init__(self, pool: "FetcherPool", fetcher: Fetcher) -> None:
+        """Wrap a fetcher of the pool."""
+        self.pool = pool
+        self.fetcher = fetcher
+
+    def fetch(self, url: str) -> str:
+        """Fetch a page with the pooled fetcher."""
+        return self.fetcher.fetch(url)
+
+    def fetch_static(self, url: str) -> str:
+        """Fetch a static page with the pooled fetcher."""
+        return self.fetcher.fetch_static(url)
+
+    def fetch_many(self, urls: Iterable[str]) -> Iterator[FetchResult]:
+        """Fetch several pages with the pooled fetcher."""
+        return self.fetcher.fetch_many(urls)
+
+    def close(self) -> None:
+        """Return the fetcher to the pool."""
+        self.pool.release(self.fetcher)
+
+
+class FetcherPool:
+    """Pool of fetchers kept open across scrapes."""
+
+    def __init__(self, fetcher_factory: Callable[[], Fetcher]) -> None:
+        """Initialize an empty pool.
+
+        Args:
+            fetcher_factory (Callable[[], Fetcher]): Function creating a
+                fetcher when none is idle.
+        """
+        self.fetcher_factory = fetcher_factory
+        self._idle: "queue.LifoQueue[Fetcher]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self.fetchers: List[Fetcher] = []
+
+    def acquire(self) -> Fetcher:
+        """Returns an idle fetcher, which returns to the pool when closed.
+
+        The signature is that of a fetcher factory, so the pool can be used
+        wherever a fetcher is created.
+
+        Returns:
+            Fetcher: The fetcher.
+        """
+        try:
+            fetcher = self._idle.get_nowait()
+        except queue.Empty:
+            fetcher = self.fetcher_factory()
+            with self._lock:
+                self.fetchers.append(fetcher)
+
+        return _PooledFetcher(self, fetcher)
+
+    def release(self, fetcher: Fetcher) -> None:
+        """Return a fetcher to the pool.
+
+        Args:
+            fetcher (Fetcher): The fetcher.
+        """
+        self._idle.put(fetcher)
+
+    def close(self) -> None:
+        """Close every fetcher of the pool."""
+        with self._lock:
+            fetchers, self.fetchers = self.fetchers, []
+
+        for fetcher in fetchers:
+            try:
+                fetcher.close()
+            except Exception as err:
+                logger.warning("Failed to close a fetcher: %s", err)
+
+
+def export_atomic(
+    data: Dict[str, Dict[str, List[str]]],
+    outputs: List[str],
+    max_workers: Optional[int] = None,
+) -> None:
+    """Export the data, swapping the changed files in once all are written.
+
+    Args:
+        data (Dict[str, Dict[str, List[str]]]): The data.
+        outputs (List[str]): The paths of the exports.
+        max_workers (Optional[int], optional): The number of threads writing
+            the exports. Defaults to None.
+
+    Raises:
+        OutputError: If an export cannot be written or swapped in.
+    """
+    temp_paths = [get_temp_path(path) for path in outputs]
+    fan_out(
+        iter_records(data),
+        [get_sink(path) for path in temp_paths],
+        max_workers=max_workers,
+    )
+
+    try:
+        for temp_path, path in zip(temp_paths, outputs, strict=True):
+            replace_if_changed(temp_path, path)
+    finally:
+        for temp_path in temp_paths:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+
+
+class ScrapeDaemon:
+    """Resident scraper keeping its fetchers, processes and caches warm."""
+
+    def __init__(
+        self,
+        outputs: List[str],
+        fetcher_factory: Callable[[], Fetcher],
+        index_url: str = SERVICE_AUTHORIZATION_REFERENCE_URL,
+        interval: Optional[float] = DEFAULT_INTERVAL,
+        store: Optional[PageStore] = None,
+        fetch_workers: int = DEFAULT_FETCH_WORKERS,
+        parse_workers: Optional[int] = None,
+        memory: Optional[MemoryMonitor] = None,
+    ) -> None:
+        """Initialize the daemon.
+
+        Args:
+            outputs (List[str]): The paths of the exports.
+            fetcher_factory (Callable[[], Fetcher]): Function creating the
+                pooled fetchers.
+            index_url (str, optional): The URL of the reference index.
+                Defaults to SERVICE_AUTHORIZATION_REFERENCE_URL.
+            interval (Optional[float], optional): Seconds between two
+                scheduled rebuilds. Defaults to DEFAULT_INTERVAL. None only
+                rebuilds on demand.
+            store (Optional[PageStore], optional): The page store. Defaults
+                to None.
+            fetch_workers (int, optional): The number of fetch threads.
+                Defaults to DEFAULT_FETCH_WORKERS.
+            parse_workers (Optional[int], optional): The number of parse
+                processes. Defaults to None, one per CPU.
+            memory (Optional[MemoryMonitor], optional): Monitor enforcing the
+                memory budgets. Defaults to None.
+        """
+        self.outputs = outputs
+        self.index_url = index_url
+        self.interval = interval
+        self.store = store
+        self.fetch_workers = fetch_workers
+        self.parse_workers = parse_workers
+        self.memory = memory
+        self.pool = FetcherPool(fetcher_factory)
+        self.last_build: Optional[BuildResult] = None
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._wakeup = threading.Event()
+        self._rebuild_requested = False
+        self._stopping = False
+
+    def request_rebuild(self) -> None:
+        """Ask for a rebuild as soon as the current one, if any, is done."""
+        self._rebuild_requested = True
+        self._wakeup.set()
+
+    def stop(self) -> None:
+        """Ask the daemon to stop once the current rebuild, if any, is done."""
+        self._stopping = True
+        self._wakeup.set()
+
+    def rebuild(self) -> BuildResult:
+        """Scrape the reference and swap in the new exports.
+
+        Errors are logged and returned rather than raised, so the daemon
+        keeps running.
+
+        Returns:
+            BuildResult: The outcome of the rebuild.
+        """
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.parse_workers)
+
+        start = time.monotonic()
+        data: Dict[str, Dict[str, List[str]]] = {}
+        failed: List[str] = []
+        error = None
+        try:
+            with self.pool.acquire() as fetcher:
+                urls = scrape_service_urls(fetcher, self.index_url)
+
+            data, failed = run_pipeline(
+                self.pool.acquire,
+                urls,
+                self.store,
+                fetch_workers=self.fetch_workers,
+                memory=self.memory,
+                executor=self._executor,
+            )
+            if self.store is not None:
+                self.store.save()
+            if not failed:
+                export_atomic(sort_data(data), self.outputs)
+        except (ScrapingError, ParsingError, OutputError) as err:
+            error = str(err)
+            logger.error("Rebuild failed: %s", err)
+
+        result = BuildResult(
+            finished=time.time(),
+            seconds=time.monotonic() - start,
+            services=len(data),
+            failed=len(failed),
+            swapped=error is None and not failed,
+            error=error,
+        )
+        if failed:
+            logger.error(
+                "Failed to scrape %d pages, kept the previous exports",
+                len(failed),
+            )
+        elif result.swapped:
+            logger.success(
+                "Rebuilt %d services in %.1fs", len(data), result.seconds
+            )
+
+        self.last_build = result
+        return result
+
+    def get_status(self) -> Dict[str, Any]:
+        """Returns the state of the daemon and the last rebuild.
+
+        Returns:
+            Dict[str, Any]: The status, JSON serializable.
+        """
+        last_build = None
+        if self.last_build is not None:
+            last_build = self.last_build._asdict()
+
+        return {
+            "pid": os.getpid(),
+            "outputs": self.outputs,
+            "rebuild_requested": self._rebuild_requested,
+            "last_build": last_build,
+        }
+
+    def serve_forever(self) -> None:
+        """Rebuild at startup, then on schedule or on demand until stopped."""
+        next_build: Optional[float] = time.monotonic()
+        try:
+            while not self._stopping:
+                if next_build is not None:
+                    self._wakeup.wait(max(0.0, next_build - time.monotonic()))
+                else:
+                    self._wakeup.wait()
+                self._wakeup.clear()
+
+                due = next_build is not None and time.monotonic() >= next_build
+                if self._stopping or not (self._rebuild_requested or due):
+                    continue
+
+                self._rebuild_requested = False
+                self.rebuild()
+                if self.interval is not None:
+                    next_build = time.monotonic() + self.interval
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Release the fetchers and the parse processes."""
+        self.pool.close()
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def install_signal_handlers(self) -> None:
+        """Rebuild on ``SIGUSR1``, and stop on ``SIGTERM`` and ``SIGINT``.
+
+        Must be called from the main thread.
+        """
+        if hasattr(signal, "SIGUSR1"):
+            signal.signal(signal.SIGUSR1, lambda *args: self.request_rebuild())
+        signal.signal(signal.SIGTERM, lambda *args: self.stop())
+        signal.signal(signal.SIGINT, lambda *args: self.stop())
+
+
+class ControlRequestHandler(socketserver.StreamRequestHandler):
+    """Handler of the commands sent to the control socket, one per line."""
+
+    server: "ControlServer"
+
+    def handle(self) -> None:
+        """Answer each command with a line."""
+        for line in self.rfile:
+            command = line.decode("utf-8", errors="replace").strip()
+            if command == COMMAND_REBUILD:
+                self.server.daemon.request_rebuild()
+                reply = "queued"
+            elif command == COMMAND_STATUS:
+                reply = json.dumps(self.server.daemon.get_status())
+            else:
+                reply = f"unknown command: {command}"
+
+            self.wfile.write(f"{reply}\n".encode("utf-8"))
+
+
+class ControlServer(socketserver.ThreadingUnixStreamServer):
+    """Unix socket server controlling a daemon."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, daemon: ScrapeDaemon) -> None:
+        """Bind the socket, replacing a stale one.
+
+        Args:
+            socket_path (str): The path to the socket.
+            daemon (ScrapeDaemon): The daemon controlled.
+        """
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+        super().__init__(socket_path, ControlRequestHandler)
+        self.socket_path = socket_path
+        self.daemon = daemon
+
+    def start(self) -> "ControlServer":
+        """Serve in a background thread."""
+        threading.Thread(
+            target=self.serve_forever, name="control", daemon=True
+        ).start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and remove the socket."""
+        self.shutdown()
+        self.server_close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+def _parse_args(argv: Optional[List[str]]) -> argparse.Namespace:
+    """Parse the command line arguments of the daemon."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-o", "--output", action="append", required=True)
+    parser.add_argument(
+        "--index-url", default=SERVICE_AUTHORIZATION_REFERENCE_URL
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=DEFAULT_INTERVAL,
+        help="Seconds between two rebuilds, 0 to only rebuild on demand.",
+    )
+    parser.add_argument(
+        "--socket",
+        default=None,
+        help="Unix socket accepting the 'rebuild' and 'status' commands.",
+    )
+    parser.add_argument("--no-browser", action="store_true")
+    parser.add_argument(
+        "--browser-backend",
+        choices=BROWSER_BACKENDS,
+        default=DEFAULT_BROWSER_BACKEND,
+    )
+    parser.add_argument("--page-store", default=None)
+    parser.add_argument("--profile-template", default=None)
+    parser.add_argument("--tabs", type=int, default=1)
+    parser.add_argument(
+        "--fetch-workers", type=int, default=DEFAULT_FETCH_WORKERS
+    )
+    parser.add_argument("--parse-workers", type=int, default=None)
+    parser.add_argument("--memory-budget", type=int, default=None)
+    parser.add_argument("--driver-memory-budget", type=int, default=None)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the daemon until it receives SIGTERM or SIGINT.
+
+    Args:
+        argv (Optional[List[str]], optional): The command line arguments.
+            Defaults to None, in which case ``sys.argv`` is used.
+    """
+    args = _parse_args(argv)
+    memory = MemoryMonitor(
+        driver_budget=(
+            None
+            if args.driver_memory_budget is None
+            else args.driver_memory_budget * MIB
+        ),
+        process_budget=(
+            None if args.memory_budget is None else args.memory_budget * MIB
+        ),
+        trace_python=False,
+    )
+    fetcher_factory = FetcherFactory(
+        browser=not args.no_browser,
+        profile_template=args.profile_template,
+        tabs=args.tabs,
+        memory=memory,
+        browser_backend=args.browser_backend,
+    )
+    daemon = ScrapeDaemon(
+        args.output,
+        fetcher_factory,
+        index_url=args.index_url,
+        interval=args.interval or None,
+        store=None if args.page_store is None else PageStore(args.page_store),
+        fetch_workers=args.fetch_workers,
+        parse_workers=args.parse_workers,
+        memory=memory,
+    )
+    daemon.install_signal_handlers()
+
+    control = None
+    if args.socket is not None:
+        control = ControlServer(args.socket, daemon).start()
+        logger.info("Listening for commands on %s", args.socket)
+
+    try:
+        daemon.serve_forever()
+    finally:
+        if control is not None:
+            control.stop()
+        fetcher_factory.close()
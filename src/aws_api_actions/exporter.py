@@ -5,12 +5,18 @@ The data is serialized and saved in the following formats:
     - JSON
     - CSV
     - XML
+    - Binary catalog
 
 Each export format is handled by a separate function that takes in the
 processed data (dictionaries of services and their associated categories/values)
 and outputs it to the desired format. This allows the program to save the scraped
 information in a variety of formats for further use or analysis.
 
+Every exporter writes through a streaming compressor selected from the file
+extension (``.gz`` for gzip, ``.zst`` for zstd) or the ``compression``
+argument, see :mod:`aws_api_actions.compression`. The matching readers live in
+:mod:`aws_api_actions.loader`.
+
 Functions in this module:
     - text_exporter(data): Exports the data as a plain text file, with services
       and their categories listed in a human-readable format.
@@ -20,6 +26,27 @@ Functions in this module:
       .csv file.
     - xml_exporter(data): Converts the data into XML format and writes it to an
       .xml file.
+    - binary_exporter(data): Writes the data as a memory-mappable binary
+      catalog, see :mod:`aws_api_actions.binary_catalog`.
+
+Each format is implemented as a streaming ``Sink`` consuming
+``(service, category, value)`` records. ``fan_out`` walks the data once and
+feeds every record to any number of sinks, optionally writing each sink in its
+own thread, so exporting every format costs a single traversal:
+
+    - iter_records(data): Yields the records of the data.
+    - sort_data(data): Sorts the data by service, category and value, the
+      order of ``record_sort_key`` in which shard outputs are merged.
+    - get_sink(file_path): Creates the sink for a file from its extension.
+    - register_sink(extension, sink_class): Registers a custom sink.
+    - fan_out(records, sinks): Writes the records to all the sinks.
+
+Every output is written to a temporary file next to its target, and only
+renamed over the target if its contents changed, so an unchanged artifact
+keeps its modification time and sync tools (rsync, object-store uploads, CDN
+invalidations) skip it, and a failed export leaves the previous artifact
+intact. The ``output_to_*`` functions write the data sorted by service,
+category and value, so the same data always exports to the same bytes.
 
 Example Usage:
     # Import the exporter module
@@ -43,57 +70,840 @@ Example Usage:
     output_to_json(data)
     output_to_csv(data)
     output_to_xml(data)
+
+    # Export data to a gzip compressed JSON file
+    output_to_json("actions.json.gz", data)
+
+    # Export data to every format in a single pass
+    paths = ["actions.txt", "actions.json", "actions.csv", "actions.xml"]
+    fan_out(iter_records(data), [get_sink(path) for path in paths])
 """
 
-from typing import Dict, List
+import csv
+import hashlib
+import json
+import os
+import queue
+import shutil
+import threading
+from contextlib import ExitStack
+from types import TracebackType
+from typing import (
+    IO,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+)
+from xml.sax.saxutils import escape, quoteattr
+
+from aws_api_actions.binary_catalog import (
+    check_uncompressed,
+    write_binary_catalog,
+)
+from aws_api_actions.compression import (
+    open_compressed,
+    strip_compression_extension,
+)
+from aws_api_actions.exceptions import OutputError
+from aws_api_actions.logger import logger
+
+
+TEXT_INDENT = "    "
+CSV_HEADER = ["service", "category", "value"]
+
+# Bytes read at a time when hashing an output.
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Number of records handed to a sink thread at once by ``fan_out``.
+FAN_OUT_BATCH_SIZE = 1024
+# Number of batches buffered for each sink thread by ``fan_out``.
+FAN_OUT_QUEUE_SIZE = 16
+
+# A ``(service, category, value)`` record. A ``None`` value marks a category
+# without values, and a ``None`` category marks a service without categories.
+Record = Tuple[str, Optional[str], Optional[str]]
+
+
+def iter_records(data: Dict[str, Dict[str, List[str]]]) -> Iterator[Record]:
+    """Yield the ``(service, category, value)`` records of the data.
+
+    Args:
+        data (Dict[str, Dict[str, List[str]]]): The data to export.
+
+    Yields:
+        Record: The records, grouped by service and category.
+    """
+    for service, categories in data.items():
+        if not categories:
+            yield service, None, None
+        for category, values in categories.items():
+            if not values:
+                yield service, category, None
+            for value in values:
+                yield service, category, value
+
+
+def record_sort_key(record: Record) -> Tuple[str, str, str]:
+    """Returns the key ordering the records by service, category and value.
+
+    The markers of empty groups sort before the values of the group.
+
+    Args:
+        record (Record): The record.
+
+    Returns:
+        Tuple[str, str, str]: The sort key.
+    """
+    service, category, value = record
+    return service, category or "", value or ""
+
+
+def sort_data(
+    data: Dict[str, Dict[str, List[str]]],
+) -> Dict[str, Dict[str, List[str]]]:
+    """Returns a copy of the data sorted by service, category and value.
+
+    Args:
+        data (Dict[str, Dict[str, List[str]]]): The data.
+
+    Returns:
+        Dict[str, Dict[str, List[str]]]: The sorted data.
+    """
+    return {
+        service: {
+            category: sorted(data[service][category])
+            for category in sorted(data[service])
+        }
+        for service in sorted(data)
+    }
+
+
+def _is_in_group(record: Record, marker: Record) -> bool:
+    """Check whether a record belongs to the group of an empty marker."""
+    if marker[1] is None:
+        return record[0] == marker[0]
+
+    return record[:2] == marker[:2]
+
+
+def compact_records(records: Iterable[Record]) -> Iterator[Record]:
+    """Drop the empty group markers of the groups that have records.
+
+    Readers may yield a marker for every group as they start it, before
+    knowing whether it is empty. Only the markers of the groups that turn out
+    empty are kept, as ``iter_records`` would yield them.
+
+    Args:
+        records (Iterable[Record]): The records, grouped by service and
+            category.
+
+    Yields:
+        Record: The records without the redundant markers.
+    """
+    pending: Optional[Record] = None
+    for record in records:
+        if pending is not None and not _is_in_group(record, pending):
+            yield pending
+        pending = None
+
+        if record[2] is None:
+            pending = record
+        else:
+            yield record
+
+    if pending is not None:
+        yield pending
+
+
+def get_temp_path(file_path: str) -> str:
+    """Returns the temporary path a file is written to before the rename.
+
+    The temporary file is in the same directory, so it can be renamed over
+    the file atomically, and keeps the extension, which selects the format
+    and the compression.
+
+    Args:
+        file_path (str): The path to the file.
+
+    Returns:
+        str: The temporary path.
+    """
+    directory, filename = os.path.split(os.path.abspath(file_path))
+    return os.path.join(directory, f".tmp-{os.getpid()}-{filename}")
+
+
+def _hash_file(file_path: str) -> bytes:
+    """Returns the sha256 digest of a file."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+
+    return digest.digest()
 
 
-def write_to_file(file_path: str, contents: str) -> None:
-    """Write the contents to a file.
+def replace_if_changed(temp_path: str, file_path: str) -> bool:
+    """Rename a temporary file over a file, unless their contents are equal.
+
+    An unchanged file is left untouched, keeping its modification time, and
+    the temporary file is removed. A replaced file keeps its permissions.
+
+    Args:
+        temp_path (str): The path to the new contents.
+        file_path (str): The path to the file.
+
+    Returns:
+        bool: Whether the file was replaced.
+
+    Raises:
+        OutputError: If the file cannot be replaced.
+    """
+    try:
+        if (
+            os.path.isfile(file_path)
+            and os.path.getsize(file_path) == os.path.getsize(temp_path)
+            and _hash_file(file_path) == _hash_file(temp_path)
+        ):
+            os.remove(temp_path)
+            logger.debug("Unchanged, kept %s", file_path)
+            return False
+
+        if os.path.exists(file_path):
+            shutil.copymode(file_path, temp_path)
+        os.replace(temp_path, file_path)
+    except OSError as err:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise OutputError(f"Failed to replace {file_path}: {err}") from err
+
+    return True
+
+
+def _remove_temp(temp_path: str) -> None:
+    """Remove a temporary file, if it exists."""
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+
+
+class Sink:
+    """Base class of the streaming exporters.
+
+    A sink is opened, receives the records grouped by service and category
+    through ``write``, and is closed once all the records are written.
+    Subclasses implement ``start_service``, ``start_category``, ``write_value``
+    and the matching ``end_*`` and ``finish`` methods, which are called as the
+    groups change. When used as a context manager, a sink left by an exception
+    is aborted and its partial file removed instead of being finished.
+
+    The output is written to a temporary file, renamed over ``file_path`` on
+    close only if it changed, which ``changed`` tells once the sink is closed.
+    """
+
+    def __init__(self, file_path: str, compression: Optional[str] = None):
+        """Initialize the sink.
+
+        Args:
+            file_path (str): The path to the file to write to.
+            compression (Optional[str], optional): The compression codec.
+                Defaults to None, in which case it is selected from the file
+                extension.
+        """
+        self.file_path = file_path
+        self.compression = compression
+        self.changed: Optional[bool] = None
+        self._temp_path = get_temp_path(file_path)
+        self._file: Optional[IO[str]] = None
+        self._service: Optional[str] = None
+        self._category: Optional[str] = None
+
+    @property
+    def file(self) -> IO[str]:
+        """Return the opened file of the sink."""
+        if self._file is None:
+            raise OutputError(f"Sink is not open: {self.file_path}")
+
+        return self._file
+
+    def open(self) -> None:
+        """Open the temporary file of the sink."""
+        self.changed = None
+        self._file = open_compressed(self._temp_path, "w", self.compression)
+        self.start()
+
+    def write(self, record: Record) -> None:
+        """Write a record to the sink.
+
+        Args:
+            record (Record): The ``(service, category, value)`` record.
+        """
+        service, category, value = record
+        if service != self._service:
+            self._end_groups()
+            self._service, self._category = service, None
+            self.start_service(service)
+
+        if category is not None and category != self._category:
+            if self._category is not None:
+                self.end_category()
+            self._category = category
+            self.start_category(category)
+
+        if value is not None:
+            self.write_value(value)
+
+    def _end_groups(self) -> None:
+        """End the current category and service, if any."""
+        if self._category is not None:
+            self.end_category()
+        if self._service is not None:
+            self.end_service()
+        self._service = self._category = None
+
+    def close(self) -> None:
+        """Finish the output, replacing the file if it changed."""
+        self._end_groups()
+        self.finish()
+        self.file.close()
+        self._file = None
+        self.changed = replace_if_changed(self._temp_path, self.file_path)
+
+    def abort(self) -> None:
+        """Close the file of the sink and remove the partial output."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        _remove_temp(self._temp_path)
+
+    def __enter__(self) -> "Sink":
+        """Open the sink for use as a context manager."""
+        self.open()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Close the sink, or abort it if an exception was raised."""
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def start(self) -> None:
+        """Write the header of the output."""
+
+    def start_service(self, service: str) -> None:
+        """Write the start of a service."""
+
+    def start_category(self, category: str) -> None:
+        """Write the start of a category."""
+
+    def write_value(self, value: str) -> None:
+        """Write a value of the current category."""
+
+    def end_category(self) -> None:
+        """Write the end of the current category."""
+
+    def end_service(self) -> None:
+        """Write the end of the current service."""
+
+    def finish(self) -> None:
+        """Write the footer of the output."""
+
+
+class TextSink(Sink):
+    """Plain text sink, with categories and values indented under services."""
+
+    def start_service(self, service: str) -> None:
+        """Write the start of a service."""
+        self.file.write(f"{service}\n")
+
+    def start_category(self, category: str) -> None:
+        """Write the start of a category."""
+        self.file.write(f"{TEXT_INDENT}{category}\n")
+
+    def write_value(self, value: str) -> None:
+        """Write a value of the current category."""
+        self.file.write(f"{TEXT_INDENT * 2}{value}\n")
+
+
+class JsonSink(Sink):
+    """JSON sink, streaming the same document as ``json.dump(indent=4)``."""
+
+    def __init__(self, file_path: str, compression: Optional[str] = None):
+        """Initialize the sink.
+
+        Args:
+            file_path (str): The path to the file to write to.
+            compression (Optional[str], optional): The compression codec.
+                Defaults to None, in which case it is selected from the file
+                extension.
+        """
+        super().__init__(file_path, compression)
+        # Number of children written in each open object or array.
+        self._children: List[int] = []
+
+    def _start_child(self, depth: int) -> None:
+        """Write the separator and indentation of the next child."""
+        separator = ",\n" if self._children[-1] else "\n"
+        self._children[-1] += 1
+        self.file.write(f"{separator}{TEXT_INDENT * depth}")
+
+    def _end(self, closing: str, depth: int) -> None:
+        """Close the current object or array."""
+        if self._children.pop():
+            self.file.write(f"\n{TEXT_INDENT * depth}{closing}")
+        else:
+            self.file.write(closing)
+
+    def start(self) -> None:
+        """Write the header of the output."""
+        self._children = [0]
+        self.file.write("{")
+
+    def start_service(self, service: str) -> None:
+        """Write the start of a service."""
+        self._start_child(1)
+        self.file.write(f"{json.dumps(service)}: {{")
+        self._children.append(0)
+
+    def start_category(self, category: str) -> None:
+        """Write the start of a category."""
+        self._start_child(2)
+        self.file.write(f"{json.dumps(category)}: [")
+        self._children.append(0)
+
+    def write_value(self, value: str) -> None:
+        """Write a value of the current category."""
+        self._start_child(3)
+        self.file.write(json.dumps(value))
+
+    def end_category(self) -> None:
+        """Write the end of the current category."""
+        self._end("]", 2)
+
+    def end_service(self) -> None:
+        """Write the end of the current service."""
+        self._end("}", 1)
+
+    def finish(self) -> None:
+        """Write the footer of the output."""
+        self._end("}", 0)
+        self.file.write("\n")
+
+
+class CsvSink(Sink):
+    """CSV sink, writing each value as a ``service,category,value`` row.
+
+    A category without values is written as a ``service,category`` row, and a
+    service without categories as a ``service`` row.
+    """
+
+    def start(self) -> None:
+        """Write the header of the output."""
+        self._writer = csv.writer(self.file, lineterminator="\n")
+        self._writer.writerow(CSV_HEADER)
+
+    def write(self, record: Record) -> None:
+        """Write a record to the sink.
+
+        Args:
+            record (Record): The ``(service, category, value)`` record.
+        """
+        self._writer.writerow([field for field in record if field is not None])
+
+
+class XmlSink(Sink):
+    """XML sink, nesting values under their category and service elements."""
+
+    def start(self) -> None:
+        """Write the header of the output."""
+        self.file.write('<?xml version="1.0" encoding="utf-8"?>\n<services>\n')
+
+    def start_service(self, service: str) -> None:
+        """Write the start of a service."""
+        self.file.write(f"  <service name={quoteattr(service)}>\n")
+
+    def start_category(self, category: str) -> None:
+        """Write the start of a category."""
+        self.file.write(f"    <category name={quoteattr(category)}>\n")
+
+    def write_value(self, value: str) -> None:
+        """Write a value of the current category."""
+        self.file.write(f"      <value>{escape(value)}</value>\n")
+
+    def end_category(self) -> None:
+        """Write the end of the current category."""
+        self.file.write("    </category>\n")
+
+    def end_service(self) -> None:
+        """Write the end of the current service."""
+        self.file.write("  </service>\n")
+
+    def finish(self) -> None:
+        """Write the footer of the output."""
+        self.file.write("</services>\n")
+
+
+class BinarySink(Sink):
+    """Binary catalog sink.
+
+    The catalog is sorted and indexed as a whole, so the records are collected
+    in memory and the catalog is only written when the sink is closed.
+    """
+
+    def __init__(self, file_path: str, compression: Optional[str] = None):
+        """Initialize the sink.
+
+        Args:
+            file_path (str): The path to the file to write to.
+            compression (Optional[str], optional): Must resolve to no
+                compression. Defaults to None.
+        """
+        super().__init__(file_path, compression)
+        self._data: Dict[str, Dict[str, List[str]]] = {}
+
+    def open(self) -> None:
+        """Prepare the sink for writing."""
+        check_uncompressed(self.file_path, self.compression)
+        self.changed = None
+        self._data = {}
+
+    def write(self, record: Record) -> None:
+        """Write a record to the sink.
+
+        Args:
+            record (Record): The ``(service, category, value)`` record.
+        """
+        service, category, value = record
+        categories = self._data.setdefault(service, {})
+        if category is not None:
+            values = categories.setdefault(category, [])
+            if value is not None:
+                values.append(value)
+
+    def close(self) -> None:
+        """Write the catalog, replacing the file if it changed."""
+        try:
+            write_binary_catalog(self._temp_path, self._data)
+        except BaseException:
+            _remove_temp(self._temp_path)
+            raise
+        finally:
+            self._data = {}
+
+        self.changed = replace_if_changed(self._temp_path, self.file_path)
+
+    def abort(self) -> None:
+        """Discard the collected records without writing the catalog."""
+        self._data = {}
+        _remove_temp(self._temp_path)
+
+
+SINKS: Dict[str, Type[Sink]] = {
+    ".txt": TextSink,
+    ".json": JsonSink,
+    ".csv": CsvSink,
+    ".xml": XmlSink,
+    ".bin": BinarySink,
+}
+
+
+def register_sink(extension: str, sink_class: Type[Sink]) -> None:
+    """Register a sink class for the files with the given extension.
+
+    Args:
+        extension (str): The file extension, e.g. ``.yaml``.
+        sink_class (Type[Sink]): The sink class.
+    """
+    SINKS[extension.lower()] = sink_class
+
+
+def get_sink(file_path: str, compression: Optional[str] = None) -> Sink:
+    """Create the sink for a file, selected from its extension.
+
+    Args:
+        file_path (str): The path to the file to write to.
+        compression (Optional[str], optional): The compression codec. Defaults
+            to None, in which case it is selected from the file extension.
+
+    Returns:
+        Sink: The sink writing to the file.
+
+    Raises:
+        OutputError: If no sink is registered for the file extension.
+    """
+    extension = os.path.splitext(strip_compression_extension(file_path))[1]
+    sink_class = SINKS.get(extension.lower())
+    if sink_class is None:
+        raise OutputError(f"Unsupported file format: {file_path}")
+
+    return sink_class(file_path, compression)
+
+
+def _batched(records: Iterable[Record]) -> Iterator[List[Record]]:
+    """Yield the records in batches of ``FAN_OUT_BATCH_SIZE``."""
+    batch: List[Record] = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= FAN_OUT_BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _write_batches(sinks: List[Sink], batches: Iterable[List[Record]]) -> None:
+    """Open the sinks, write the batches of records to them and close them.
+
+    If anything fails, every sink is aborted instead of being closed.
+    """
+    with ExitStack() as stack:
+        for sink in sinks:
+            stack.enter_context(sink)
+        for batch in batches:
+            for record in batch:
+                for sink in sinks:
+                    sink.write(record)
+
+
+# Queue item telling a sink thread to abort its sinks.
+_ABORT: List[Record] = []
+
+
+def _drain_group(
+    sinks: List[Sink],
+    batches: "queue.Queue[Optional[List[Record]]]",
+    errors: List[BaseException],
+) -> None:
+    """Write the batches of a queue to a group of sinks until the end marker.
+
+    Failures are recorded in ``errors`` and the queue keeps being drained, so
+    the producer never blocks on a dead writer.
+    """
+    ended = False
+
+    def receive() -> Iterator[List[Record]]:
+        nonlocal ended
+        while True:
+            batch = batches.get()
+            if batch is None or batch is _ABORT:
+                ended = True
+            if batch is None:
+                return
+            if batch is _ABORT:
+                raise OutputError("Export aborted")
+            yield batch
+
+    try:
+        _write_batches(sinks, receive())
+    except Exception as err:
+        errors.append(err)
+
+    while not ended:
+        batch = batches.get()
+        ended = batch is None or batch is _ABORT
+
+
+def _fan_out_threaded(
+    records: Iterable[Record], sinks: List[Sink], max_workers: int
+) -> None:
+    """Write the records to the sinks from up to ``max_workers`` threads."""
+    # Sinks beyond max_workers share a thread, which writes them in turn.
+    groups: List[List[Sink]] = [[] for _ in range(min(max_workers, len(sinks)))]
+    for index, sink in enumerate(sinks):
+        groups[index % len(groups)].append(sink)
+
+    errors: List[BaseException] = []
+    queues: List["queue.Queue[Optional[List[Record]]]"] = [
+        queue.Queue(maxsize=FAN_OUT_QUEUE_SIZE) for _ in groups
+    ]
+    threads = [
+        threading.Thread(
+            target=_drain_group,
+            args=(group, batches, errors),
+            name="fan-out",
+            daemon=True,
+        )
+        for group, batches in zip(groups, queues, strict=True)
+    ]
+    for thread in threads:
+        thread.start()
+
+    end_marker: Optional[List[Record]] = _ABORT
+    try:
+        for batch in _batched(records):
+            if errors:
+                raise errors[0]
+            for batches in queues:
+                batches.put(batch)
+        end_marker = None
+    finally:
+        for batches in queues:
+            batches.put(end_marker)
+        for thread in threads:
+            thread.join()
+
+    if errors:
+        raise errors[0]
+
+
+def fan_out(
+    records: Iterable[Record],
+    sinks: List[Sink],
+    max_workers: Optional[int] = None,
+) -> None:
+    """Write the records to all the sinks in a single traversal.
+
+    If the records or any sink fail, the sinks are aborted and their partial
+    files removed rather than finished, so no truncated artifact is left
+    behind.
+
+    Args:
+        records (Iterable[Record]): The records, grouped by service and
+            category.
+        sinks (List[Sink]): The sinks to write to.
+        max_workers (Optional[int], optional): If given, the sinks are written
+            by up to ``max_workers`` threads. Defaults to None, in which case
+            the sinks are written in the calling thread.
+
+    Raises:
+        OutputError: If reading the records or writing to a sink fails.
+    """
+    try:
+        if max_workers is None or max_workers <= 1 or len(sinks) <= 1:
+            _write_batches(sinks, _batched(records))
+        else:
+            _fan_out_threaded(records, sinks, max_workers)
+    except OutputError:
+        raise
+    except Exception as err:
+        raise OutputError(f"Failed to write the sinks: {err}") from err
+
+
+def _export(sink: Sink, data: Dict[str, Dict[str, List[str]]]) -> None:
+    """Write the data, sorted, to a single sink."""
+    with sink:
+        for record in iter_records(sort_data(data)):
+            sink.write(record)
+
+
+def write_to_file(
+    file_path: str, contents: str, compression: Optional[str] = None
+) -> bool:
+    """Write the contents to a file, unless it already holds them.
 
     Args:
         file_path (str): The path to the file to write to.
         contents (str): The contents to write to the file.
+        compression (Optional[str], optional): The compression codec. Defaults
+            to None, in which case it is selected from the file extension.
+
+    Returns:
+        bool: Whether the file was written.
+
+    Raises:
+        OutputError: If the file cannot be written.
     """
-    with open(file_path, "w", encoding="utf-8") as file:
-        file.write(contents)
+    temp_path = get_temp_path(file_path)
+    try:
+        with open_compressed(temp_path, "w", compression) as file:
+            file.write(contents)
+    except BaseException:
+        _remove_temp(temp_path)
+        raise
+
+    return replace_if_changed(temp_path, file_path)
 
 
 def output_to_text(
-    file_path: str, data: Dict[str, Dict[str, List[str]]]
+    file_path: str,
+    data: Dict[str, Dict[str, List[str]]],
+    compression: Optional[str] = None,
 ) -> None:
     """Export the data as an plain text file.
 
+    Services are written at the top level, with their categories and values
+    indented underneath them.
+
     Args:
         file_path (str): The path to the file to write to.
         data (Dict[str, Dict[str, List[str]]]): The data to export
+        compression (Optional[str], optional): The compression codec. Defaults
+            to None, in which case it is selected from the file extension.
     """
+    _export(TextSink(file_path, compression), data)
 
 
 def output_to_json(
-    file_path: str, data: Dict[str, Dict[str, List[str]]]
+    file_path: str,
+    data: Dict[str, Dict[str, List[str]]],
+    compression: Optional[str] = None,
 ) -> None:
     """Export the data as an json file.
 
     Args:
         file_path (str): The path to the file to write to.
         data (Dict[str, Dict[str, List[str]]]): The data to export
+        compression (Optional[str], optional): The compression codec. Defaults
+            to None, in which case it is selected from the file extension.
     """
+    _export(JsonSink(file_path, compression), data)
 
 
-def output_to_csv(file_path: str, data: Dict[str, Dict[str, List[str]]]) -> None:
+def output_to_csv(
+    file_path: str,
+    data: Dict[str, Dict[str, List[str]]],
+    compression: Optional[str] = None,
+) -> None:
     """Export the data as an csv file.
 
+    Each value is written as a single ``service,category,value`` row.
+
     Args:
         file_path (str): The path to the file to write to.
         data (Dict[str, Dict[str, List[str]]]): The data to export
+        compression (Optional[str], optional): The compression codec. Defaults
+            to None, in which case it is selected from the file extension.
     """
+    _export(CsvSink(file_path, compression), data)
 
 
-def output_to_xml(file_path: str, data: Dict[str, Dict[str, List[str]]]) -> None:
+def output_to_xml(
+    file_path: str,
+    data: Dict[str, Dict[str, List[str]]],
+    compression: Optional[str] = None,
+) -> None:
     """Export the data as an xml file.
 
     Args:
         file_path (str): The path to the file to write to.
         data (Dict[str, Dict[str, List[str]]]): The data to export
+        compression (Optional[str], optional): The compression codec. Defaults
+            to None, in which case it is selected from the file extension.
+    """
+    _export(XmlSink(file_path, compression), data)
+
+
+def output_to_binary(
+    file_path: str,
+    data: Dict[str, Dict[str, List[str]]],
+    compression: Optional[str] = None,
+) -> None:
+    """Export the data as a memory-mappable binary catalog.
+
+    The values of each category are stored sorted, duplicates included.
+
+    Args:
+        file_path (str): The path to the file to write to.
+        data (Dict[str, Dict[str, List[str]]]): The data to export
+        compression (Optional[str], optional): Must resolve to no compression,
+            since the catalog is memory-mapped by its readers. Defaults to None.
     """
+    _export(BinarySink(file_path, compression), data)
@@ -0,0 +1,784 @@
+"""Strategies to fetch the HTML of the AWS documentation pages.
+
+Most documentation pages are static and can be fetched with a plain HTTP GET,
+while a few render their content client-side and need a real browser. The
+``HybridFetcher`` tries the cheap HTTP path first, checks whether the expected
+content is present, and only escalates to the browser when it is not. The
+strategy needed is remembered per URL pattern, so later pages of the same kind
+go straight to the right fetcher.
+
+``fetch_many`` fetches several pages, yielding each as soon as it is ready.
+The ``BrowserFetcher`` can load them in several tabs of a single browser, so
+one browser process serves several in-flight pages.
+
+The ``ReplayFetcher`` serves the pages from a HAR archive recorded by an
+earlier run, see :mod:`aws_api_actions.har`.
+
+A ``SharedFetcher`` lets several threads use a single fetcher, driven by its
+own thread, which hands it the pages requested by every thread in batches. The
+fetch threads of the pipeline share a tabbed ``BrowserFetcher`` that way, so a
+single browser loads the pages of every thread in its tabs.
+
+Usage example:
+    with HybridFetcher(HttpFetcher(), BrowserFetcher(tabs=4)) as fetcher:
+        html = fetcher.fetch(url)
+        for url, html in fetcher.fetch_many(urls):
+            ...
+"""
+
+import abc
+import posixpath
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, as_completed
+from functools import partial
+from types import TracebackType
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
+from urllib.parse import urljoin, urlparse
+
+import requests
+from selenium.common.exceptions import WebDriverException
+
+from aws_api_actions.constants import DEFAULT_BROWSER_BACKEND, USER_AGENT
+from aws_api_actions.exceptions import ScrapingError
+from aws_api_actions.har import HarArchive
+from aws_api_actions.logger import logger
+from aws_api_actions.memory import MemoryMonitor
+from aws_api_actions.telemetry import TimingCollector
+
+
+DEFAULT_TIMEOUT = 30
+DEFAULT_RETRIES = 3
+# Delay before the first retry of a throttled request, doubled at each retry,
+# in seconds.
+DEFAULT_BACKOFF = 1.0
+# Statuses of the throttled or briefly unavailable requests, worth retrying.
+RETRY_STATUSES = (429, 503)
+
+STRATEGY_HTTP = "http"
+STRATEGY_BROWSER = "browser"
+
+# Marker present in the Service Authorization Reference pages once their
+# tables are rendered.
+ACTIONS_CONTENT_MARKER = "Actions defined by"
+
+# Number of redirects followed when replaying a page.
+MAX_REDIRECTS = 10
+
+# Interval between two checks of the tabs loading pages, in seconds.
+TAB_POLL_INTERVAL = 0.05
+
+# Script starting a navigation in the current tab. The flag set on the old
+# document tells it apart from the new one, which is loaded once it's gone.
+NAVIGATE_SCRIPT = (
+    "window.__awsApiActionsLoading = true; window.location.href = arguments[0];"
+)
+LOADED_SCRIPT = (
+    "return window.__awsApiActionsLoading === undefined"
+    " && document.readyState === 'complete';"
+)
+
+# The URL and either the page HTML, or the error fetching it.
+FetchResult = Tuple[str, Union[str, ScrapingError]]
+
+
+def has_action_content(html: str) -> bool:
+    """Check whether the page contains the actions of a service.
+
+    Args:
+        html (str): The page HTML.
+
+    Returns:
+        bool: Whether the actions table is present.
+    """
+    return ACTIONS_CONTENT_MARKER in html
+
+
+def get_url_pattern(url: str) -> str:
+    """Returns the pattern grouping URLs served the same way.
+
+    Pages in the same documentation directory of the same host are rendered
+    the same way, so the pattern is the host and the directory of the path.
+
+    Args:
+        url (str): The URL.
+
+    Returns:
+        str: The URL pattern.
+    """
+    url_comps = urlparse(url)
+    return f"{url_comps.netloc}{posixpath.dirname(url_comps.path)}"
+
+
+class Fetcher(abc.ABC):
+    """Base class of the page fetchers."""
+
+    @abc.abstractmethod
+    def fetch(self, url: str) -> str:
+        """Fetch the HTML of a page.
+
+        Args:
+            url (str): The URL of the page.
+        """
+
+    def fetch_static(self, url: str) -> str:
+        """Fetch the HTML of a page known to be static, e.g. an index.
+
+        Fetchers with several strategies fetch it with the cheapest one,
+        without checking for the content of a service page.
+
+        Args:
+            url (str): The URL of the page.
+
+        Returns:
+            str: The page HTML.
+        """
+        return self.fetch(url)
+
+    def fetch_many(self, urls: Iterable[str]) -> Iterator[FetchResult]:
+        """Fetch several pages, yielding each page as soon as it is fetched.
+
+        The pages may be yielded in a different order than the URLs. A page
+        failing to load doesn't stop the others, its error is yielded instead.
+
+        Args:
+            urls (Iterable[str]): The URLs of the pages.
+
+        Yields:
+            FetchResult: The URL and the page HTML, or the ScrapingError.
+        """
+        for url in urls:
+            try:
+                yield url, self.fetch(url)
+            except ScrapingError as err:
+                yield url, err
+
+    def close(self) -> None:  # noqa: B027
+        """Release the resources of the fetcher, none by default."""
+
+    def __enter__(self) -> "Fetcher":
+        """Return the fetcher for use as a context manager."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Close the fetcher when leaving the context."""
+        self.close()
+
+
+class HttpFetcher(Fetcher):
+    """Fetcher using a plain HTTP GET."""
+
+    def __init__(
+        self,
+        session: Optional[requests.Session] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        retries: int = DEFAULT_RETRIES,
+        backoff: float = DEFAULT_BACKOFF,
+        har: Optional[HarArchive] = None,
+    ) -> None:
+        """Initialize the fetcher.
+
+        Args:
+            session (Optional[requests.Session], optional): The HTTP session
+                to use. Defaults to None, in which case a new one is created.
+            timeout (float, optional): The request timeout in seconds.
+                Defaults to DEFAULT_TIMEOUT.
+            retries (int, optional): The number of retries of a throttled
+                request. Defaults to DEFAULT_RETRIES.
+            backoff (float, optional): The delay before the first retry in
+                seconds, doubled at each retry, unless the server sends a
+                ``Retry-After`` header. Defaults to DEFAULT_BACKOFF.
+            har (Optional[HarArchive], optional): Archive recording the
+                responses. Defaults to None.
+        """
+        self.session = session or requests.Session()
+        self.session.headers["User-Agent"] = USER_AGENT
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        if har is not None:
+            self.session.hooks["response"].append(har.record_response)
+
+    def _get_retry_delay(
+        self, response: requests.Response, attempt: int
+    ) -> float:
+        """Returns the delay before retrying a throttled request."""
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return float(retry_after)
+
+        return float(self.backoff * 2**attempt)
+
+    def fetch(self, url: str) -> str:
+        """Fetch the HTML of a page, retrying the throttled requests.
+
+        Args:
+            url (str): The URL of the page.
+
+        Returns:
+            str: The page HTML.
+
+        Raises:
+            ScrapingError: If the request fails.
+        """
+        try:
+            for attempt in range(self.retries + 1):
+                response = self.session.get(url, timeout=self.timeout)
+                if (
+                    response.status_code not in RETRY_STATUSES
+                    or attempt == self.retries
+                ):
+                    break
+
+                delay = self._get_retry_delay(response, attempt)
+                logger.debug("Throttled on %s, retrying in %ss", url, delay)
+                time.sleep(delay)
+
+            response.raise_for_status()
+        except requests.RequestException as err:
+            raise ScrapingError(f"Failed to fetch {url}: {err}") from err
+
+        return response.text
+
+    def close(self) -> None:
+        """Close the HTTP session."""
+        self.session.close()
+
+
+class BrowserFetcher(Fetcher):
+    """Fetcher rendering the pages in a Selenium webdriver.
+
+    The webdriver is only started on the first fetch, so a fetcher that never
+    needs the browser never pays for its startup. With several ``tabs``,
+    ``fetch_many`` loads that many pages concurrently in tabs of the same
+    browser, instead of starting a browser process per in-flight page.
+    """
+
+    def __init__(
+        self,
+        driver_factory: Optional[Callable[[], Any]] = None,
+        profile_template: Optional[str] = None,
+        tabs: int = 1,
+        timeout: float = DEFAULT_TIMEOUT,
+        telemetry: Optional[TimingCollector] = None,
+        har: Optional[HarArchive] = None,
+        memory: Optional[MemoryMonitor] = None,
+        browser_backend: str = DEFAULT_BROWSER_BACKEND,
+    ) -> None:
+        """Initialize the fetcher.
+
+        Args:
+            driver_factory (Optional[Callable[[], Any]], optional): Function
+                creating the webdriver. Defaults to None, in which case the
+                default headless webdriver of ``browser_backend`` is used.
+            profile_template (Optional[str], optional): Profile template the
+                default webdriver starts on a copy of. Defaults to None.
+            tabs (int, optional): The number of pages ``fetch_many`` loads
+                concurrently. Defaults to 1.
+            timeout (float, optional): The time a page loading in a tab has
+                to finish, in seconds. Defaults to DEFAULT_TIMEOUT.
+            telemetry (Optional[TimingCollector], optional): Collector of the
+                page load timings. Defaults to None.
+            har (Optional[HarArchive], optional): Archive recording the
+                requests of the pages, captured by selenium-wire. Defaults to
+                None.
+            memory (Optional[MemoryMonitor], optional): Monitor tracking the
+                memory of the webdriver, which is restarted when above its
+                budget. Defaults to None.
+            browser_backend (str, optional): The browser of the default
+                webdriver, see :mod:`aws_api_actions.browser`. Defaults to
+                DEFAULT_BROWSER_BACKEND.
+        """
+        self.driver_factory = driver_factory
+        self.profile_template = profile_template
+        self.tabs = tabs
+        self.timeout = timeout
+        self.telemetry = telemetry
+        self.har = har
+        self.memory = memory
+        self.browser_backend = browser_backend
+        self._driver: Optional[Any] = None
+
+    @property
+    def driver(self) -> Any:
+        """Return the webdriver, starting it if needed."""
+        if self._driver is None:
+            if self.driver_factory is None:
+                # Imported lazily, so HTTP-only runs never load selenium-wire.
+                from aws_api_actions.browser import setup_default_webdriver
+
+                self.driver_factory = partial(
+                    setup_default_webdriver,
+                    profile_template=self.profile_template,
+                    backend=self.browser_backend,
+                )
+
+            logger.debug("Starting webdriver")
+            self._driver = self.driver_factory()
+
+        return self._driver
+
+    def fetch(self, url: str) -> str:
+        """Fetch the HTML of a page.
+
+        Args:
+            url (str): The URL of the page.
+
+        Returns:
+            str: The rendered page HTML.
+
+        Raises:
+            ScrapingError: If the page fails to load.
+        """
+        try:
+            self.driver.get(url)
+            page_source: str = self.driver.page_source
+        except WebDriverException as err:
+            raise ScrapingError(f"Failed to render {url}: {err}") from err
+
+        self._record(url)
+        self._enforce_budget()
+        return page_source
+
+    def _enforce_budget(self) -> None:
+        """Quit the webdriver if it is above its memory budget.
+
+        It is started again on the next fetch.
+        """
+        if (
+            self.memory is not None
+            and self._driver is not None
+            and self.memory.is_driver_over_budget(self._driver)
+        ):
+            self.close()
+
+    def _record(self, url: str) -> None:
+        """Record the timings and the requests of the page just loaded."""
+        if self.telemetry is not None:
+            self.telemetry.record_driver(self.driver, url)
+        if self.har is not None:
+            self.har.record_driver(self.driver)
+
+    def fetch_many(self, urls: Iterable[str]) -> Iterator[FetchResult]:
+        """Fetch several pages, loading up to ``tabs`` of them concurrently.
+
+        Args:
+            urls (Iterable[str]): The URLs of the pages.
+
+        Yields:
+            FetchResult: The URL and the page HTML, or the ScrapingError.
+        """
+        if self.tabs <= 1:
+            yield from super().fetch_many(urls)
+            return
+
+        pending = deque(urls)
+        if not pending:
+            return
+
+        try:
+            handles = self._open_tabs(min(self.tabs, len(pending)))
+        except WebDriverException as err:
+            raise ScrapingError(f"Failed to open tabs: {err}") from err
+
+        try:
+            yield from self._fetch_tabs(handles, pending)
+        finally:
+            self._close_tabs(handles)
+
+        self._enforce_budget()
+
+    def _open_tabs(self, count: int) -> List[str]:
+        """Open tabs until there are ``count``, returning their handles."""
+        handles = [self.driver.current_window_handle]
+        while len(handles) < count:
+            self.driver.switch_to.new_window("tab")
+            handles.append(self.driver.current_window_handle)
+
+        return handles
+
+    def _close_tabs(self, handles: List[str]) -> None:
+        """Close every tab but the first one, and switch back to it."""
+        try:
+            for handle in handles[1:]:
+                self.driver.switch_to.window(handle)
+                self.driver.close()
+            self.driver.switch_to.window(handles[0])
+        except WebDriverException as err:
+            logger.warning("Failed to close the tabs: %s", err)
+
+    def _fetch_tabs(
+        self, handles: List[str], pending: Deque[str]
+    ) -> Iterator[FetchResult]:
+        """Navigate the free tabs to the pending URLs and harvest the pages."""
+        loading: Dict[str, Tuple[str, float]] = {}
+        free = list(handles)
+
+        while pending or loading:
+            while free and pending:
+                handle, url = free.pop(), pending.popleft()
+                try:
+                    self.driver.switch_to.window(handle)
+                    self.driver.execute_script(NAVIGATE_SCRIPT, url)
+                    loading[handle] = (url, time.monotonic())
+                except WebDriverException as err:
+                    free.append(handle)
+                    yield url, ScrapingError(f"Failed to load {url}: {err}")
+
+            time.sleep(TAB_POLL_INTERVAL)
+            for handle, (url, started) in list(loading.items()):
+                result = self._harvest_tab(handle, url, started)
+                if result is not None:
+                    del loading[handle]
+                    free.append(handle)
+                    yield url, result
+
+    def _harvest_tab(
+        self, handle: str, url: str, started: float
+    ) -> Optional[Union[str, ScrapingError]]:
+        """Returns the page of a tab once loaded, or None while loading."""
+        try:
+            self.driver.switch_to.window(handle)
+            if self.driver.execute_script(LOADED_SCRIPT):
+                page_source: str = self.driver.page_source
+                self._record(url)
+                return page_source
+
+            if time.monotonic() - started > self.timeout:
+                # Stop the navigation, so the tab can load the next page.
+                self.driver.execute_script("window.stop();")
+                return ScrapingError(f"Timed out rendering {url}")
+        except WebDriverException as err:
+            return ScrapingError(f"Failed to render {url}: {err}")
+
+        return None
+
+    def close(self) -> None:
+        """Quit the webdriver, if it was started."""
+        if self._driver is not None:
+            self._driver.quit()
+            self._driver = None
+
+
+class ReplayFetcher(Fetcher):
+    """Fetcher serving the pages from a HAR archive, without the network."""
+
+    def __init__(self, archive: HarArchive) -> None:
+        """Initialize the fetcher.
+
+        Args:
+            archive (HarArchive): The archive replayed.
+        """
+        self.archive = archive
+
+    def fetch(self, url: str) -> str:
+        """Fetch the HTML of a page from the archive, following redirects.
+
+        Args:
+            url (str): The URL of the page.
+
+        Returns:
+            str: The page HTML.
+
+        Raises:
+            ScrapingError: If the page is not in the archive or was an error.
+        """
+        location = url
+        for _ in range(MAX_REDIRECTS + 1):
+            response = self.archive.get_response(location)
+            if response is None:
+                raise ScrapingError(f"{location} is not in the HAR archive")
+
+            headers = {
+                name.lower(): value for name, value in response.headers.items()
+            }
+            if 300 <= response.status < 400 and "location" in headers:
+                location = urljoin(location, headers["location"])
+                continue
+
+            if response.status >= 400:
+                raise ScrapingError(
+                    f"Failed to fetch {url}: recorded status {response.status}"
+                )
+
+            return response.text
+
+        raise ScrapingError(f"Too many redirects fetching {url}")
+
+
+class HybridFetcher(Fetcher):
+    """Fetcher trying HTTP first and escalating to a browser when needed."""
+
+    def __init__(
+        self,
+        http: Fetcher,
+        browser: Fetcher,
+        is_complete: Callable[[str], bool] = has_action_content,
+    ) -> None:
+        """Initialize the fetcher.
+
+        Args:
+            http (Fetcher): The cheap fetcher tried first.
+            browser (Fetcher): The fetcher rendering client-side content.
+            is_complete (Callable[[str], bool], optional): Function checking
+                whether a page contains the expected content. Defaults to
+                has_action_content.
+        """
+        self.http = http
+        self.browser = browser
+        self.is_complete = is_complete
+        self.strategies: Dict[str, str] = {}
+
+    def fetch(self, url: str) -> str:
+        """Fetch the HTML of a page with the cheapest working strategy.
+
+        Args:
+            url (str): The URL of the page.
+
+        Returns:
+            str: The page HTML.
+        """
+        pattern = get_url_pattern(url)
+
+        if self.strategies.get(pattern) == STRATEGY_BROWSER:
+            return self.browser.fetch(url)
+
+        html = self.http.fetch(url)
+        if self.is_complete(html):
+            self.strategies.setdefault(pattern, STRATEGY_HTTP)
+            return html
+
+        logger.debug("Content missing from %s, escalating to browser", url)
+        html = self.browser.fetch(url)
+        if self.is_complete(html):
+            self.strategies[pattern] = STRATEGY_BROWSER
+
+        return html
+
+    def fetch_static(self, url: str) -> str:
+        """Fetch the HTML of a static page over HTTP, never in the browser.
+
+        Args:
+            url (str): The URL of the page.
+
+        Returns:
+            str: The page HTML.
+        """
+        return self.http.fetch_static(url)
+
+    def fetch_many(self, urls: Iterable[str]) -> Iterator[FetchResult]:
+        """Fetch several pages with the cheapest working strategy.
+
+        The pages needing the browser are fetched together once the others
+        are done, so the browser can load them concurrently.
+
+        Args:
+            urls (Iterable[str]): The URLs of the pages.
+
+        Yields:
+            FetchResult: The URL and the page HTML, or the ScrapingError.
+        """
+        browser_urls = []
+        for url in urls:
+            pattern = get_url_pattern(url)
+            if self.strategies.get(pattern) == STRATEGY_BROWSER:
+                browser_urls.append(url)
+                continue
+
+            try:
+                html = self.http.fetch(url)
+            except ScrapingError as err:
+                yield url, err
+                continue
+
+            if self.is_complete(html):
+                self.strategies.setdefault(pattern, STRATEGY_HTTP)
+                yield url, html
+            else:
+                logger.debug("Content missing from %s, escalating", url)
+                browser_urls.append(url)
+
+        for url, result in self.browser.fetch_many(browser_urls):
+            if isinstance(result, str) and self.is_complete(result):
+                self.strategies[get_url_pattern(url)] = STRATEGY_BROWSER
+            yield url, result
+
+    def close(self) -> None:
+        """Close both fetchers."""
+        try:
+            self.http.close()
+        finally:
+            self.browser.close()
+
+
+class _BorrowedFetcher(Fetcher):
+    """Fetcher lent by a shared fetcher, left open when closed."""
+
+    def __init__(self, shared: "SharedFetcher") -> None:
+        """Wrap the shared fetcher."""
+        self.shared = shared
+
+    def fetch(self, url: str) -> str:
+        """Fetch a page with the shared fetcher."""
+        return self.shared.fetch(url)
+
+    def fetch_many(self, urls: Iterable[str]) -> Iterator[FetchResult]:
+        """Fetch several pages with the shared fetcher."""
+        return self.shared.fetch_many(urls)
+
+
+class SharedFetcher(Fetcher):
+    """Fetcher used by several threads, driven by a thread of its own.
+
+    The pages requested by the threads are queued, and handed to the wrapped
+    fetcher in batches of up to ``batch_size`` URLs, so a ``BrowserFetcher``
+    with that many tabs loads the pages of every thread concurrently in a
+    single browser. The wrapped fetcher is only ever used by the driving
+    thread, started on the first fetch.
+    """
+
+    def __init__(self, fetcher: Fetcher, batch_size: int = 1) -> None:
+        """Initialize the fetcher.
+
+        Args:
+            fetcher (Fetcher): The wrapped fetcher.
+            batch_size (int, optional): The number of URLs handed to the
+                wrapped fetcher at once. Defaults to 1.
+        """
+        self.fetcher = fetcher
+        self.batch_size = max(batch_size, 1)
+        self._requests: "queue.Queue[Optional[Tuple[str, Future[Any]]]]"
+        self._requests = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def borrow(self) -> Fetcher:
+        """Returns a fetcher using this one, left open when it is closed.
+
+        Returns:
+            Fetcher: The borrowed fetcher.
+        """
+        return _BorrowedFetcher(self)
+
+    def _submit(self, url: str) -> "Future[Any]":
+        """Queue a URL for the driving thread, starting it if needed."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._drive, name="shared-fetcher", daemon=True
+                )
+                self._thread.start()
+
+        future: "Future[Any]" = Future()
+        self._requests.put((url, future))
+        return future
+
+    def _next_batch(self) -> Optional[List[Tuple[str, "Future[Any]"]]]:
+        """Wait for a request, and take the queued ones up to a batch."""
+        request = self._requests.get()
+        if request is None:
+            return None
+
+        batch = [request]
+        while len(batch) < self.batch_size:
+            try:
+                request = self._requests.get_nowait()
+            except queue.Empty:
+                break
+            if request is None:
+                # Stop once this batch is fetched.
+                self._requests.put(None)
+                break
+            batch.append(request)
+
+        return batch
+
+    def _drive(self) -> None:
+        """Fetch the queued URLs in batches until the end marker."""
+        for batch in iter(self._next_batch, None):
+            waiting: Dict[str, List["Future[Any]"]] = {}
+            for url, future in batch:
+                waiting.setdefault(url, []).append(future)
+
+            try:
+                for url, result in self.fetcher.fetch_many(waiting):
+                    for future in waiting.pop(url, []):
+                        future.set_result(result)
+            except Exception as err:
+                self._fail(waiting, err)
+            else:
+                # Pages the wrapped fetcher didn't yield.
+                self._fail(waiting, ScrapingError("Page not fetched"))
+
+    @staticmethod
+    def _fail(waiting: Dict[str, List["Future[Any]"]], err: Exception) -> None:
+        """Fail the requests still waiting for their page."""
+        for futures in waiting.values():
+            for future in futures:
+                future.set_exception(err)
+
+    def fetch(self, url: str) -> str:
+        """Fetch the HTML of a page with the wrapped fetcher.
+
+        Args:
+            url (str): The URL of the page.
+
+        Returns:
+            str: The page HTML.
+
+        Raises:
+            ScrapingError: If the page fails to load.
+        """
+        result = self._submit(url).result()
+        if isinstance(result, ScrapingError):
+            raise result
+
+        html: str = result
+        return html
+
+    def fetch_many(self, urls: Iterable[str]) -> Iterator[FetchResult]:
+        """Fetch several pages, batched with those of the other threads.
+
+        Args:
+            urls (Iterable[str]): The URLs of the pages.
+
+        Yields:
+            FetchResult: The URL and the page HTML, or the ScrapingError.
+        """
+        futures = {self._submit(url): url for url in urls}
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except ScrapingError as err:
+                result = err
+            yield futures[future], result
+
+    def close(self) -> None:
+        """Stop the driving thread, and close the wrapped fetcher."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+
+        if thread is not None:
+            self._requests.put(None)
+            thread.join()
+
+        self.fetcher.close()
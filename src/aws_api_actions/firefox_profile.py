@@ -0,0 +1,261 @@
+"""Build a prewarmed Firefox profile template for the webdrivers.
+
+By default every webdriver makes Firefox create a fresh profile, run its first
+start tasks and load the default preferences, which is a large part of the
+browser startup time. The profile template is built once, with preferences
+turning off telemetry, updates, safe browsing, prefetching and session
+restore, and prewarmed by starting Firefox on it once. Each webdriver then
+starts on its own copy of the template.
+
+Functions in this module:
+    - build_profile_template(directory): Writes the tuned preferences.
+    - prewarm_profile(directory): Runs the Firefox first start tasks.
+    - copy_profile(template): Copies the template for a webdriver.
+    - measure_startup(driver_factory): Measures the webdriver startup time.
+
+Usage example:
+    firefox_profile ~/.cache/aws_api_actions/profile --measure 3
+    scrape --profile-template ~/.cache/aws_api_actions/profile -o actions.json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import tempfile
+import time
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional
+
+from aws_api_actions.exceptions import OutputError
+from aws_api_actions.logger import logger
+
+
+USER_PREFS_FILENAME = "user.js"
+# Files locking a profile while Firefox, or Chromium for a Chromium user data
+# directory, runs, never copied to the webdrivers.
+PROFILE_LOCK_FILES = (
+    "lock",
+    ".parentlock",
+    "parent.lock",
+    "SingletonLock",
+    "SingletonSocket",
+    "SingletonCookie",
+)
+
+PROFILE_PREFERENCES: Dict[str, Any] = {
+    # Telemetry and data reporting
+    "toolkit.telemetry.enabled": False,
+    "toolkit.telemetry.unified": False,
+    "toolkit.telemetry.archive.enabled": False,
+    "datareporting.healthreport.uploadEnabled": False,
+    "datareporting.policy.dataSubmissionEnabled": False,
+    "app.normandy.enabled": False,
+    # Updates
+    "app.update.auto": False,
+    "app.update.checkInstallTime": False,
+    "extensions.update.enabled": False,
+    # Safe browsing
+    "browser.safebrowsing.malware.enabled": False,
+    "browser.safebrowsing.phishing.enabled": False,
+    "browser.safebrowsing.downloads.enabled": False,
+    "browser.safebrowsing.blockedURIs.enabled": False,
+    # Prefetching and speculative connections
+    "network.prefetch-next": False,
+    "network.dns.disablePrefetch": True,
+    "network.http.speculative-parallel-limit": 0,
+    "network.predictor.enabled": False,
+    # Session restore
+    "browser.sessionstore.resume_from_crash": False,
+    "browser.sessionstore.max_tabs_undo": 0,
+    # First start and new tab pages
+    "browser.shell.checkDefaultBrowser": False,
+    "browser.startup.page": 0,
+    "browser.startup.homepage_override.mstone": "ignore",
+    "startup.homepage_welcome_url": "",
+    "datareporting.policy.firstRunURL": "",
+    "browser.aboutwelcome.enabled": False,
+    "browser.newtabpage.enabled": False,
+    # Cache: the pages are fetched once, keep the cache in memory only
+    "browser.cache.disk.enable": False,
+    "browser.cache.memory.enable": True,
+    "browser.cache.memory.capacity": 65536,
+}
+
+
+def format_user_prefs(preferences: Dict[str, Any]) -> str:
+    """Returns the ``user.js`` content setting the preferences.
+
+    Args:
+        preferences (Dict[str, Any]): The preferences and their values.
+
+    Returns:
+        str: The ``user.js`` content.
+    """
+    return "".join(
+        f"user_pref({json.dumps(name)}, {json.dumps(value)});\n"
+        for name, value in sorted(preferences.items())
+    )
+
+
+def build_profile_template(
+    directory: str, preferences: Optional[Dict[str, Any]] = None
+) -> str:
+    """Write a profile template with the tuned preferences.
+
+    Args:
+        directory (str): The profile directory, created if needed.
+        preferences (Optional[Dict[str, Any]], optional): The preferences.
+            Defaults to None, in which case PROFILE_PREFERENCES are used.
+
+    Returns:
+        str: The profile directory.
+
+    Raises:
+        OutputError: If the profile cannot be written.
+    """
+    if preferences is None:
+        preferences = PROFILE_PREFERENCES
+
+    try:
+        os.makedirs(directory, exist_ok=True)
+        with open(
+            os.path.join(directory, USER_PREFS_FILENAME), "w", encoding="utf-8"
+        ) as file:
+            file.write(format_user_prefs(preferences))
+    except OSError as err:
+        raise OutputError(
+            f"Failed to write profile {directory}: {err}"
+        ) from err
+
+    return directory
+
+
+def remove_profile_locks(directory: str) -> None:
+    """Remove the lock files Firefox leaves in a profile.
+
+    Args:
+        directory (str): The profile directory.
+    """
+    for filename in PROFILE_LOCK_FILES:
+        path = os.path.join(directory, filename)
+        if os.path.lexists(path):
+            os.unlink(path)
+
+
+def prewarm_profile(directory: str) -> None:
+    """Start Firefox once on the template so it runs its first start tasks.
+
+    Args:
+        directory (str): The profile template directory.
+    """
+    # Imported lazily, so building the template doesn't need selenium-wire.
+    from aws_api_actions.browser import setup_default_webdriver
+
+    driver = setup_default_webdriver(profile_path=directory)
+    driver.quit()
+    remove_profile_locks(directory)
+
+
+def copy_profile(template: str, directory: Optional[str] = None) -> str:
+    """Copy the profile template for a webdriver.
+
+    Args:
+        template (str): The profile template directory.
+        directory (Optional[str], optional): The destination directory.
+            Defaults to None, in which case a temporary directory is created.
+
+    Returns:
+        str: The directory of the copy.
+
+    Raises:
+        OutputError: If the template cannot be copied.
+    """
+    if directory is None:
+        directory = tempfile.mkdtemp(prefix="aws_api_actions-profile-")
+
+    try:
+        shutil.copytree(
+            template,
+            directory,
+            ignore=shutil.ignore_patterns(*PROFILE_LOCK_FILES),
+            dirs_exist_ok=True,
+        )
+    except (OSError, shutil.Error) as err:
+        raise OutputError(f"Failed to copy profile {template}: {err}") from err
+
+    return directory
+
+
+def measure_startup(
+    driver_factory: Callable[[], Any], runs: int = 3
+) -> List[float]:
+    """Measure the time to start a webdriver, in seconds.
+
+    Args:
+        driver_factory (Callable[[], Any]): Function creating the webdriver.
+        runs (int, optional): The number of webdrivers started. Defaults to 3.
+
+    Returns:
+        List[float]: The startup time of each run.
+    """
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        driver = driver_factory()
+        timings.append(time.perf_counter() - start)
+        driver.quit()
+
+    return timings
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Build the profile template and optionally measure the startup time.
+
+    Args:
+        argv (Optional[List[str]], optional): The command line arguments.
+            Defaults to None, in which case ``sys.argv`` is used.
+    """
+    parser = argparse.ArgumentParser(
+        description="Build a prewarmed Firefox profile template."
+    )
+    parser.add_argument("directory", help="The profile template directory.")
+    parser.add_argument(
+        "--no-prewarm",
+        action="store_true",
+        help="Only write the preferences, without starting Firefox.",
+    )
+    parser.add_argument(
+        "--measure",
+        type=int,
+        default=0,
+        metavar="RUNS",
+        help="Compare the startup time with and without the template.",
+    )
+    args = parser.parse_args(argv)
+
+    build_profile_template(args.directory)
+    if not args.no_prewarm:
+        prewarm_profile(args.directory)
+    logger.success("Built the profile template %s", args.directory)
+
+    if args.measure > 0:
+        from aws_api_actions.browser import setup_default_webdriver
+
+        for name, profile_template in (
+            ("fresh profile", None),
+            ("profile template", args.directory),
+        ):
+            timings = measure_startup(
+                partial(
+                    setup_default_webdriver, profile_template=profile_template
+                ),
+                args.measure,
+            )
+            logger.info(
+                "Startup with %s: mean %.2fs, min %.2fs",
+                name,
+                statistics.mean(timings),
+                min(timings),
+            )
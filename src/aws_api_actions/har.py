@@ -0,0 +1,387 @@
+"""Record the fetched responses to a HAR archive and replay them.
+
+Profiling or benchmarking parser and exporter changes against the live
+documentation is slow and noisy, as the pages and the network change between
+runs. A run can instead record every response it receives to a HAR archive
+(HTTP Archive 1.2, readable by browser developer tools), and later runs replay
+the archive without touching the network:
+
+    - The HTTP fetcher records its responses through a ``requests`` hook, and
+      the ``ReplayFetcher`` of :mod:`aws_api_actions.fetcher` replays them.
+    - The browser records every request selenium-wire captured in
+      ``driver.requests``, including the scripts and data rendering the page,
+      and replays them through a selenium-wire request interceptor, so the
+      pages are rendered again from the archive.
+
+Requests missing from the archive fail with 404, so a replayed run never
+reaches the network.
+
+Usage example:
+    scrape --record-har pages.har.gz -o actions.json
+    scrape --replay-har pages.har.gz -o actions.json
+"""
+
+import base64
+import importlib.metadata
+import json
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+from urllib.parse import urldefrag
+
+import requests
+
+from aws_api_actions.compression import (
+    get_decompression_errors,
+    open_compressed,
+)
+from aws_api_actions.constants import DEFAULT_BROWSER_BACKEND
+from aws_api_actions.exceptions import OutputError, ParsingError
+from aws_api_actions.logger import logger
+
+
+HAR_VERSION = "1.2"
+HAR_CREATOR = "aws_api_actions"
+# Headers describing the transfer of the recorded body rather than the body,
+# which is stored decoded.
+TRANSFER_HEADERS = ("content-encoding", "content-length", "transfer-encoding")
+
+
+def _get_version() -> str:
+    """Returns the version of the package, recorded as the HAR creator."""
+    try:
+        return importlib.metadata.version("aws-api-actions")
+    except importlib.metadata.PackageNotFoundError:
+        return "unknown"
+
+
+class HarResponse(NamedTuple):
+    """A response replayed from the archive."""
+
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+
+    @property
+    def text(self) -> str:
+        """Returns the body decoded as text."""
+        return self.body.decode("utf-8", errors="replace")
+
+
+def _to_har_headers(headers: Iterable[Any]) -> List[Dict[str, str]]:
+    """Returns headers as HAR name and value pairs."""
+    return [{"name": str(name), "value": str(value)} for name, value in headers]
+
+
+def _to_har_content(body: bytes, mime_type: str) -> Dict[str, Any]:
+    """Returns a body as HAR content, base64 encoded unless it is text."""
+    content: Dict[str, Any] = {"size": len(body), "mimeType": mime_type}
+    try:
+        content["text"] = body.decode("utf-8")
+    except UnicodeDecodeError:
+        content["text"] = base64.b64encode(body).decode("ascii")
+        content["encoding"] = "base64"
+
+    return content
+
+
+def _from_har_content(content: Dict[str, Any]) -> bytes:
+    """Returns the body of HAR content."""
+    text = content.get("text", "")
+    if content.get("encoding") == "base64":
+        return base64.b64decode(text)
+
+    return str(text).encode("utf-8")
+
+
+class HarArchive:
+    """Thread-safe archive of HTTP exchanges, in the HAR 1.2 format."""
+
+    def __init__(self, entries: Optional[List[Dict[str, Any]]] = None) -> None:
+        """Initialize the archive.
+
+        Args:
+            entries (Optional[List[Dict[str, Any]]], optional): The HAR
+                entries. Defaults to None, in which case it is empty.
+        """
+        self._lock = threading.Lock()
+        self.entries: List[Dict[str, Any]] = []
+        self._responses: Dict[str, HarResponse] = {}
+        for entry in entries or []:
+            self._add_entry(entry)
+
+    def __len__(self) -> int:
+        """Returns the number of recorded exchanges."""
+        return len(self.entries)
+
+    def _add_entry(self, entry: Dict[str, Any]) -> None:
+        """Add an entry, the latest response of a URL replacing the others."""
+        with self._lock:
+            self.entries.append(entry)
+            if entry["request"]["method"] == "GET":
+                response = entry["response"]
+                url = urldefrag(entry["request"]["url"])[0]
+                self._responses[url] = HarResponse(
+                    status=response["status"],
+                    headers={
+                        header["name"]: header["value"]
+                        for header in response["headers"]
+                    },
+                    body=_from_har_content(response["content"]),
+                )
+
+    def add(
+        self,
+        method: str,
+        url: str,
+        status: int,
+        reason: str,
+        request_headers: Iterable[Any],
+        response_headers: Iterable[Any],
+        body: bytes,
+        started: Optional[datetime] = None,
+        elapsed: float = 0.0,
+    ) -> None:
+        """Record an exchange.
+
+        Args:
+            method (str): The request method.
+            url (str): The request URL.
+            status (int): The response status code.
+            reason (str): The response reason phrase.
+            request_headers (Iterable[Any]): The request header pairs.
+            response_headers (Iterable[Any]): The response header pairs.
+            body (bytes): The response body, decoded.
+            started (Optional[datetime], optional): When the request was sent.
+                Defaults to None, in which case it is now.
+            elapsed (float, optional): The duration of the exchange in
+                milliseconds. Defaults to 0.
+        """
+        response_headers = list(response_headers)
+        headers = {
+            str(name).lower(): str(value) for name, value in response_headers
+        }
+        started = started or datetime.now(timezone.utc)
+        if started.tzinfo is None:
+            started = started.replace(tzinfo=timezone.utc)
+
+        self._add_entry(
+            {
+                "startedDateTime": started.isoformat(),
+                "time": elapsed,
+                "request": {
+                    "method": method,
+                    "url": url,
+                    "httpVersion": "HTTP/1.1",
+                    "cookies": [],
+                    "headers": _to_har_headers(request_headers),
+                    "queryString": [],
+                    "headersSize": -1,
+                    "bodySize": -1,
+                },
+                "response": {
+                    "status": status,
+                    "statusText": reason,
+                    "httpVersion": "HTTP/1.1",
+                    "cookies": [],
+                    "headers": _to_har_headers(response_headers),
+                    "content": _to_har_content(
+                        body, headers.get("content-type", "")
+                    ),
+                    "redirectURL": headers.get("location", ""),
+                    "headersSize": -1,
+                    "bodySize": len(body),
+                },
+                "cache": {},
+                "timings": {"send": 0, "wait": elapsed, "receive": 0},
+            }
+        )
+
+    def record_response(
+        self, response: requests.Response, *args: Any, **kwargs: Any
+    ) -> None:
+        """Record a ``requests`` response, and the redirects leading to it.
+
+        The signature is that of a ``requests`` response hook.
+
+        Args:
+            response (requests.Response): The response.
+            *args (Any): Ignored hook arguments.
+            **kwargs (Any): Ignored hook arguments.
+        """
+        for exchange in [*response.history, response]:
+            self.add(
+                exchange.request.method or "GET",
+                exchange.url,
+                exchange.status_code,
+                exchange.reason or "",
+                exchange.request.headers.items(),
+                exchange.headers.items(),
+                exchange.content,
+                elapsed=exchange.elapsed.total_seconds() * 1000,
+            )
+
+    def record_driver(self, driver: Any) -> None:
+        """Record the exchanges captured by a selenium-wire webdriver.
+
+        The captured requests are cleared once recorded, so each is recorded
+        once. Recording never fails a fetch, so errors are only logged.
+
+        Args:
+            driver (Any): The selenium-wire webdriver.
+        """
+        # Imported lazily, so HTTP-only runs never load selenium-wire.
+        from seleniumwire.utils import decode
+
+        try:
+            captured = driver.requests
+            del driver.requests
+        except Exception as err:
+            logger.debug("Failed to read the captured requests: %s", err)
+            return
+
+        for request in captured:
+            response = request.response
+            if response is None:
+                continue
+
+            encoding = response.headers.get("Content-Encoding", "identity")
+            try:
+                body = decode(response.body, encoding)
+            except Exception:
+                body = response.body
+
+            elapsed = 0.0
+            if response.date is not None and request.date is not None:
+                elapsed = (response.date - request.date).total_seconds() * 1000
+            self.add(
+                request.method,
+                request.url,
+                response.status_code,
+                response.reason or "",
+                request.headers.items(),
+                response.headers.items(),
+                body,
+                started=request.date,
+                elapsed=elapsed,
+            )
+
+    def get_response(self, url: str) -> Optional[HarResponse]:
+        """Returns the latest recorded response to a GET of a URL.
+
+        Args:
+            url (str): The URL, its fragment ignored.
+
+        Returns:
+            Optional[HarResponse]: The response, or None if not recorded.
+        """
+        with self._lock:
+            return self._responses.get(urldefrag(url)[0])
+
+    def intercept(self, request: Any) -> None:
+        """Answer a selenium-wire request from the archive.
+
+        The signature is that of a selenium-wire request interceptor.
+        Requests missing from the archive are answered with 404, so the
+        browser never reaches the network.
+
+        Args:
+            request (Any): The selenium-wire request.
+        """
+        response = None
+        if request.method == "GET":
+            response = self.get_response(request.url)
+
+        if response is None:
+            logger.debug("Not in the archive, aborting %s", request.url)
+            request.abort(404)
+            return
+
+        request.create_response(
+            status_code=response.status,
+            headers=[
+                (name, value)
+                for name, value in response.headers.items()
+                if name.lower() not in TRANSFER_HEADERS
+            ],
+            body=response.body,
+        )
+
+    def save(self, file_path: str) -> None:
+        """Write the archive, compressed according to the file extension.
+
+        Args:
+            file_path (str): The path to the HAR file.
+
+        Raises:
+            OutputError: If the archive cannot be written.
+        """
+        with self._lock:
+            har = {
+                "log": {
+                    "version": HAR_VERSION,
+                    "creator": {"name": HAR_CREATOR, "version": _get_version()},
+                    "entries": list(self.entries),
+                }
+            }
+
+        try:
+            with open_compressed(file_path, "w") as file:
+                json.dump(har, file)
+        except OSError as err:
+            raise OutputError(f"Failed to write {file_path}: {err}") from err
+
+        logger.info("Recorded %d exchanges to %s", len(self), file_path)
+
+    @classmethod
+    def load(cls, file_path: str) -> "HarArchive":
+        """Read an archive, decompressed according to the file extension.
+
+        Args:
+            file_path (str): The path to the HAR file.
+
+        Returns:
+            HarArchive: The archive.
+
+        Raises:
+            ParsingError: If the file is not a readable HAR archive.
+        """
+        try:
+            with open_compressed(file_path) as file:
+                entries = json.load(file)["log"]["entries"]
+            return cls(entries)
+        except (OSError, KeyError, TypeError, json.JSONDecodeError) as err:
+            raise ParsingError(
+                f"Invalid HAR archive {file_path}: {err}"
+            ) from err
+        except get_decompression_errors() as err:
+            raise ParsingError(
+                f"Invalid HAR archive {file_path}: {err}"
+            ) from err
+
+
+def create_replay_webdriver(
+    archive: HarArchive,
+    profile_template: Optional[str] = None,
+    backend: str = DEFAULT_BROWSER_BACKEND,
+) -> Any:
+    """Create the default webdriver, answering every request from an archive.
+
+    Args:
+        archive (HarArchive): The archive replayed.
+        profile_template (Optional[str], optional): Profile template the
+            webdriver starts on a copy of. Defaults to None.
+        backend (str, optional): The browser of the webdriver. Defaults to
+            DEFAULT_BROWSER_BACKEND.
+
+    Returns:
+        Any: The webdriver.
+    """
+    # Imported lazily, so HTTP-only runs never load selenium-wire.
+    from aws_api_actions.browser import setup_default_webdriver
+
+    driver = setup_default_webdriver(
+        profile_template=profile_template, backend=backend
+    )
+    driver.request_interceptor = archive.intercept
+    return driver
@@ -0,0 +1,480 @@
+"""Module to load previously exported data back into memory.
+
+Each loader is the counterpart of an exporter in :mod:`aws_api_actions.exporter`
+and reads the file through a streaming decompressor selected from the file
+extension (``.gz`` for gzip, ``.zst`` for zstd) or the ``compression``
+argument, so compressed artifacts never have to be decompressed to disk.
+
+Functions in this module:
+    - load_from_text(file_path): Loads a file written by ``output_to_text``.
+    - load_from_json(file_path): Loads a file written by ``output_to_json``.
+    - load_from_csv(file_path): Loads a file written by ``output_to_csv``.
+    - load_from_xml(file_path): Loads a file written by ``output_to_xml``.
+    - load_from_binary(file_path): Loads a file written by
+      ``output_to_binary``. Use ``BinaryCatalog`` directly to query it
+      without deserializing.
+    - load_from_file(file_path): Loads a file, selecting the loader from the
+      file extension.
+
+Each format except json can also be streamed as ``(service, category, value)``
+records, see :func:`aws_api_actions.exporter.iter_records`, without loading
+the whole file:
+
+    - iter_records_from_file(file_path): Streams the records of a file,
+      selecting the reader from the file extension.
+    - is_streamed(file_path): Checks whether the records of a file are
+      streamed, rather than loaded whole.
+
+Example Usage:
+    from aws_api_actions.loader import load_from_file
+
+    data = load_from_file("actions.json.gz")
+"""
+
+import csv
+import json
+import os
+import xml.etree.ElementTree as ET  # noqa: S405
+from contextlib import contextmanager
+from typing import (
+    IO,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+)
+
+from aws_api_actions.binary_catalog import BinaryCatalog, check_uncompressed
+from aws_api_actions.compression import (
+    get_decompression_errors,
+    open_compressed,
+    strip_compression_extension,
+)
+from aws_api_actions.exceptions import OutputError, ParsingError
+from aws_api_actions.exporter import (
+    CSV_HEADER,
+    TEXT_INDENT,
+    Record,
+    compact_records,
+    iter_records,
+)
+
+
+@contextmanager
+def _open_input(
+    file_path: str, compression: Optional[str]
+) -> Iterator[IO[str]]:
+    """Open a file for loading, reporting corrupt data as a ParsingError."""
+    errors: Tuple[Type[Exception], ...] = (
+        *get_decompression_errors(),
+        csv.Error,
+    )
+    with open_compressed(file_path, "r", compression) as file:
+        try:
+            yield file
+        except errors as err:
+            raise ParsingError(f"Failed to read {file_path}: {err}") from err
+
+
+def collect_records(
+    records: Iterable[Record],
+) -> Dict[str, Dict[str, List[str]]]:
+    """Collect the records into the data.
+
+    Args:
+        records (Iterable[Record]): The ``(service, category, value)``
+            records.
+
+    Returns:
+        Dict[str, Dict[str, List[str]]]: The data.
+    """
+    data: Dict[str, Dict[str, List[str]]] = {}
+    for service, category, value in records:
+        categories = data.setdefault(service, {})
+        if category is not None:
+            values = categories.setdefault(category, [])
+            if value is not None:
+                values.append(value)
+
+    return data
+
+
+def _iter_raw_text_records(
+    file_path: str, compression: Optional[str]
+) -> Iterator[Record]:
+    """Yield the records of a text file, with a marker for every group."""
+    service: Optional[str] = None
+    category: Optional[str] = None
+
+    with _open_input(file_path, compression) as file:
+        for line_number, line in enumerate(file, start=1):
+            line = line.rstrip("\r\n")
+            if line == "":
+                continue
+
+            if line.startswith(TEXT_INDENT * 2):
+                if service is None or category is None:
+                    raise ParsingError(
+                        f"Value without a category on line {line_number}"
+                    )
+                yield service, category, line[len(TEXT_INDENT) * 2 :]
+
+            elif line.startswith(TEXT_INDENT):
+                if service is None:
+                    raise ParsingError(
+                        f"Category without a service on line {line_number}"
+                    )
+                category = line[len(TEXT_INDENT) :]
+                yield service, category, None
+
+            else:
+                service, category = line, None
+                yield service, None, None
+
+
+def iter_text_records(
+    file_path: str, compression: Optional[str] = None
+) -> Iterator[Record]:
+    """Stream the records of a plain text file.
+
+    Args:
+        file_path (str): The path to the file to read from.
+        compression (Optional[str], optional): The compression codec. Defaults
+            to None, in which case it is selected from the file extension.
+
+    Yields:
+        Record: The records, in file order.
+
+    Raises:
+        ParsingError: If the file is not a valid text export.
+    """
+    return compact_records(_iter_raw_text_records(file_path, compression))
+
+
+def iter_json_records(
+    file_path: str, compression: Optional[str] = None
+) -> Iterator[Record]:
+    """Yield the records of a json file.
+
+    The json document is loaded whole, use the other formats to stream large
+    files.
+
+    Args:
+        file_path (str): The path to the file to read from.
+        compression (Optional[str], optional): The compression codec. Defaults
+            to None, in which case it is selected from the file extension.
+
+    Returns:
+        Iterator[Record]: The records, in file order.
+
+    Raises:
+        ParsingError: If the file is not valid json.
+    """
+    return iter_records(load_from_json(file_path, compression))
+
+
+def iter_csv_records(
+    file_path: str, compression: Optional[str] = None
+) -> Iterator[Record]:
+    """Stream the records of a csv file.
+
+    Args:
+        file_path (str): The path to the file to read from.
+        compression (Optional[str], optional): The compression codec. Defaults
+            to None, in which case it is selected from the file extension.
+
+    Yields:
+        Record: The records, in file order.
+
+    Raises:
+        ParsingError: If the file is not a valid csv export.
+    """
+    with _open_input(file_path, compression) as file:
+        reader = csv.reader(file)
+        if next(reader, None) != CSV_HEADER:
+            raise ParsingError(f"Missing csv header in {file_path}")
+
+        for row in reader:
+            # Rows without a value or category are empty categories or
+            # services.
+            if not 1 <= len(row) <= len(CSV_HEADER):
+                raise ParsingError(
+                    f"Invalid csv row on line {reader.line_num}: {row}"
+                )
+            yield (
+                row[0],
+                row[1] if len(row) > 1 else None,
+                row[2] if len(row) > 2 else None,
+            )
+
+
+def _iter_raw_xml_records(
+    file_path: str, compression: Optional[str]
+) -> Iterator[Record]:
+    """Yield the records of an xml file, with a marker for every group."""
+    service = ""
+    category = ""
+
+    with _open_input(file_path, compression) as file:
+        try:
+            for event, element in ET.iterparse(  # noqa: S314
+                file, events=("start", "end")
+            ):
+                if event == "start" and element.tag == "service":
+                    service = element.get("name", "")
+                    yield service, None, None
+                elif event == "start" and element.tag == "category":
+                    category = element.get("name", "")
+                    yield service, category, None
+                elif event == "end" and element.tag == "value":
+                    yield service, category, element.text or ""
+                elif event == "end" and element.tag == "service":
+                    # Free the parsed service, so memory stays bounded.
+                    element.clear()
+        except ET.ParseError as err:
+            raise ParsingError(f"Invalid xml in {file_path}: {err}") from err
+
+
+def iter_xml_records(
+    file_path: str, compression: Optional[str] = None
+) -> Iterator[Record]:
+    """Stream the records of an xml file.
+
+    Args:
+        file_path (str): The path to the file to read from.
+        compression (Optional[str], optional): The compression codec. Defaults
+            to None, in which case it is selected from the file extension.
+
+    Returns:
+        Iterator[Record]: The records, in file order.
+
+    Raises:
+        ParsingError: If the file is not valid xml.
+    """
+    return compact_records(_iter_raw_xml_records(file_path, compression))
+
+
+def iter_binary_records(
+    file_path: str, compression: Optional[str] = None
+) -> Iterator[Record]:
+    """Stream the records of a binary catalog.
+
+    Args:
+        file_path (str): The path to the file to read from.
+        compression (Optional[str], optional): Must resolve to no compression.
+            Defaults to None.
+
+    Yields:
+        Record: The records, sorted.
+
+    Raises:
+        ParsingError: If the file is not an uncompressed binary catalog.
+    """
+    try:
+        check_uncompressed(file_path, compression)
+    except OutputError as err:
+        raise ParsingError(err.message) from err
+
+    with BinaryCatalog(file_path) as catalog:
+        for service in catalog.services():
+            categories = catalog.categories(service)
+            if not categories:
+                yield service, None, None
+            for category in categories:
+                values = catalog.values(service, category)
+                if not values:
+                    yield service, category, None
+                for value in values:
+                    yield service, category, value
+
+
+def load_from_text(
+    file_path: str, compression: Optional[str] = None
+) -> Dict[str, Dict[str, List[str]]]:
+    """Load the data from a plain text file.
+
+    Args:
+        file_path (str): The path to the file to read from.
+        compression (Optional[str], optional): The compression codec. Defaults
+            to None, in which case it is selected from the file extension.
+
+    Returns:
+        Dict[str, Dict[str, List[str]]]: The loaded data.
+
+    Raises:
+        ParsingError: If the file is not a valid text export.
+    """
+    return collect_records(iter_text_records(file_path, compression))
+
+
+def load_from_json(
+    file_path: str, compression: Optional[str] = None
+) -> Dict[str, Dict[str, List[str]]]:
+    """Load the data from a json file.
+
+    Args:
+        file_path (str): The path to the file to read from.
+        compression (Optional[str], optional): The compression codec. Defaults
+            to None, in which case it is selected from the file extension.
+
+    Returns:
+        Dict[str, Dict[str, List[str]]]: The loaded data.
+
+    Raises:
+        ParsingError: If the file is not valid json.
+    """
+    with _open_input(file_path, compression) as file:
+        try:
+            data: Dict[str, Dict[str, List[str]]] = json.load(file)
+        except json.JSONDecodeError as err:
+            raise ParsingError(f"Invalid json in {file_path}: {err}") from err
+
+    return data
+
+
+def load_from_csv(
+    file_path: str, compression: Optional[str] = None
+) -> Dict[str, Dict[str, List[str]]]:
+    """Load the data from a csv file.
+
+    Args:
+        file_path (str): The path to the file to read from.
+        compression (Optional[str], optional): The compression codec. Defaults
+            to None, in which case it is selected from the file extension.
+
+    Returns:
+        Dict[str, Dict[str, List[str]]]: The loaded data.
+
+    Raises:
+        ParsingError: If the file is not a valid csv export.
+    """
+    return collect_records(iter_csv_records(file_path, compression))
+
+
+def load_from_xml(
+    file_path: str, compression: Optional[str] = None
+) -> Dict[str, Dict[str, List[str]]]:
+    """Load the data from an xml file.
+
+    Args:
+        file_path (str): The path to the file to read from.
+        compression (Optional[str], optional): The compression codec. Defaults
+            to None, in which case it is selected from the file extension.
+
+    Returns:
+        Dict[str, Dict[str, List[str]]]: The loaded data.
+
+    Raises:
+        ParsingError: If the file is not valid xml.
+    """
+    return collect_records(iter_xml_records(file_path, compression))
+
+
+def load_from_binary(
+    file_path: str, compression: Optional[str] = None
+) -> Dict[str, Dict[str, List[str]]]:
+    """Load the data from a binary catalog.
+
+    Args:
+        file_path (str): The path to the file to read from.
+        compression (Optional[str], optional): Must resolve to no compression.
+            Defaults to None.
+
+    Returns:
+        Dict[str, Dict[str, List[str]]]: The loaded data, with the values of
+            each category sorted.
+
+    Raises:
+        ParsingError: If the file is not an uncompressed binary catalog.
+    """
+    return collect_records(iter_binary_records(file_path, compression))
+
+
+LOADERS: Dict[
+    str, Callable[[str, Optional[str]], Dict[str, Dict[str, List[str]]]]
+] = {
+    ".txt": load_from_text,
+    ".json": load_from_json,
+    ".csv": load_from_csv,
+    ".xml": load_from_xml,
+    ".bin": load_from_binary,
+}
+
+RECORD_READERS: Dict[str, Callable[[str, Optional[str]], Iterator[Record]]] = {
+    ".txt": iter_text_records,
+    ".json": iter_json_records,
+    ".csv": iter_csv_records,
+    ".xml": iter_xml_records,
+    ".bin": iter_binary_records,
+}
+
+
+# Formats whose records are read without loading the whole file.
+STREAMED_EXTENSIONS = frozenset({".txt", ".csv", ".xml", ".bin"})
+
+
+def _get_extension(file_path: str) -> str:
+    """Returns the format extension of a file, without compression."""
+    return os.path.splitext(strip_compression_extension(file_path))[1].lower()
+
+
+def load_from_file(
+    file_path: str, compression: Optional[str] = None
+) -> Dict[str, Dict[str, List[str]]]:
+    """Load the data, selecting the loader from the file extension.
+
+    Args:
+        file_path (str): The path to the file to read from.
+        compression (Optional[str], optional): The compression codec. Defaults
+            to None, in which case it is selected from the file extension.
+
+    Returns:
+        Dict[str, Dict[str, List[str]]]: The loaded data.
+
+    Raises:
+        ParsingError: If the file format is not supported.
+    """
+    loader = LOADERS.get(_get_extension(file_path))
+    if loader is None:
+        raise ParsingError(f"Unsupported file format: {file_path}")
+
+    return loader(file_path, compression)
+
+
+def is_streamed(file_path: str) -> bool:
+    """Check whether the records of a file are read without loading it whole.
+
+    Args:
+        file_path (str): The path to the file.
+
+    Returns:
+        bool: Whether the format of the file is streamed.
+    """
+    return _get_extension(file_path) in STREAMED_EXTENSIONS
+
+
+def iter_records_from_file(
+    file_path: str, compression: Optional[str] = None
+) -> Iterator[Record]:
+    """Stream the records of a file, selecting the reader from the extension.
+
+    Args:
+        file_path (str): The path to the file to read from.
+        compression (Optional[str], optional): The compression codec. Defaults
+            to None, in which case it is selected from the file extension.
+
+    Returns:
+        Iterator[Record]: The records, in file order.
+
+    Raises:
+        ParsingError: If the file format is not supported.
+    """
+    reader = RECORD_READERS.get(_get_extension(file_path))
+    if reader is None:
+        raise ParsingError(f"Unsupported file format: {file_path}")
+
+    return reader(file_path, compression)
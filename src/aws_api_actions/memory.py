@@ -0,0 +1,326 @@
+"""Memory tracking of a crawl, and budgets keeping it predictable.
+
+A long crawl slowly grows between the browser, selenium-wire's captured
+requests and the caches of parsed pages. The ``MemoryMonitor`` tracks:
+
+    - The peak Python memory of each stage of a run, with ``tracemalloc``.
+    - The peak resident set size (RSS) of the whole process tree during each
+      stage, including the parse processes and the browsers, sampled by a
+      background thread.
+    - The peak RSS of each webdriver, geckodriver and the Firefox processes
+      it started.
+
+With budgets set, a webdriver above its budget is quit and started again on
+the next page, and the caches held in memory are flushed when the process
+tree is above its budget, so a host can be packed with workers without any of
+them growing until it is killed.
+
+The RSS is read with ``psutil`` when it is installed, and from ``/proc``
+otherwise, so it is only tracked on Linux without ``psutil``.
+
+Usage example:
+    monitor = MemoryMonitor(driver_budget=1024 * MIB)
+    with monitor.stage("scrape"):
+        ...
+    monitor.log_report()
+"""
+
+import os
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+
+from aws_api_actions.logger import logger
+
+
+MIB = 1024 * 1024
+# Interval between two samples of the RSS during a stage, in seconds.
+RSS_SAMPLE_INTERVAL = 0.1
+
+
+class StageMemory(NamedTuple):
+    """The memory used by a stage of a run, in bytes."""
+
+    python_peak: int
+    rss_peak: int
+
+
+def _get_children(pid: int) -> List[int]:
+    """Returns the pids of the children of a process, from ``/proc``."""
+    children: List[int] = []
+    try:
+        for thread in os.listdir(f"/proc/{pid}/task"):
+            with open(f"/proc/{pid}/task/{thread}/children") as file:
+                children.extend(int(child) for child in file.read().split())
+    except OSError:
+        pass
+
+    return children
+
+
+def get_process_tree(pid: int) -> List[int]:
+    """Returns the pids of a process and of all its descendants.
+
+    Args:
+        pid (int): The pid of the process.
+
+    Returns:
+        List[int]: The pids, the process first.
+    """
+    try:
+        import psutil
+    except ImportError:
+        pass
+    else:
+        try:
+            process = psutil.Process(pid)
+            return [pid] + [child.pid for child in process.children(True)]
+        except psutil.Error:
+            return []
+
+    pids = []
+    pending = [pid]
+    while pending:
+        parent = pending.pop(0)
+        pids.append(parent)
+        pending.extend(_get_children(parent))
+
+    return pids
+
+
+def get_rss(pid: int) -> int:
+    """Returns the resident set size of a process.
+
+    Args:
+        pid (int): The pid of the process.
+
+    Returns:
+        int: The RSS in bytes, or 0 if it cannot be read.
+    """
+    try:
+        import psutil
+    except ImportError:
+        pass
+    else:
+        try:
+            return int(psutil.Process(pid).memory_info().rss)
+        except psutil.Error:
+            return 0
+
+    try:
+        with open(f"/proc/{pid}/status") as file:
+            for line in file:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+
+    return 0
+
+
+def get_tree_rss(pid: int) -> int:
+    """Returns the resident set size of a process and its descendants.
+
+    Args:
+        pid (int): The pid of the process.
+
+    Returns:
+        int: The RSS in bytes.
+    """
+    return sum(get_rss(tree_pid) for tree_pid in get_process_tree(pid))
+
+
+def get_driver_pid(driver: Any) -> Optional[int]:
+    """Returns the pid of the driver process of a webdriver, e.g. geckodriver.
+
+    Args:
+        driver (Any): The webdriver.
+
+    Returns:
+        Optional[int]: The pid, or None if the webdriver has no local process.
+    """
+    try:
+        return int(driver.service.process.pid)
+    except (AttributeError, TypeError):
+        return None
+
+
+class MemoryMonitor:
+    """Thread-safe tracker of the memory of a run, enforcing its budgets."""
+
+    def __init__(
+        self,
+        driver_budget: Optional[int] = None,
+        process_budget: Optional[int] = None,
+        trace_python: bool = True,
+        sample_interval: float = RSS_SAMPLE_INTERVAL,
+    ) -> None:
+        """Initialize the monitor.
+
+        Args:
+            driver_budget (Optional[int], optional): RSS in bytes a webdriver
+                and its browser may use before being restarted. Defaults to
+                None, without a budget.
+            process_budget (Optional[int], optional): RSS in bytes the process
+                tree may use before the caches are flushed. Defaults to None,
+                without a budget.
+            trace_python (bool, optional): Whether to trace the Python
+                allocations of each stage, which slows the run down. Defaults
+                to True.
+            sample_interval (float, optional): Interval between two samples
+                of the RSS during a stage, in seconds. Defaults to
+                RSS_SAMPLE_INTERVAL.
+        """
+        self.driver_budget = driver_budget
+        self.process_budget = process_budget
+        self.trace_python = trace_python
+        self.sample_interval = sample_interval
+        self.stages: Dict[str, StageMemory] = {}
+        self.driver_peak = 0
+        self.process_peak = 0
+        self.driver_restarts = 0
+        self.flushes = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Track the memory used by a stage of the run.
+
+        Stages are expected to run one after the other, as the Python peak is
+        that of the whole process.
+
+        Args:
+            name (str): The name of the stage.
+
+        Yields:
+            None: Once the tracking started.
+        """
+        tracing = self.trace_python and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        elif tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+
+        try:
+            with self._sample_rss() as rss_peak:
+                yield
+        finally:
+            python_peak = 0
+            if tracemalloc.is_tracing():
+                python_peak = tracemalloc.get_traced_memory()[1]
+            if tracing:
+                tracemalloc.stop()
+
+            with self._lock:
+                self.stages[name] = StageMemory(python_peak, rss_peak[0])
+
+    @contextmanager
+    def _sample_rss(self) -> Iterator[List[int]]:
+        """Sample the RSS of the process tree in a thread, keeping its peak.
+
+        Yields:
+            List[int]: The peak RSS in bytes, updated until the context ends.
+        """
+        peak = [self.sample_process()]
+        stop = threading.Event()
+
+        def sample() -> None:
+            while not stop.wait(self.sample_interval):
+                peak[0] = max(peak[0], self.sample_process())
+
+        thread = threading.Thread(
+            target=sample, name="rss-sampler", daemon=True
+        )
+        thread.start()
+        try:
+            yield peak
+        finally:
+            stop.set()
+            thread.join()
+            peak[0] = max(peak[0], self.sample_process())
+
+    def sample_process(self) -> int:
+        """Returns the RSS of the process tree, recording its peak.
+
+        Returns:
+            int: The RSS in bytes.
+        """
+        rss = get_tree_rss(os.getpid())
+        with self._lock:
+            self.process_peak = max(self.process_peak, rss)
+
+        return rss
+
+    def sample_driver(self, driver: Any) -> int:
+        """Returns the RSS of a webdriver and its browser, recording its peak.
+
+        Args:
+            driver (Any): The webdriver.
+
+        Returns:
+            int: The RSS in bytes, or 0 if it cannot be read.
+        """
+        pid = get_driver_pid(driver)
+        rss = 0 if pid is None else get_tree_rss(pid)
+        with self._lock:
+            self.driver_peak = max(self.driver_peak, rss)
+
+        return rss
+
+    def is_driver_over_budget(self, driver: Any) -> bool:
+        """Check whether a webdriver should be restarted.
+
+        Args:
+            driver (Any): The webdriver.
+
+        Returns:
+            bool: Whether the webdriver is above the driver budget.
+        """
+        rss = self.sample_driver(driver)
+        if self.driver_budget is None or rss <= self.driver_budget:
+            return False
+
+        logger.info("Webdriver at %d MiB, restarting it", rss // MIB)
+        with self._lock:
+            self.driver_restarts += 1
+
+        return True
+
+    def is_process_over_budget(self) -> bool:
+        """Check whether the caches should be flushed.
+
+        Returns:
+            bool: Whether the process tree is above the process budget.
+        """
+        rss = self.sample_process()
+        if self.process_budget is None or rss <= self.process_budget:
+            return False
+
+        logger.info("Process tree at %d MiB, flushing the caches", rss // MIB)
+        with self._lock:
+            self.flushes += 1
+
+        return True
+
+    def log_report(self) -> None:
+        """Log the memory used by each stage, and the peaks of the run."""
+        with self._lock:
+            stages = dict(self.stages)
+
+        for name, memory in stages.items():
+            logger.info(
+                "Memory of %s: Python peak %d MiB, peak RSS %d MiB",
+                name,
+                memory.python_peak // MIB,
+                memory.rss_peak // MIB,
+            )
+
+        logger.info(
+            "Peak RSS: %d MiB for the process tree, %d MiB for a webdriver "
+            "(%d restarts, %d cache flushes)",
+            self.process_peak // MIB,
+            self.driver_peak // MIB,
+            self.driver_restarts,
+            self.flushes,
+        )
@@ -0,0 +1,336 @@
+"""Local stand-in for the AWS documentation, serving a generated catalog.
+
+The scraper cannot be load-tested against AWS itself, so this server serves a
+Service Authorization Reference index and service pages generated for any
+number of services and actions. It can add latency to every response,
+throttle a fraction of the requests with ``429 Too Many Requests`` like AWS
+does, and serve a fraction of the services as pages rendered client-side,
+which only a browser can scrape.
+
+Usage example:
+    mock_server --services 4000 --actions 40 --latency 0.05 --throttle 0.1
+    scrape --index-url http://127.0.0.1:8081/index.html -o actions.json
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import random
+import threading
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import TracebackType
+from typing import Any, Dict, List, Optional, Type
+
+from aws_api_actions.logger import logger
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8081
+INDEX_PATH = "/index.html"
+ACCESS_LEVELS = ("List", "Read", "Write", "Permissions management", "Tagging")
+ACTION_VERBS = ("Get", "List", "Describe", "Create", "Update", "Delete", "Put")
+
+
+def generate_catalog(
+    services: int, actions: int, seed: int = 0
+) -> Dict[str, List[str]]:
+    """Generate the actions of a synthetic catalog.
+
+    Args:
+        services (int): The number of services.
+        actions (int): The number of actions of each service.
+        seed (int, optional): The seed of the generator. Defaults to 0.
+
+    Returns:
+        Dict[str, List[str]]: The actions of each service prefix.
+    """
+    rng = random.Random(seed)  # noqa: S311
+    catalog = {}
+    for number in range(services):
+        names = {
+            f"{rng.choice(ACTION_VERBS)}Resource{rng.randrange(actions * 4)}"
+            for _ in range(actions * 2)
+        }
+        catalog[f"svc{number}"] = sorted(names)[:actions]
+
+    return catalog
+
+
+def get_access_level(action: str) -> str:
+    """Returns the access level of a synthetic action."""
+    digest = hashlib.sha256(action.encode("utf-8")).digest()
+    return ACCESS_LEVELS[digest[0] % len(ACCESS_LEVELS)]
+
+
+def render_index(prefixes: List[str]) -> str:
+    """Returns the reference index linking to every service page.
+
+    Args:
+        prefixes (List[str]): The service prefixes.
+
+    Returns:
+        str: The index HTML.
+    """
+    links = "".join(
+        f'<li><a href="./list_{prefix}.html">Service {prefix}</a></li>'
+        for prefix in prefixes
+    )
+    return f"<html><body><ul>{links}</ul></body></html>"
+
+
+def render_service_tables(prefix: str, actions: List[str]) -> str:
+    """Returns the tables of a service page, as the reference lays them out.
+
+    Args:
+        prefix (str): The service prefix.
+        actions (List[str]): The actions of the service.
+
+    Returns:
+        str: The HTML of the tables.
+    """
+    rows = "".join(
+        f"<tr><td><a>{action}</a></td><td>Grants permission to {action}</td>"
+        f"<td>{get_access_level(action)}</td><td>resource*</td><td></td>"
+        f"<td></td></tr>"
+        for action in actions
+    )
+    return (
+        f"<p>Service {prefix} (service prefix: <code>{prefix}</code>)</p>"
+        f"<h2>Actions defined by Service {prefix}</h2>"
+        "<table><tr><th>Actions</th><th>Description</th>"
+        "<th>Access level</th><th>Resource types (*required)</th>"
+        "<th>Condition keys</th><th>Dependent actions</th></tr>"
+        f"{rows}</table>"
+        f"<h2>Resource types defined by Service {prefix}</h2>"
+        "<table><tr><th>Resource types</th><th>ARN</th>"
+        "<th>Condition keys</th></tr>"
+        f"<tr><td>resource</td><td>arn:aws:{prefix}:::resource</td><td></td>"
+        "</tr></table>"
+        f"<h2>Condition keys for Service {prefix}</h2>"
+        "<table><tr><th>Condition keys</th><th>Description</th>"
+        "<th>Type</th></tr>"
+        f"<tr><td>{prefix}:ResourceTag/${{TagKey}}</td><td>Filters</td>"
+        "<td>String</td></tr></table>"
+    )
+
+
+def render_service_page(
+    prefix: str, actions: List[str], rendered: bool = False
+) -> str:
+    """Returns a service page.
+
+    Args:
+        prefix (str): The service prefix.
+        actions (List[str]): The actions of the service.
+        rendered (bool, optional): Whether the tables are rendered
+            client-side, by a script, rather than served in the HTML.
+            Defaults to False.
+
+    Returns:
+        str: The page HTML.
+    """
+    tables = render_service_tables(prefix, actions)
+    if not rendered:
+        return f"<html><body>{tables}</body></html>"
+
+    # Encoded, so the served HTML holds none of the content until rendered.
+    encoded = base64.b64encode(tables.encode("utf-8")).decode("ascii")
+    return (
+        '<html><body><div id="main"></div><script>'
+        "document.getElementById('main').innerHTML = "
+        f"atob({json.dumps(encoded)});"
+        "</script></body></html>"
+    )
+
+
+class MockDocsServer(ThreadingHTTPServer):
+    """HTTP server serving a synthetic Service Authorization Reference."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        catalog: Dict[str, List[str]],
+        host: str = DEFAULT_HOST,
+        port: int = 0,
+        latency: float = 0.0,
+        throttle: float = 0.0,
+        rendered: float = 0.0,
+        seed: int = 0,
+    ) -> None:
+        """Bind the server.
+
+        Args:
+            catalog (Dict[str, List[str]]): The actions of each service.
+            host (str, optional): The host to bind. Defaults to DEFAULT_HOST.
+            port (int, optional): The port to bind. Defaults to 0, in which
+                case a free port is picked.
+            latency (float, optional): Delay before each response, in
+                seconds. Defaults to 0.
+            throttle (float, optional): Fraction of the requests answered
+                with 429 Too Many Requests. Defaults to 0.
+            rendered (float, optional): Fraction of the services whose page
+                is rendered client-side. Defaults to 0.
+            seed (int, optional): The seed selecting the throttled requests.
+                Defaults to 0.
+        """
+        super().__init__((host, port), MockDocsRequestHandler)
+        self.catalog = catalog
+        self.latency = latency
+        self.throttle = throttle
+        self.rendered = rendered
+        self.requests = 0
+        self.throttled = 0
+        self._rng = random.Random(seed)  # noqa: S311
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Returns the URL of the reference index."""
+        host, port = self.server_address[:2]
+        return f"http://{host!s}:{port}{INDEX_PATH}"
+
+    def is_rendered(self, prefix: str) -> bool:
+        """Check whether the page of a service is rendered client-side."""
+        digest = hashlib.sha256(prefix.encode("utf-8")).digest()
+        return int.from_bytes(digest[:4], "big") < self.rendered * 2**32
+
+    def should_throttle(self) -> bool:
+        """Count a request, and check whether to throttle it."""
+        with self._lock:
+            self.requests += 1
+            throttled = self._rng.random() < self.throttle
+            self.throttled += throttled
+            return throttled
+
+    def get_page(self, path: str) -> Optional[str]:
+        """Returns the page served at a path, or None if there is none."""
+        if path == INDEX_PATH:
+            return render_index(list(self.catalog))
+
+        name = path.rsplit("/", 1)[-1]
+        if not (name.startswith("list_") and name.endswith(".html")):
+            return None
+
+        prefix = name[len("list_") : -len(".html")]
+        if prefix not in self.catalog:
+            return None
+
+        return render_service_page(
+            prefix, self.catalog[prefix], self.is_rendered(prefix)
+        )
+
+    def start(self) -> "MockDocsServer":
+        """Serve in a background thread."""
+        self._thread = threading.Thread(
+            target=self.serve_forever, name="mock-docs", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and close the socket."""
+        if self._thread is not None:
+            self.shutdown()
+            self._thread.join()
+            self._thread = None
+        self.server_close()
+
+    def __enter__(self) -> "MockDocsServer":
+        """Start serving for use as a context manager."""
+        return self.start()
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Stop serving when leaving the context."""
+        self.stop()
+
+
+class MockDocsRequestHandler(BaseHTTPRequestHandler):
+    """Request handler of the synthetic documentation pages."""
+
+    server: MockDocsServer
+
+    def do_GET(self) -> None:  # noqa: N802
+        """Serve a page, after the latency, unless throttled."""
+        if self.server.latency > 0:
+            time.sleep(self.server.latency)
+
+        if self.server.should_throttle():
+            self.send_response(HTTPStatus.TOO_MANY_REQUESTS)
+            self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        page = self.server.get_page(self.path.split("?", 1)[0])
+        if page is None:
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+
+        body = page.encode("utf-8")
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        """Log the requests through the package logger."""
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Serve a synthetic catalog until interrupted.
+
+    Args:
+        argv (Optional[List[str]], optional): The command line arguments.
+            Defaults to None, in which case ``sys.argv`` is used.
+    """
+    parser = argparse.ArgumentParser(
+        description="Serve a synthetic AWS documentation catalog."
+    )
+    parser.add_argument("--services", type=int, default=400)
+    parser.add_argument("--actions", type=int, default=40)
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Seconds per response."
+    )
+    parser.add_argument(
+        "--throttle",
+        type=float,
+        default=0.0,
+        help="Fraction of the requests throttled with 429.",
+    )
+    parser.add_argument(
+        "--rendered",
+        type=float,
+        default=0.0,
+        help="Fraction of the service pages rendered client-side.",
+    )
+    args = parser.parse_args(argv)
+
+    server = MockDocsServer(
+        generate_catalog(args.services, args.actions),
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        throttle=args.throttle,
+        rendered=args.rendered,
+    )
+    logger.info("Serving %d services on %s", args.services, server.url)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
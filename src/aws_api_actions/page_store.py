@@ -0,0 +1,290 @@
+"""Content-addressed store of the fetched documentation pages.
+
+Many documentation URLs (versioned paths, redirects, localized mirrors) serve
+byte-identical HTML. The store keeps each distinct body once, gzip compressed
+and named by its SHA-256 digest, with an index mapping every URL to the digest
+of its body. Parsed results are memoized by digest too, in memory and on disk,
+so identical pages are parsed once, including across runs.
+
+Layout of the store directory:
+    - ``index.json``: The URL to digest index.
+    - ``blobs/ab/abcdef....html.gz``: The page bodies.
+    - ``parsed/<namespace>/ab/abcdef....json``: The memoized parse results.
+
+Usage example:
+    store = PageStore("pages")
+    digest = store.put(url, html)
+    prefix, categories = store.memoize(
+        digest, parse_service_page, content=html
+    )
+    store.save()
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from aws_api_actions.exceptions import OutputError, ParsingError
+from aws_api_actions.logger import logger
+
+
+INDEX_FILENAME = "index.json"
+BLOBS_DIRECTORY = "blobs"
+PARSED_DIRECTORY = "parsed"
+DEFAULT_NAMESPACE = "default"
+
+
+def get_digest(content: str) -> str:
+    """Returns the SHA-256 digest of a page body.
+
+    Args:
+        content (str): The page body.
+
+    Returns:
+        str: The hexadecimal digest.
+    """
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def _write_atomic(file_path: str, data: bytes) -> None:
+    """Write a file through a temporary file renamed over the target."""
+    directory = os.path.dirname(file_path)
+    os.makedirs(directory, exist_ok=True)
+
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+class PageStore:
+    """Content-addressed store of page bodies and their parse results."""
+
+    def __init__(self, directory: str) -> None:
+        """Open the store, loading its URL index if it exists.
+
+        Args:
+            directory (str): The store directory, created if needed.
+
+        Raises:
+            ParsingError: If the URL index is corrupt.
+        """
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._memo: Dict[Tuple[str, str], Any] = {}
+        self.index: Dict[str, str] = {}
+
+        index_path = os.path.join(directory, INDEX_FILENAME)
+        if os.path.exists(index_path):
+            try:
+                with open(index_path, encoding="utf-8") as file:
+                    self.index = json.load(file)
+            except json.JSONDecodeError as err:
+                raise ParsingError(
+                    f"Corrupt page store index {index_path}: {err}"
+                ) from err
+
+    def _blob_path(self, digest: str) -> str:
+        """Returns the path of the blob of a digest."""
+        return os.path.join(
+            self.directory, BLOBS_DIRECTORY, digest[:2], f"{digest}.html.gz"
+        )
+
+    def _parsed_path(self, namespace: str, digest: str) -> str:
+        """Returns the path of the memoized parse result of a digest."""
+        return os.path.join(
+            self.directory,
+            PARSED_DIRECTORY,
+            namespace,
+            digest[:2],
+            f"{digest}.json",
+        )
+
+    def put(self, url: str, content: str) -> str:
+        """Store a page body, unless an identical body is already stored.
+
+        Args:
+            url (str): The URL the body was fetched from.
+            content (str): The page body.
+
+        Returns:
+            str: The digest of the body.
+
+        Raises:
+            OutputError: If the blob cannot be written.
+        """
+        digest = get_digest(content)
+        blob_path = self._blob_path(digest)
+
+        if not os.path.exists(blob_path):
+            # mtime=0 keeps the blob of a body byte-identical across runs.
+            data = gzip.compress(content.encode("utf-8"), mtime=0)
+            try:
+                _write_atomic(blob_path, data)
+            except OSError as err:
+                raise OutputError(f"Failed to store {url}: {err}") from err
+        else:
+            logger.debug("Page %s is a duplicate of %s", url, digest)
+
+        with self._lock:
+            self.index[url] = digest
+
+        return digest
+
+    def get_digest(self, url: str) -> Optional[str]:
+        """Returns the digest of the body stored for a URL.
+
+        Args:
+            url (str): The URL.
+
+        Returns:
+            Optional[str]: The digest, or None if the URL isn't stored.
+        """
+        return self.index.get(url)
+
+    def get_content(self, digest: str) -> str:
+        """Returns a stored page body.
+
+        Args:
+            digest (str): The digest of the body.
+
+        Returns:
+            str: The page body.
+
+        Raises:
+            ParsingError: If the blob is missing or corrupt.
+        """
+        try:
+            with gzip.open(self._blob_path(digest), "rb") as file:
+                return file.read().decode("utf-8")
+        except (OSError, EOFError, UnicodeDecodeError) as err:
+            raise ParsingError(f"Failed to read blob {digest}: {err}") from err
+
+    def get(self, url: str) -> Optional[str]:
+        """Returns the body stored for a URL.
+
+        Args:
+            url (str): The URL.
+
+        Returns:
+            Optional[str]: The page body, or None if the URL isn't stored.
+        """
+        digest = self.get_digest(url)
+        return None if digest is None else self.get_content(digest)
+
+    def get_memo(
+        self, digest: str, namespace: str = DEFAULT_NAMESPACE
+    ) -> Optional[Any]:
+        """Returns the memoized parse result of a body, if any.
+
+        Args:
+            digest (str): The digest of the body.
+            namespace (str, optional): The namespace of the results. Defaults
+                to DEFAULT_NAMESPACE.
+
+        Returns:
+            Optional[Any]: The parse result, or None if it isn't memoized.
+        """
+        key = (namespace, digest)
+        with self._lock:
+            if key in self._memo:
+                return self._memo[key]
+
+        try:
+            with open(
+                self._parsed_path(namespace, digest), encoding="utf-8"
+            ) as file:
+                result = json.load(file)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+        with self._lock:
+            self._memo[key] = result
+
+        return result
+
+    def set_memo(
+        self, digest: str, result: Any, namespace: str = DEFAULT_NAMESPACE
+    ) -> None:
+        """Memoize the parse result of a body, in memory and on disk.
+
+        Args:
+            digest (str): The digest of the body.
+            result (Any): The JSON serializable parse result.
+            namespace (str, optional): The namespace of the results. Defaults
+                to DEFAULT_NAMESPACE.
+        """
+        with self._lock:
+            self._memo[(namespace, digest)] = result
+
+        parsed_path = self._parsed_path(namespace, digest)
+        try:
+            _write_atomic(parsed_path, json.dumps(result).encode("utf-8"))
+        except OSError as err:
+            logger.warning("Failed to persist %s: %s", parsed_path, err)
+
+    def memoize(
+        self,
+        digest: str,
+        parse: Callable[[str], Any],
+        namespace: str = DEFAULT_NAMESPACE,
+        content: Optional[str] = None,
+    ) -> Any:
+        """Parse a stored body once, returning the memoized result after.
+
+        The result is cached in memory and persisted as JSON, so it must be
+        JSON serializable; tuples are read back from disk as lists.
+
+        Args:
+            digest (str): The digest of the body.
+            parse (Callable[[str], Any]): The function parsing the body.
+            namespace (str, optional): The namespace of the results, to be
+                changed whenever the output of ``parse`` changes. Defaults to
+                DEFAULT_NAMESPACE.
+            content (Optional[str], optional): The body, when the caller has
+                it at hand, so it isn't read back from the blob. Defaults to
+                None.
+
+        Returns:
+            Any: The parse result.
+        """
+        result = self.get_memo(digest, namespace)
+        if result is None:
+            if content is None:
+                content = self.get_content(digest)
+            result = parse(content)
+            self.set_memo(digest, result, namespace)
+
+        return result
+
+    def flush(self) -> None:
+        """Drop the parse results cached in memory, keeping those on disk."""
+        with self._lock:
+            self._memo.clear()
+
+    def save(self) -> None:
+        """Write the URL index.
+
+        Raises:
+            OutputError: If the index cannot be written.
+        """
+        with self._lock:
+            data = json.dumps(self.index, indent=4, sort_keys=True)
+
+        index_path = os.path.join(self.directory, INDEX_FILENAME)
+        try:
+            _write_atomic(index_path, data.encode("utf-8"))
+        except OSError as err:
+            raise OutputError(f"Failed to write {index_path}: {err}") from err
+
+    def __len__(self) -> int:
+        """Returns the number of URLs in the index."""
+        return len(self.index)
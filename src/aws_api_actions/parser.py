@@ -0,0 +1,201 @@
+"""Parse the Service Authorization Reference pages.
+
+Each service page of the Service Authorization Reference holds three tables:
+the actions (with their access level), the resource types and the condition
+keys. All of them are extracted from a single parse of the page, so the extra
+data costs no additional fetch or parse.
+
+Functions in this module:
+    - parse_service_index(html, base_url): Returns the URLs of the service
+      pages linked from the reference index.
+    - parse_service_page(html): Returns the service prefix and the categories
+      of a service page.
+    - merge_service(data, prefix, categories): Merges the categories of a
+      service page into the data.
+
+Usage example:
+    prefix, categories = parse_service_page(html)
+    categories["actions"]
+    categories["access_level:read"]
+"""
+
+import re
+from typing import Dict, List, Tuple
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+from bs4.element import Tag
+
+from aws_api_actions.constants import (
+    ACCESS_LEVEL_CATEGORY_PREFIX,
+    ACTIONS_CATEGORY,
+    CONDITION_KEYS_CATEGORY,
+    RESOURCE_TYPES_CATEGORY,
+)
+from aws_api_actions.exceptions import ParsingError
+
+
+HTML_PARSER = "html.parser"
+SERVICE_PAGE_PREFIX = "list_"
+SERVICE_PREFIX_PATTERN = re.compile(r"service prefix:\s*([\w.-]+)", re.I)
+# Namespace of the memoized results of parse_service_page in the page store,
+# to be bumped whenever its output changes.
+SERVICE_PAGE_NAMESPACE = "service_page.v1"
+
+
+def get_access_level_category(access_level: str) -> str:
+    """Returns the category holding the actions of an access level.
+
+    Args:
+        access_level (str): The access level, e.g. "Permissions management".
+
+    Returns:
+        str: The category name, e.g. "access_level:permissions_management".
+    """
+    level = re.sub(r"\s+", "_", access_level.strip().lower())
+    return f"{ACCESS_LEVEL_CATEGORY_PREFIX}{level}"
+
+
+def parse_service_index(html: str, base_url: str) -> List[str]:
+    """Returns the URLs of the service pages linked from the reference index.
+
+    Args:
+        html (str): The HTML of the reference index.
+        base_url (str): The URL of the reference index.
+
+    Returns:
+        List[str]: The absolute URLs of the service pages, without duplicates.
+    """
+    soup = BeautifulSoup(html, HTML_PARSER)
+    urls: Dict[str, None] = {}
+
+    for link in soup.find_all("a", href=True):
+        href = str(link["href"]).split("#")[0]
+        if href.rsplit("/", 1)[-1].startswith(SERVICE_PAGE_PREFIX):
+            urls[urljoin(base_url, href)] = None
+
+    return list(urls)
+
+
+def _cell_text(cell: Tag) -> str:
+    """Returns the first word of the text of a table cell."""
+    words = cell.get_text(" ", strip=True).split()
+    return words[0].rstrip("*") if words else ""
+
+
+def _table_header(table: Tag) -> List[str]:
+    """Returns the texts of the header cells of a table."""
+    return [th.get_text(" ", strip=True) for th in table.find_all("th")]
+
+
+def _parse_first_column(table: Tag) -> List[str]:
+    """Returns the names in the first column of a table."""
+    names = []
+    for row in table.find_all("tr"):
+        cells = row.find_all("td")
+        if cells:
+            names.append(_cell_text(cells[0]))
+
+    return [name for name in names if name]
+
+
+def _parse_actions_table(
+    table: Tag, header: List[str], categories: Dict[str, List[str]]
+) -> None:
+    """Add the actions and their access level from the actions table.
+
+    An action spanning several resource types is written as a first row with
+    every column, followed by rows holding only the resource type columns.
+    """
+    access_level_column = next(
+        (i for i, name in enumerate(header) if name.startswith("Access level")),
+        None,
+    )
+    if access_level_column is None:
+        raise ParsingError("Missing access level column in the actions table")
+
+    for row in table.find_all("tr"):
+        cells = row.find_all("td")
+        if len(cells) < len(header):
+            continue
+
+        action = _cell_text(cells[0])
+        if not action:
+            continue
+
+        categories[ACTIONS_CATEGORY].append(action)
+        access_level = cells[access_level_column].get_text(" ", strip=True)
+        if access_level:
+            categories.setdefault(
+                get_access_level_category(access_level), []
+            ).append(action)
+
+
+def parse_service_page(html: str) -> Tuple[str, Dict[str, List[str]]]:
+    """Returns the service prefix and the categories of a service page.
+
+    Args:
+        html (str): The HTML of the service page.
+
+    Returns:
+        Tuple[str, Dict[str, List[str]]]: The service prefix, and its actions,
+            resource types, condition keys and actions per access level.
+
+    Raises:
+        ParsingError: If the page has no service prefix or actions table.
+    """
+    soup = BeautifulSoup(html, HTML_PARSER)
+
+    match = SERVICE_PREFIX_PATTERN.search(soup.get_text(" "))
+    if match is None:
+        raise ParsingError("Missing service prefix")
+
+    categories: Dict[str, List[str]] = {
+        ACTIONS_CATEGORY: [],
+        RESOURCE_TYPES_CATEGORY: [],
+        CONDITION_KEYS_CATEGORY: [],
+    }
+    has_actions = False
+
+    for table in soup.find_all("table"):
+        header = _table_header(table)
+        if not header:
+            continue
+
+        if header[0] == "Actions":
+            _parse_actions_table(table, header, categories)
+            has_actions = True
+        elif header[0].startswith("Resource types"):
+            categories[RESOURCE_TYPES_CATEGORY] += _parse_first_column(table)
+        elif header[0].startswith("Condition keys"):
+            categories[CONDITION_KEYS_CATEGORY] += _parse_first_column(table)
+
+    if not has_actions:
+        raise ParsingError(f"Missing actions table for {match.group(1)}")
+
+    # Keep the first occurrence of each value, in page order.
+    return match.group(1), {
+        category: list(dict.fromkeys(values))
+        for category, values in categories.items()
+    }
+
+
+def merge_service(
+    data: Dict[str, Dict[str, List[str]]],
+    prefix: str,
+    categories: Dict[str, List[str]],
+) -> None:
+    """Merge the categories of a service into the data.
+
+    Some services are documented across several pages, so the values of a
+    prefix seen twice are merged rather than replaced.
+
+    Args:
+        data (Dict[str, Dict[str, List[str]]]): The data to merge into.
+        prefix (str): The service prefix.
+        categories (Dict[str, List[str]]): The categories of the service.
+    """
+    service = data.setdefault(prefix, {})
+    for category, values in categories.items():
+        existing = service.setdefault(category, [])
+        existing.extend(value for value in values if value not in existing)
@@ -0,0 +1,296 @@
+"""Staged scraping pipeline keeping the network and the CPU busy together.
+
+Fetching a page is I/O bound while parsing it with BeautifulSoup is CPU bound,
+so doing both in turn for each service leaves one of them idle. The pipeline
+runs them as concurrent stages connected by bounded queues:
+
+    - Fetch: ``fetch_workers`` threads, each with its own fetcher, fetch the
+      pages. The fetchers of a ``FetcherFactory`` share a single browser,
+      see :mod:`aws_api_actions.scraper`.
+    - Parse: a dispatcher thread hands the pages to a process pool, so the
+      parsing runs on every core, outside of the GIL.
+    - Collect: the calling thread gathers the parsed services, merging the
+      services documented on several pages.
+
+A full queue blocks the stage feeding it, so at most a few queues' worth of
+pages are held in memory, whatever the size of the catalog.
+
+With an enabled ``Profiler``, each stage is profiled under its name: ``fetch``
+merges the fetch threads, ``dispatch`` the parse dispatcher, ``parse`` the
+parse processes and ``collect`` the calling thread.
+
+Usage example:
+    with FetcherFactory(tabs=4) as fetcher_factory:
+        data, failed = run_pipeline(fetcher_factory, urls, fetch_workers=8)
+    fan_out(iter_records(data), sinks)
+"""
+
+import queue
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import ExitStack
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from aws_api_actions.exceptions import ParsingError, ScrapingError
+from aws_api_actions.fetcher import Fetcher
+from aws_api_actions.logger import logger
+from aws_api_actions.memory import MemoryMonitor
+from aws_api_actions.page_store import PageStore
+from aws_api_actions.parser import (
+    SERVICE_PAGE_NAMESPACE,
+    merge_service,
+    parse_service_page,
+)
+from aws_api_actions.profiling import Profiler, profile_call
+
+
+DEFAULT_FETCH_WORKERS = 4
+# Number of items buffered between two stages.
+PIPELINE_QUEUE_SIZE = 16
+# Number of pages collected between two checks of the memory budget.
+MEMORY_CHECK_INTERVAL = 16
+
+# Marker sent by a stage once it has no more items.
+_DONE = None
+
+# The URL, the digest of the page if stored, and either the parse result, the
+# future of the parse result, or the error.
+_Parsed = Tuple[
+    str,
+    Optional[str],
+    Union[Tuple[str, Dict[str, List[str]]], "Future[Any]", Exception],
+]
+
+
+class _Stages:
+    """The queues and errors shared by the stages of a pipeline run."""
+
+    def __init__(
+        self,
+        urls: List[str],
+        fetch_workers: int,
+        queue_size: int,
+        profiler: Profiler,
+    ):
+        """Initialize the queues, with the URLs to fetch queued."""
+        self.profiler = profiler
+        self.urls: "queue.Queue[Optional[str]]" = queue.Queue()
+        for url in urls:
+            self.urls.put(url)
+        for _ in range(fetch_workers):
+            self.urls.put(_DONE)
+
+        self.pages: "queue.Queue[Optional[Tuple[str, Union[str, Exception]]]]"
+        self.pages = queue.Queue(maxsize=queue_size)
+        self.parsed: "queue.Queue[Optional[_Parsed]]"
+        self.parsed = queue.Queue(maxsize=queue_size)
+        self.errors: List[Exception] = []
+
+
+def _fetch_stage(
+    stages: _Stages, fetcher_factory: Callable[[], Fetcher]
+) -> None:
+    """Fetch the queued URLs until the end marker."""
+    try:
+        with stages.profiler.stage("fetch"), fetcher_factory() as fetcher:
+            for url in iter(stages.urls.get, _DONE):
+                for fetched_url, html in fetcher.fetch_many([url]):
+                    stages.pages.put((fetched_url, html))
+    except Exception as err:
+        stages.errors.append(err)
+    finally:
+        stages.pages.put(_DONE)
+
+
+def _submit(
+    stages: _Stages, executor: ProcessPoolExecutor, html: str
+) -> "Future[Any]":
+    """Submit a page to the process pool, profiling its parsing if enabled."""
+    if stages.profiler.enabled:
+        return executor.submit(profile_call, parse_service_page, html)
+
+    return executor.submit(parse_service_page, html)
+
+
+def _parse_stage(
+    stages: _Stages,
+    executor: ProcessPoolExecutor,
+    fetch_workers: int,
+    store: Optional[PageStore],
+) -> None:
+    """Hand the fetched pages to the process pool, in fetch order."""
+    remaining = fetch_workers
+    try:
+        with stages.profiler.stage("dispatch"):
+            while remaining > 0:
+                page = stages.pages.get()
+                if page is _DONE:
+                    remaining -= 1
+                    continue
+
+                url, html = page
+                if isinstance(html, Exception):
+                    stages.parsed.put((url, None, html))
+                    continue
+
+                digest = None
+                if store is not None:
+                    digest = store.put(url, html)
+                    memo = store.get_memo(digest, SERVICE_PAGE_NAMESPACE)
+                    if memo is not None:
+                        stages.parsed.put((url, digest, tuple(memo)))
+                        continue
+
+                future = _submit(stages, executor, html)
+                stages.parsed.put((url, digest, future))
+    except Exception as err:
+        stages.errors.append(err)
+        # Unblock the fetch stage, so its threads can end.
+        while remaining > 0:
+            if stages.pages.get() is _DONE:
+                remaining -= 1
+    finally:
+        stages.parsed.put(_DONE)
+
+
+def _resolve(
+    stages: _Stages, parsed: _Parsed, store: Optional[PageStore]
+) -> Tuple[str, Dict[str, List[str]]]:
+    """Returns the parse result of a page, raising its error if it failed."""
+    _, digest, result = parsed
+    if isinstance(result, Exception):
+        raise result
+
+    if isinstance(result, Future):
+        if stages.profiler.enabled:
+            (prefix, categories), stats = result.result()
+            stages.profiler.add_stats("parse", stats)
+        else:
+            prefix, categories = result.result()
+        if store is not None and digest is not None:
+            store.set_memo(digest, (prefix, categories), SERVICE_PAGE_NAMESPACE)
+        return prefix, categories
+
+    return result
+
+
+def _collect_stage(
+    stages: _Stages,
+    store: Optional[PageStore],
+    memory: Optional[MemoryMonitor],
+) -> Tuple[Dict[str, Dict[str, List[str]]], List[str]]:
+    """Gather the parsed services until the end marker."""
+    data: Dict[str, Dict[str, List[str]]] = {}
+    failed = []
+
+    for number, parsed in enumerate(iter(stages.parsed.get, _DONE), 1):
+        if stages.errors:
+            # Keep draining the queue, so the other stages can end.
+            continue
+
+        try:
+            prefix, categories = _resolve(stages, parsed, store)
+        except (ScrapingError, ParsingError) as err:
+            logger.error("Failed to scrape %s: %s", parsed[0], err)
+            failed.append(parsed[0])
+            continue
+        except Exception as err:
+            stages.errors.append(err)
+            continue
+
+        merge_service(data, prefix, categories)
+        logger.debug("Scraped %s from %s", prefix, parsed[0])
+        # The page store holds the only caches to flush.
+        if (
+            number % MEMORY_CHECK_INTERVAL == 0
+            and store is not None
+            and memory is not None
+            and memory.is_process_over_budget()
+        ):
+            store.flush()
+
+    return data, failed
+
+
+def run_pipeline(
+    fetcher_factory: Callable[[], Fetcher],
+    urls: List[str],
+    store: Optional[PageStore] = None,
+    fetch_workers: int = DEFAULT_FETCH_WORKERS,
+    parse_workers: Optional[int] = None,
+    queue_size: int = PIPELINE_QUEUE_SIZE,
+    memory: Optional[MemoryMonitor] = None,
+    executor: Optional[ProcessPoolExecutor] = None,
+    profiler: Optional[Profiler] = None,
+) -> Tuple[Dict[str, Dict[str, List[str]]], List[str]]:
+    """Fetch and parse the service pages in concurrent stages.
+
+    Args:
+        fetcher_factory (Callable[[], Fetcher]): Function creating the fetcher
+            of each fetch thread.
+        urls (List[str]): The URLs of the service pages.
+        store (Optional[PageStore], optional): The store keeping the pages, so
+            identical pages are stored and parsed once. Defaults to None.
+        fetch_workers (int, optional): The number of fetch threads. Defaults
+            to DEFAULT_FETCH_WORKERS.
+        parse_workers (Optional[int], optional): The number of parse
+            processes. Defaults to None, in which case there is one per CPU.
+        queue_size (int, optional): The number of items buffered between two
+            stages. Defaults to PIPELINE_QUEUE_SIZE.
+        memory (Optional[MemoryMonitor], optional): Monitor tracking the
+            memory of the process tree, the page store being flushed when it
+            is above its budget. Defaults to None.
+        executor (Optional[ProcessPoolExecutor], optional): Process pool
+            parsing the pages, left running for the next runs. Defaults to
+            None, in which case a pool of ``parse_workers`` processes is
+            started for the run.
+        profiler (Optional[Profiler], optional): Profiler profiling each
+            stage. Defaults to None.
+
+    Returns:
+        Tuple[Dict[str, Dict[str, List[str]]], List[str]]: The scraped data,
+            and the URLs of the pages that failed.
+
+    Raises:
+        ScrapingError: If a stage fails for another reason than a page.
+    """
+    stages = _Stages(urls, fetch_workers, queue_size, profiler or Profiler())
+
+    with ExitStack() as stack:
+        if executor is None:
+            executor = stack.enter_context(
+                ProcessPoolExecutor(max_workers=parse_workers)
+            )
+
+        threads = [
+            threading.Thread(
+                target=_fetch_stage,
+                args=(stages, fetcher_factory),
+                name=f"fetch-{number}",
+                daemon=True,
+            )
+            for number in range(fetch_workers)
+        ]
+        threads.append(
+            threading.Thread(
+                target=_parse_stage,
+                args=(stages, executor, fetch_workers, store),
+                name="parse",
+                daemon=True,
+            )
+        )
+        for thread in threads:
+            thread.start()
+
+        with stages.profiler.stage("collect"):
+            data, failed = _collect_stage(stages, store, memory)
+
+        for thread in threads:
+            thread.join()
+
+    if stages.errors:
+        raise ScrapingError(
+            f"Pipeline stage failed: {stages.errors[0]}"
+        ) from stages.errors[0]
+
+    return data, failed
@@ -0,0 +1,284 @@
+"""Profiling of the stages of a build, to see where the time goes.
+
+A ``Profiler`` created with an output directory profiles each stage of a run,
+and writes a profile file per stage with a summary of its hotspots logged:
+
+    - With ``pyinstrument`` installed, the stages run under its sampling
+      profiler, which barely slows them down, and each profile is written as
+      ``<stage>.html``.
+    - Otherwise, they run under ``cProfile``, and each profile is written as
+      ``<stage>.prof``, readable with ``pstats`` or ``snakeviz``.
+
+A stage entered by several threads, e.g. the fetch threads, gets a single
+profile merging theirs. From Python 3.12, ``cProfile`` is built on
+``sys.monitoring``, which allows a single active profiler per process,
+profiling every thread: a stage entered while another one is profiled is then
+not profiled itself, and shows up in the profile of the other. Work done in a
+process pool is profiled with ``cProfile`` by running it through
+``profile_call``, whose statistics are merged with ``add_stats``.
+
+A ``Profiler`` without an output directory does nothing, so the stages can
+always be marked.
+
+Usage example:
+    profiler = Profiler("profiles")
+    with profiler.stage("export"):
+        ...
+    profiler.write()
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from aws_api_actions.exceptions import OutputError
+from aws_api_actions.logger import logger
+
+
+DEFAULT_TOP = 15
+BACKEND_AUTO = "auto"
+BACKEND_CPROFILE = "cprofile"
+BACKEND_PYINSTRUMENT = "pyinstrument"
+BACKENDS = (BACKEND_AUTO, BACKEND_CPROFILE, BACKEND_PYINSTRUMENT)
+
+# Whether several cProfile profilers can be active at once, one per thread.
+CONCURRENT_PROFILES = sys.version_info < (3, 12)
+
+# Raw cProfile statistics, as kept by ``pstats.Stats``.
+RawStats = Dict[Any, Any]
+
+
+class _RawProfile(cProfile.Profile):
+    """Profile holding raw statistics, loadable by ``pstats.Stats``."""
+
+    def __init__(self, stats: RawStats) -> None:
+        """Hold the statistics."""
+        super().__init__()
+        self.stats = stats
+
+    def create_stats(self) -> None:
+        """Statistics are already created."""
+
+
+def profile_call(func: Callable[..., Any], *args: Any) -> Tuple[Any, RawStats]:
+    """Call a function under ``cProfile``, e.g. in a pool process.
+
+    Args:
+        func (Callable[..., Any]): The function.
+        *args (Any): Its arguments.
+
+    Returns:
+        Tuple[Any, RawStats]: The result, and the statistics of the call, to
+            be given to ``Profiler.add_stats``.
+    """
+    profile = cProfile.Profile()
+    result = profile.runcall(func, *args)
+    profile.create_stats()
+    return result, profile.stats
+
+
+def get_backend(backend: str = BACKEND_AUTO) -> str:
+    """Returns the profiler used, pyinstrument if installed for ``auto``.
+
+    Args:
+        backend (str, optional): One of ``BACKENDS``. Defaults to
+            BACKEND_AUTO.
+
+    Returns:
+        str: Either BACKEND_CPROFILE or BACKEND_PYINSTRUMENT.
+
+    Raises:
+        ValueError: If the backend is unknown.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown profiler: {backend}")
+
+    if backend == BACKEND_AUTO:
+        try:
+            import pyinstrument  # noqa: F401
+        except ImportError:
+            return BACKEND_CPROFILE
+        return BACKEND_PYINSTRUMENT
+
+    return backend
+
+
+class Profiler:
+    """Thread-safe profiler of the stages of a run."""
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        top: int = DEFAULT_TOP,
+        backend: str = BACKEND_AUTO,
+    ) -> None:
+        """Initialize the profiler.
+
+        Args:
+            directory (Optional[str], optional): The directory the profiles
+                are written to. Defaults to None, in which case nothing is
+                profiled.
+            top (int, optional): The number of hotspots logged per stage.
+                Defaults to DEFAULT_TOP.
+            backend (str, optional): One of ``BACKENDS``. Defaults to
+                BACKEND_AUTO.
+        """
+        self.directory = directory
+        self.top = top
+        self.backend = get_backend(backend)
+        self._lock = threading.Lock()
+        self._stats: Dict[str, pstats.Stats] = {}
+        self._sessions: Dict[str, Any] = {}
+        self._active = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Returns whether the stages are profiled."""
+        return self.directory is not None
+
+    def add_stats(self, name: str, stats: RawStats) -> None:
+        """Merge ``cProfile`` statistics into the profile of a stage.
+
+        Args:
+            name (str): The name of the stage.
+            stats (RawStats): The statistics, e.g. from ``profile_call``.
+        """
+        with self._lock:
+            if name in self._stats:
+                self._stats[name].add(_RawProfile(stats))
+            else:
+                self._stats[name] = pstats.Stats(_RawProfile(stats))
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Profile the calling thread during a stage.
+
+        Args:
+            name (str): The name of the stage.
+
+        Yields:
+            None: Once the profiling started.
+        """
+        if not self.enabled:
+            yield
+            return
+
+        if self.backend == BACKEND_PYINSTRUMENT:
+            with self._sample(name):
+                yield
+            return
+
+        profile = self._start_profile(name)
+        if profile is None:
+            yield
+            return
+
+        try:
+            yield
+        finally:
+            profile.disable()
+            with self._lock:
+                self._active -= 1
+            profile.create_stats()
+            self.add_stats(name, profile.stats)
+
+    def _start_profile(self, name: str) -> Optional[cProfile.Profile]:
+        """Start profiling a stage, unless another profiler is active."""
+        with self._lock:
+            if self._active and not CONCURRENT_PROFILES:
+                logger.debug(
+                    "Not profiling %s in %s, another stage is profiled",
+                    name,
+                    threading.current_thread().name,
+                )
+                return None
+
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError as err:
+                # Another profiler, e.g. a debugger or coverage, is active.
+                logger.warning("Failed to profile %s: %s", name, err)
+                return None
+
+            self._active += 1
+
+        return profile
+
+    @contextmanager
+    def _sample(self, name: str) -> Iterator[None]:
+        """Profile the calling thread with pyinstrument during a stage."""
+        from pyinstrument import Profiler as SamplingProfiler
+        from pyinstrument.session import Session
+
+        profiler = SamplingProfiler(async_mode="disabled")
+        profiler.start()
+        try:
+            yield
+        finally:
+            session = profiler.stop()
+            with self._lock:
+                if name in self._sessions:
+                    session = Session.combine(self._sessions[name], session)
+                self._sessions[name] = session
+
+    def _format_hotspots(self, stats: pstats.Stats) -> List[str]:
+        """Returns the functions with the most time spent in themselves."""
+        rows = sorted(
+            stats.stats.items(),  # type: ignore[attr-defined]
+            key=lambda item: item[1][2],
+            reverse=True,
+        )[: self.top]
+        return [
+            f"{own:9.3f}s {cumulative:9.3f}s {calls:9d}  {file}:{line}({func})"
+            for (file, line, func), (_, calls, own, cumulative, _) in rows
+        ]
+
+    def write(self) -> None:
+        """Write the profile of each stage, logging its hotspots.
+
+        Raises:
+            OutputError: If a profile cannot be written.
+        """
+        if self.directory is None:
+            return
+
+        with self._lock:
+            stats, sessions = dict(self._stats), dict(self._sessions)
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            for name, stage_stats in stats.items():
+                file_path = os.path.join(self.directory, f"{name}.prof")
+                stage_stats.dump_stats(file_path)
+                logger.info(
+                    "Hotspots of %s (own, cumulative, calls), see %s:\n%s",
+                    name,
+                    file_path,
+                    "\n".join(self._format_hotspots(stage_stats)),
+                )
+            for name, session in sessions.items():
+                self._write_session(name, session)
+        except OSError as err:
+            raise OutputError(f"Failed to write the profiles: {err}") from err
+
+    def _write_session(self, name: str, session: Any) -> None:
+        """Write a pyinstrument session as html, logging its hotspots."""
+        from pyinstrument.renderers import ConsoleRenderer, HTMLRenderer
+
+        file_path = os.path.join(str(self.directory), f"{name}.html")
+        with io.open(file_path, "w", encoding="utf-8") as file:
+            file.write(HTMLRenderer().render(session))
+
+        text = ConsoleRenderer(unicode=False, color=False).render(session)
+        logger.info(
+            "Profile of %s, see %s:\n%s",
+            name,
+            file_path,
+            "\n".join(text.splitlines()[: self.top * 2]),
+        )
@@ -1,115 +1,523 @@
-import os
-from typing import List
-from urllib.parse import urlparse
-
-from bs4 import BeautifulSoup
-from selenium.webdriver.common.by import By
-from selenium.webdriver.firefox.options import Options
-from selenium.webdriver.firefox.service import Service
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
-
-# from selenium import webdriver
-from seleniumwire import webdriver
-
-from aws_api_actions.constants import USER_AGENT
-from aws_api_actions.geckodriver import (
-    get_geckodriver_binary_path,
-    is_geckodriver_installed,
+"""Scrape the actions of every AWS service from the documentation.
+
+The Service Authorization Reference index links to a page per service. Each
+page is fetched once and parsed once, yielding the actions, their access
+levels, the resource types and the condition keys of the service together.
+The pages are fetched and parsed concurrently, see
+:mod:`aws_api_actions.pipeline`. The fetch threads fetch over HTTP on their
+own, and share a single browser for the pages rendered client-side, which
+loads up to ``--tabs`` of them concurrently.
+
+Usage example:
+    scrape --output actions.json.gz --output actions.csv
+"""
+
+import argparse
+import sys
+from functools import partial
+from types import TracebackType
+from typing import Callable, Dict, List, Optional, Tuple, Type
+
+from aws_api_actions.constants import (
+    BROWSER_BACKENDS,
+    DEFAULT_BROWSER_BACKEND,
+    SERVICE_AUTHORIZATION_REFERENCE_URL,
+)
+from aws_api_actions.exceptions import ScrapingError
+from aws_api_actions.exporter import fan_out, get_sink, iter_records, sort_data
+from aws_api_actions.fetcher import (
+    BrowserFetcher,
+    Fetcher,
+    HttpFetcher,
+    HybridFetcher,
+    ReplayFetcher,
+    SharedFetcher,
 )
+from aws_api_actions.har import HarArchive, create_replay_webdriver
 from aws_api_actions.logger import logger
-from aws_api_actions.utilities import get_firefox_binary_path
+from aws_api_actions.memory import MIB, MemoryMonitor
+from aws_api_actions.page_store import PageStore
+from aws_api_actions.parser import (
+    SERVICE_PAGE_NAMESPACE,
+    parse_service_index,
+    parse_service_page,
+)
+from aws_api_actions.pipeline import DEFAULT_FETCH_WORKERS, run_pipeline
+from aws_api_actions.profiling import Profiler
+from aws_api_actions.sharding import parse_shard, select_shard_urls
+from aws_api_actions.telemetry import TimingCollector
 
 
-if is_geckodriver_installed() is False:
-    logger.warning(
-        "Geckodriver is NOT installed. For 'aws_api_actions' to function properly, "
-        "it must be installed. To install Geckodriver, run the 'gecko_install' "
-        "command or import the 'aws_api_actions.geckodriver.install_geckodriver'"
-        " function."
+def create_fetcher(
+    browser: bool = True,
+    profile_template: Optional[str] = None,
+    tabs: int = 1,
+    telemetry: Optional[TimingCollector] = None,
+    record_har: Optional[HarArchive] = None,
+    replay_har: Optional[HarArchive] = None,
+    memory: Optional[MemoryMonitor] = None,
+    browser_backend: str = DEFAULT_BROWSER_BACKEND,
+) -> Fetcher:
+    """Create the fetcher used to scrape the documentation.
+
+    Args:
+        browser (bool, optional): Whether to fall back to a browser for pages
+            rendered client-side. Defaults to True.
+        profile_template (Optional[str], optional): Profile template the
+            browser starts on a copy of. Defaults to None.
+        tabs (int, optional): The number of pages the browser loads
+            concurrently, in tabs. Defaults to 1.
+        telemetry (Optional[TimingCollector], optional): Collector of the
+            browser page load timings. Defaults to None.
+        record_har (Optional[HarArchive], optional): Archive recording every
+            response received. Defaults to None.
+        replay_har (Optional[HarArchive], optional): Archive serving every
+            response instead of the network. Defaults to None.
+        memory (Optional[MemoryMonitor], optional): Monitor restarting the
+            browser when above its memory budget. Defaults to None.
+        browser_backend (str, optional): The browser rendering the pages,
+            ``firefox`` or ``chromium``. Defaults to DEFAULT_BROWSER_BACKEND.
+
+    Returns:
+        Fetcher: The fetcher.
+    """
+    http = _create_http_fetcher(record_har, replay_har)
+    if browser is False:
+        return http
+
+    return HybridFetcher(
+        http,
+        _create_browser_fetcher(
+            profile_template,
+            tabs,
+            telemetry,
+            record_har,
+            replay_har,
+            memory,
+            browser_backend,
+        ),
     )
 
 
-def setup_webdriver(
-    geckodriver_binary: str, firefox_binary: str, webdriver_options: List[str]
-) -> webdriver.Firefox:
-    """Generate a webdriver instance.
+def _create_http_fetcher(
+    record_har: Optional[HarArchive], replay_har: Optional[HarArchive]
+) -> Fetcher:
+    """Create the fetcher of the static pages."""
+    if replay_har is None:
+        return HttpFetcher(har=record_har)
+
+    return ReplayFetcher(replay_har)
+
+
+def _create_browser_fetcher(
+    profile_template: Optional[str],
+    tabs: int,
+    telemetry: Optional[TimingCollector],
+    record_har: Optional[HarArchive],
+    replay_har: Optional[HarArchive],
+    memory: Optional[MemoryMonitor],
+    browser_backend: str,
+) -> BrowserFetcher:
+    """Create the fetcher of the pages rendered client-side."""
+    driver_factory = None
+    if replay_har is not None:
+        driver_factory = partial(
+            create_replay_webdriver,
+            replay_har,
+            profile_template,
+            browser_backend,
+        )
+
+    return BrowserFetcher(
+        driver_factory=driver_factory,
+        profile_template=profile_template,
+        tabs=tabs,
+        telemetry=telemetry,
+        har=record_har,
+        memory=memory,
+        browser_backend=browser_backend,
+    )
+
+
+class FetcherFactory:
+    """Factory of the fetchers of the fetch threads, sharing one browser.
+
+    Each fetcher created fetches over HTTP on its own, and escalates the pages
+    rendered client-side to a single ``BrowserFetcher``, which loads the pages
+    of every fetcher together in up to ``tabs`` tabs. The browser is only
+    started on the first such page, and quit when the factory is closed.
+    """
+
+    def __init__(
+        self,
+        browser: bool = True,
+        profile_template: Optional[str] = None,
+        tabs: int = 1,
+        telemetry: Optional[TimingCollector] = None,
+        record_har: Optional[HarArchive] = None,
+        replay_har: Optional[HarArchive] = None,
+        memory: Optional[MemoryMonitor] = None,
+        browser_backend: str = DEFAULT_BROWSER_BACKEND,
+    ) -> None:
+        """Initialize the factory.
+
+        The arguments are those of ``create_fetcher``.
+
+        Args:
+            browser (bool, optional): Whether to fall back to a browser for
+                pages rendered client-side. Defaults to True.
+            profile_template (Optional[str], optional): Profile template the
+                browser starts on a copy of. Defaults to None.
+            tabs (int, optional): The number of pages the browser loads
+                concurrently, in tabs. Defaults to 1.
+            telemetry (Optional[TimingCollector], optional): Collector of the
+                browser page load timings. Defaults to None.
+            record_har (Optional[HarArchive], optional): Archive recording
+                every response received. Defaults to None.
+            replay_har (Optional[HarArchive], optional): Archive serving every
+                response instead of the network. Defaults to None.
+            memory (Optional[MemoryMonitor], optional): Monitor restarting the
+                browser when above its memory budget. Defaults to None.
+            browser_backend (str, optional): The browser rendering the pages.
+                Defaults to DEFAULT_BROWSER_BACKEND.
+        """
+        self.record_har = record_har
+        self.replay_har = replay_har
+        self.browser: Optional[SharedFetcher] = None
+        if browser:
+            self.browser = SharedFetcher(
+                _create_browser_fetcher(
+                    profile_template,
+                    tabs,
+                    telemetry,
+                    record_har,
+                    replay_har,
+                    memory,
+                    browser_backend,
+                ),
+                batch_size=tabs,
+            )
+
+    def __call__(self) -> Fetcher:
+        """Create the fetcher of a fetch thread.
+
+        Returns:
+            Fetcher: The fetcher.
+        """
+        http = _create_http_fetcher(self.record_har, self.replay_har)
+        if self.browser is None:
+            return http
+
+        return HybridFetcher(http, self.browser.borrow())
+
+    def close(self) -> None:
+        """Quit the shared browser, if it was started."""
+        if self.browser is not None:
+            self.browser.close()
+
+    def __enter__(self) -> "FetcherFactory":
+        """Return the factory for use as a context manager."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Close the factory when leaving the context."""
+        self.close()
+
+
+def scrape_service_urls(
+    fetcher: Fetcher, index_url: str = SERVICE_AUTHORIZATION_REFERENCE_URL
+) -> List[str]:
+    """Returns the URLs of the service pages of the reference.
+
+    Args:
+        fetcher (Fetcher): The fetcher.
+        index_url (str, optional): The URL of the reference index. Defaults to
+            SERVICE_AUTHORIZATION_REFERENCE_URL.
+
+    Returns:
+        List[str]: The URLs of the service pages.
+
+    Raises:
+        ScrapingError: If the index links to no service page.
+    """
+    # The index is a static page without any actions, so it is never checked
+    # for them, which would escalate it to the browser.
+    html = fetcher.fetch_static(index_url)
+    urls = parse_service_index(html, index_url)
+    if not urls:
+        raise ScrapingError(f"No service pages found in {index_url}")
+
+    logger.info("Found %d service pages", len(urls))
+    return urls
+
+
+def parse_page(
+    url: str, html: str, store: Optional[PageStore] = None
+) -> Tuple[str, Dict[str, List[str]]]:
+    """Parse a service page.
 
     Args:
-        geckodriver_binary str: Path to Geckodriver binary.
-        firefox_binarystr: Path to Firefox binary.
-        webdriver_options List[str]: List of options to pass to the
-            webdriver.
+        url (str): The URL of the service page.
+        html (str): The HTML of the service page.
+        store (Optional[PageStore], optional): The store keeping the page, so
+            identical pages are stored and parsed once. Defaults to None.
 
     Returns:
-        webdriver.Firefox: A webdriver instance.
+        Tuple[str, Dict[str, List[str]]]: The service prefix and its
+            categories.
     """
-    # Generate the webdriver
-    service = Service(
-        executable_path=geckodriver_binary,
-        # log_path=gecko_logs,
-    )
-    options = webdriver.FirefoxOptions()
-    for option in webdriver_options:
-        options.add_argument(option)
-
-    options.binary_location = firefox_binary
-    driver = webdriver.Firefox(
-        options=options,
-        service=service,
-    )
-    return driver
-
-
-def main() -> None:
-    """Main function to setup the webdriver and load the target URL."""
-    geckodriver_binary = get_geckodriver_binary_path()
-    firefox_binary = get_firefox_binary_path()
-
-    driver: webdriver.Firefox = setup_webdriver(
-        geckodriver_binary,
-        firefox_binary,
-        webdriver_options=[
-            "--headless",
-            "--disable-gpu",
-            "--disable-extensions",
-        ],
-    )
-
-    full_url = (
-        "https://docs.aws.amazon.com/AWSEC2/latest/APIReference/Welcome.html"
-    )
-    url_comps = urlparse(full_url)
-    domain = url_comps.netloc
-
-    driver.get(full_url)
-    driver.fullscreen_window()
-    driver.save_screenshot(
-        os.path.join(
-            os.path.dirname(
-                os.path.abspath(
-                    "abc" if "__file__" not in locals() else __file__
-                )
-            ),
-            "screenshot.png",
-        )
+    if store is None:
+        return parse_service_page(html)
+
+    digest = store.put(url, html)
+    prefix, categories = store.memoize(
+        digest,
+        parse_service_page,
+        namespace=SERVICE_PAGE_NAMESPACE,
+        content=html,
     )
-    title = driver.title
-    current_url = driver.current_url
-    page_source = driver.page_source
+    return prefix, categories
+
 
-    performance = driver.execute_script("return window.performance.timing")
-    cookies = driver.get_cookies()
-    downloadable_files = driver.get_downloadable_files()
+def scrape_service(
+    fetcher: Fetcher, url: str, store: Optional[PageStore] = None
+) -> Tuple[str, Dict[str, List[str]]]:
+    """Scrape a service page.
+
+    Args:
+        fetcher (Fetcher): The fetcher.
+        url (str): The URL of the service page.
+        store (Optional[PageStore], optional): The store keeping the page.
+            Defaults to None.
+
+    Returns:
+        Tuple[str, Dict[str, List[str]]]: The service prefix and its
+            categories.
+    """
+    return parse_page(url, fetcher.fetch(url), store)
+
+
+def _parse_args(argv: Optional[List[str]]) -> argparse.Namespace:
+    """Parse the command line arguments of the scraper."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "-o",
+        "--output",
+        action="append",
+        required=True,
+        help="File to export to, the format is selected from the extension. "
+        "Can be given several times.",
+    )
+    parser.add_argument(
+        "--index-url", default=SERVICE_AUTHORIZATION_REFERENCE_URL
+    )
+    parser.add_argument(
+        "--no-browser",
+        action="store_true",
+        help="Never fall back to a browser for pages rendered client-side.",
+    )
+    parser.add_argument(
+        "--browser-backend",
+        choices=BROWSER_BACKENDS,
+        default=DEFAULT_BROWSER_BACKEND,
+        help="Browser rendering the pages rendered client-side.",
+    )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=None,
+        help="Number of threads writing the outputs.",
+    )
+    parser.add_argument(
+        "--page-store",
+        default=None,
+        help="Directory keeping the fetched pages, deduplicated by content.",
+    )
+    parser.add_argument(
+        "--profile-template",
+        default=None,
+        help="Profile template of the browser, e.g. built by the "
+        "firefox_profile command.",
+    )
+    parser.add_argument(
+        "--tabs",
+        type=int,
+        default=1,
+        help="Number of pages the browser loads concurrently, in tabs.",
+    )
+    parser.add_argument(
+        "--shard",
+        type=parse_shard,
+        default=None,
+        metavar="I/N",
+        help="Only scrape the I-th of N shards of the services, and write "
+        "them sorted so the shards can be merged with the merge command.",
+    )
+    parser.add_argument(
+        "--fetch-workers",
+        type=int,
+        default=DEFAULT_FETCH_WORKERS,
+        help="Number of threads fetching the pages, each with its own fetcher.",
+    )
+    parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=None,
+        help="Number of processes parsing the pages. Defaults to one per CPU.",
+    )
+    parser.add_argument(
+        "--timing-report",
+        default=None,
+        help="File to write the page load timings of the browser to, as json.",
+    )
+    har = parser.add_mutually_exclusive_group()
+    har.add_argument(
+        "--record-har",
+        default=None,
+        help="HAR file to record every response received to.",
+    )
+    har.add_argument(
+        "--replay-har",
+        default=None,
+        help="HAR file recorded with --record-har, serving every response "
+        "instead of the network.",
+    )
+    parser.add_argument(
+        "--memory-report",
+        action="store_true",
+        help="Log the peak memory of each stage, tracing the Python "
+        "allocations, which slows the run down.",
+    )
+    parser.add_argument(
+        "--memory-budget",
+        type=int,
+        default=None,
+        metavar="MIB",
+        help="RSS of the whole process tree above which the caches are "
+        "flushed.",
+    )
+    parser.add_argument(
+        "--driver-memory-budget",
+        type=int,
+        default=None,
+        metavar="MIB",
+        help="RSS of a browser above which it is restarted.",
+    )
+    parser.add_argument(
+        "--profile",
+        default=None,
+        metavar="DIR",
+        help="Directory to write a profile of each stage to, logging their "
+        "hotspots.",
+    )
+    return parser.parse_args(argv)
+
+
+def _create_memory_monitor(args: argparse.Namespace) -> MemoryMonitor:
+    """Create the memory monitor of the scraper, with budgets in bytes."""
+    return MemoryMonitor(
+        driver_budget=(
+            None
+            if args.driver_memory_budget is None
+            else args.driver_memory_budget * MIB
+        ),
+        process_budget=(
+            None if args.memory_budget is None else args.memory_budget * MIB
+        ),
+        trace_python=args.memory_report,
+    )
+
+
+def _scrape(
+    args: argparse.Namespace,
+    fetcher_factory: Callable[[], Fetcher],
+    store: Optional[PageStore],
+    memory: MemoryMonitor,
+    profiler: Profiler,
+) -> Tuple[Dict[str, Dict[str, List[str]]], List[str]]:
+    """Scrape the service pages of the index, or of the shard of the run."""
+    with memory.stage("index"), profiler.stage("index"):
+        with fetcher_factory() as fetcher:
+            urls = scrape_service_urls(fetcher, args.index_url)
+
+    if args.shard is not None:
+        urls = select_shard_urls(urls, args.shard)
+        logger.info("Scraping %d pages of shard %s", len(urls), args.shard)
+
+    with memory.stage("scrape"):
+        data, failed = run_pipeline(
+            fetcher_factory,
+            urls,
+            store,
+            fetch_workers=args.fetch_workers,
+            parse_workers=args.parse_workers,
+            memory=memory,
+            profiler=profiler,
+        )
+
+    # Sorted, so the same catalog always exports to the same bytes, and the
+    # shard outputs can be merged.
+    return sort_data(data), failed
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Scrape the actions of every service and export them.
+
+    Args:
+        argv (Optional[List[str]], optional): The command line arguments.
+            Defaults to None, in which case ``sys.argv`` is used.
+    """
+    args = _parse_args(argv)
+    sinks = [get_sink(path) for path in args.output]
+    store = None if args.page_store is None else PageStore(args.page_store)
+    telemetry = None if args.timing_report is None else TimingCollector()
+    memory = _create_memory_monitor(args)
+    profiler = Profiler(args.profile)
+    record_har = None if args.record_har is None else HarArchive()
+    replay_har = None
+    if args.replay_har is not None:
+        replay_har = HarArchive.load(args.replay_har)
+    with FetcherFactory(
+        browser=not args.no_browser,
+        profile_template=args.profile_template,
+        tabs=args.tabs,
+        telemetry=telemetry,
+        record_har=record_har,
+        replay_har=replay_har,
+        memory=memory,
+        browser_backend=args.browser_backend,
+    ) as fetcher_factory:
+        data, failed = _scrape(args, fetcher_factory, store, memory, profiler)
+
+    if store is not None:
+        store.save()
+
+    if record_har is not None:
+        record_har.save(args.record_har)
+
+    if telemetry is not None:
+        telemetry.log_summary()
+        telemetry.write_report(args.timing_report)
+
+    with memory.stage("export"), profiler.stage("export"):
+        fan_out(iter_records(data), sinks, max_workers=args.max_workers)
+    logger.success(
+        "Exported %d services to %s", len(data), ", ".join(args.output)
+    )
 
-    for request in driver.requests:
-        if request.response:
-            print(request.url, request.response.status_code)
+    if args.memory_report:
+        memory.log_report()
 
-    source = driver.page_source
-    driver.quit()
+    profiler.write()
 
-    print(source)
+    if failed:
+        logger.error("Failed to scrape %d service pages", len(failed))
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,345 @@
+"""Local HTTP lookup service for the action catalog.
+
+The catalog is loaded once and served to any number of local tools, so each of
+them doesn't have to load its own copy of the dataset.
+
+Endpoints:
+    - ``GET /services``: The service prefixes.
+    - ``GET /services/{prefix}``: The categories and values of a service.
+    - ``GET /services/{prefix}/actions``: The actions of a service.
+    - ``GET /expand?action=s3:Get*``: The actions matching a pattern.
+    - ``POST /reload``: Reload the dataset file.
+
+Like IAM, service prefixes and action patterns are matched case-insensitively.
+
+The dataset is hot-reloaded on ``POST /reload``, on ``SIGHUP``, or when the file
+changes if ``--watch-interval`` is given. The new dataset is loaded in the
+background and swapped in atomically, so in-flight requests finish against the
+dataset they started with.
+
+Usage example:
+    serve actions.json.gz --port 8080
+"""
+
+import argparse
+import json
+import os
+import signal
+import sys
+import threading
+from functools import lru_cache
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import FrameType
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlparse
+
+from aws_api_actions.catalog import expand_action, get_actions
+from aws_api_actions.exceptions import ParsingError
+from aws_api_actions.loader import load_from_file
+from aws_api_actions.logger import logger
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+DEFAULT_CACHE_SIZE = 4096
+
+
+class CatalogSnapshot(NamedTuple):
+    """A dataset with its service lookup and expansion cache.
+
+    A request works on a single snapshot, so a reload swapping in another one
+    never shows it a mix of both datasets.
+    """
+
+    data: Dict[str, Dict[str, List[str]]]
+    services: Dict[str, str]
+    expand_cached: Callable[[str], Tuple[str, ...]]
+
+    def find_service(self, prefix: str) -> Optional[str]:
+        """Return the name of a service, looked up case-insensitively.
+
+        Args:
+            prefix (str): The service prefix.
+
+        Returns:
+            Optional[str]: The service name, or None if it does not exist.
+        """
+        return self.services.get(prefix.lower())
+
+    def expand(self, pattern: str) -> Tuple[str, ...]:
+        """Expand an action pattern against the dataset.
+
+        Args:
+            pattern (str): The action pattern, e.g. ``s3:Get*``.
+
+        Returns:
+            Tuple[str, ...]: The matching actions.
+        """
+        # Patterns are case-insensitive, so they share a single cache entry.
+        return self.expand_cached(pattern.lower())
+
+
+class CatalogState:
+    """The currently served dataset and its expansion cache."""
+
+    def __init__(self, file_path: str, cache_size: int = DEFAULT_CACHE_SIZE):
+        """Load the dataset.
+
+        Args:
+            file_path (str): The path to the dataset file.
+            cache_size (int, optional): The maximum number of cached expansion
+                results. Defaults to DEFAULT_CACHE_SIZE.
+        """
+        self.file_path = file_path
+        self.cache_size = cache_size
+        self._reload_lock = threading.Lock()
+        self._mtime = 0.0
+        self._current = CatalogSnapshot({}, {}, lambda pattern: ())
+        self.reload()
+
+    @property
+    def snapshot(self) -> CatalogSnapshot:
+        """Return the currently served dataset, lookup and cache together."""
+        return self._current
+
+    @property
+    def data(self) -> Dict[str, Dict[str, List[str]]]:
+        """Return the currently served dataset."""
+        return self._current.data
+
+    def find_service(self, prefix: str) -> Optional[str]:
+        """Return the name of a service, looked up case-insensitively.
+
+        Args:
+            prefix (str): The service prefix.
+
+        Returns:
+            Optional[str]: The service name, or None if it does not exist.
+        """
+        return self._current.find_service(prefix)
+
+    def expand(self, pattern: str) -> Tuple[str, ...]:
+        """Expand an action pattern against the current dataset.
+
+        Args:
+            pattern (str): The action pattern, e.g. ``s3:Get*``.
+
+        Returns:
+            Tuple[str, ...]: The matching actions.
+        """
+        return self._current.expand(pattern)
+
+    def reload(self) -> None:
+        """Load the dataset file and swap it in with a fresh cache."""
+        with self._reload_lock:
+            mtime = os.path.getmtime(self.file_path)
+            data = load_from_file(self.file_path)
+
+            @lru_cache(maxsize=self.cache_size)
+            def expand(pattern: str) -> Tuple[str, ...]:
+                return tuple(expand_action(data, pattern))
+
+            services = {service.lower(): service for service in data}
+
+            # A single attribute assignment, so readers either see the old or
+            # the new dataset and cache, never a mix of both.
+            self._current = CatalogSnapshot(data, services, expand)
+            self._mtime = mtime
+
+        logger.info("Loaded %d services from %s", len(data), self.file_path)
+
+    def reload_if_changed(self) -> None:
+        """Reload the dataset file if it was modified since the last load."""
+        try:
+            changed = os.path.getmtime(self.file_path) != self._mtime
+        except OSError as err:
+            logger.warning("Failed to check %s: %s", self.file_path, err)
+            return
+
+        if changed:
+            self.safe_reload()
+
+    def safe_reload(self) -> None:
+        """Reload the dataset, keeping the current one if loading fails."""
+        try:
+            self.reload()
+        except (OSError, ParsingError) as err:
+            logger.error("Failed to reload %s: %s", self.file_path, err)
+
+
+class CatalogRequestHandler(BaseHTTPRequestHandler):
+    """Request handler serving the catalog of a ``CatalogServer``."""
+
+    server: "CatalogServer"
+
+    def do_GET(self) -> None:  # noqa: N802
+        """Serve the lookup endpoints."""
+        url = urlparse(self.path)
+        parts = [unquote(part) for part in url.path.strip("/").split("/")]
+        # A single snapshot, so a concurrent reload can't swap the dataset
+        # between the lookup of a service and the read of its categories.
+        snapshot = self.server.state.snapshot
+        data = snapshot.data
+
+        if parts == ["services"]:
+            self._send_json(sorted(data))
+
+        elif len(parts) in (2, 3) and parts[0] == "services":
+            service = snapshot.find_service(parts[1])
+            if service is None:
+                self._send_error(HTTPStatus.NOT_FOUND, "Unknown service")
+            elif len(parts) == 2:
+                self._send_json(data[service])
+            elif parts[2] == "actions":
+                self._send_json(get_actions(data, service))
+            else:
+                self._send_error(HTTPStatus.NOT_FOUND, "Not found")
+
+        elif parts == ["expand"]:
+            patterns = parse_qs(url.query).get("action", [])
+            if len(patterns) != 1:
+                self._send_error(
+                    HTTPStatus.BAD_REQUEST, "Expected one 'action' parameter"
+                )
+                return
+            try:
+                self._send_json(list(snapshot.expand(patterns[0])))
+            except ParsingError as err:
+                self._send_error(HTTPStatus.BAD_REQUEST, err.message)
+
+        else:
+            self._send_error(HTTPStatus.NOT_FOUND, "Not found")
+
+    def do_POST(self) -> None:  # noqa: N802
+        """Serve the reload endpoint."""
+        if urlparse(self.path).path.strip("/") != "reload":
+            self._send_error(HTTPStatus.NOT_FOUND, "Not found")
+            return
+
+        try:
+            self.server.state.reload()
+        except (OSError, ParsingError) as err:
+            self._send_error(HTTPStatus.INTERNAL_SERVER_ERROR, str(err))
+            return
+
+        self._send_json({"services": len(self.server.state.data)})
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        """Log the requests through the package logger."""
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    def _send_json(self, body: Any, status: HTTPStatus = HTTPStatus.OK) -> None:
+        """Send a json response."""
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _send_error(self, status: HTTPStatus, message: str) -> None:
+        """Send a json error response."""
+        self._send_json({"error": message}, status)
+
+
+class CatalogServer(ThreadingHTTPServer):
+    """Threaded HTTP server holding the served catalog state."""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], state: CatalogState):
+        """Bind the server.
+
+        Args:
+            address (Tuple[str, int]): The host and port to bind to.
+            state (CatalogState): The served catalog state.
+        """
+        super().__init__(address, CatalogRequestHandler)
+        self.state = state
+
+
+def watch_dataset(
+    state: CatalogState, interval: float, stop: threading.Event
+) -> threading.Thread:
+    """Start a thread reloading the dataset whenever its file changes.
+
+    Args:
+        state (CatalogState): The served catalog state.
+        interval (float): The polling interval in seconds.
+        stop (threading.Event): Event stopping the thread when set.
+
+    Returns:
+        threading.Thread: The started thread.
+    """
+
+    def watch() -> None:
+        while not stop.wait(interval):
+            state.reload_if_changed()
+
+    thread = threading.Thread(target=watch, name="dataset-watcher", daemon=True)
+    thread.start()
+    return thread
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Serve the action catalog over HTTP.
+
+    Args:
+        argv (Optional[List[str]], optional): The command line arguments.
+            Defaults to None, in which case ``sys.argv`` is used.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("dataset", help="Path to the exported dataset file.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=DEFAULT_CACHE_SIZE,
+        help="Maximum number of cached expansion results.",
+    )
+    parser.add_argument(
+        "--watch-interval",
+        type=float,
+        default=None,
+        help="Reload the dataset when its file changes, polling every N seconds.",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        state = CatalogState(args.dataset, cache_size=args.cache_size)
+    except (OSError, ParsingError) as err:
+        logger.error("Failed to load %s: %s", args.dataset, err)
+        sys.exit(1)
+
+    server = CatalogServer((args.host, args.port), state)
+
+    def handle_sighup(signum: int, frame: Optional[FrameType]) -> None:
+        # Reload off the signal handler, so requests keep being served.
+        threading.Thread(target=state.safe_reload, daemon=True).start()
+
+    previous_handler = None
+    if hasattr(signal, "SIGHUP"):
+        previous_handler = signal.signal(signal.SIGHUP, handle_sighup)
+
+    stop = threading.Event()
+    if args.watch_interval is not None:
+        watch_dataset(state, args.watch_interval, stop)
+
+    logger.info(
+        "Serving %s on http://%s:%d", args.dataset, *server.server_address
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Shutting down")
+    finally:
+        stop.set()
+        server.server_close()
+        if previous_handler is not None:
+            signal.signal(signal.SIGHUP, previous_handler)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""Split a crawl across several machines and merge their outputs.
+
+Each machine crawls one shard, given as ``--shard i/N``, without any
+coordination: a service page belongs to the shard selected by a stable hash of
+its URL slug, so every machine computes the same assignment. Each shard writes
+its output sorted by service, category and value, and the ``merge`` command
+k-way merges the shard outputs into the final exports, streaming the records
+so the shards never have to be loaded into memory. The shards must be in a
+streamed format: text, csv, xml or binary, not json.
+
+A service may have pages in several shards, each exporting some of its values
+again, so equal records are merged once, as a single run merges its pages.
+
+Usage example:
+    scrape --shard 1/4 --output shard-1.csv.gz
+    ...
+    scrape --shard 4/4 --output shard-4.csv.gz
+    merge shard-*.csv.gz --output actions.json --output actions.xml
+"""
+
+import argparse
+import hashlib
+import heapq
+import posixpath
+from typing import Iterable, Iterator, List, NamedTuple, Optional
+from urllib.parse import urlparse
+
+from aws_api_actions.exceptions import ParsingError
+from aws_api_actions.exporter import (
+    Record,
+    compact_records,
+    fan_out,
+    get_sink,
+    record_sort_key,
+)
+from aws_api_actions.loader import is_streamed, iter_records_from_file
+from aws_api_actions.logger import logger
+from aws_api_actions.profiling import Profiler
+
+
+class Shard(NamedTuple):
+    """A shard of the crawl, numbered from 1 to ``total``."""
+
+    number: int
+    total: int
+
+    def __str__(self) -> str:
+        """Returns the shard in the ``i/N`` notation."""
+        return f"{self.number}/{self.total}"
+
+
+def parse_shard(text: str) -> Shard:
+    """Parse a shard given as ``i/N``.
+
+    Args:
+        text (str): The shard, e.g. "2/4" for the second of four shards.
+
+    Returns:
+        Shard: The shard.
+
+    Raises:
+        ValueError: If the shard is malformed or out of range.
+    """
+    number, _, total = text.partition("/")
+    shard = Shard(int(number), int(total))
+    if not 1 <= shard.number <= shard.total:
+        raise ValueError(f"Shard out of range: {text}")
+
+    return shard
+
+
+def get_url_slug(url: str) -> str:
+    """Returns the slug identifying a page across hosts and versions.
+
+    Args:
+        url (str): The page URL.
+
+    Returns:
+        str: The file name of the page, without its extension.
+    """
+    return posixpath.splitext(posixpath.basename(urlparse(url).path))[0]
+
+
+def get_shard_number(key: str, total: int) -> int:
+    """Returns the shard a key belongs to.
+
+    The key is hashed with SHA-256 rather than ``hash()``, which is salted
+    per process, so every machine computes the same shard.
+
+    Args:
+        key (str): The key.
+        total (int): The number of shards.
+
+    Returns:
+        int: The shard number, from 1 to ``total``.
+    """
+    digest = hashlib.sha256(key.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % total + 1
+
+
+def select_shard_urls(urls: Iterable[str], shard: Shard) -> List[str]:
+    """Returns the URLs of the pages belonging to a shard.
+
+    Args:
+        urls (Iterable[str]): The URLs of the pages.
+        shard (Shard): The shard.
+
+    Returns:
+        List[str]: The URLs belonging to the shard.
+    """
+    return [
+        url
+        for url in urls
+        if get_shard_number(get_url_slug(url), shard.total) == shard.number
+    ]
+
+
+def _check_sorted(
+    records: Iterable[Record], file_path: str
+) -> Iterator[Record]:
+    """Yield the records, raising a ParsingError if they are not sorted."""
+    previous = None
+    for record in records:
+        key = record_sort_key(record)
+        if previous is not None and key < previous:
+            raise ParsingError(f"Shard output is not sorted: {file_path}")
+        previous = key
+        yield record
+
+
+def _drop_duplicates(records: Iterable[Record]) -> Iterator[Record]:
+    """Yield the sorted records, without the repeats of a value."""
+    previous = None
+    for record in records:
+        if record[2] is None or record != previous:
+            yield record
+        previous = record
+
+
+def merge_records(file_paths: List[str]) -> Iterator[Record]:
+    """Stream the records of sorted shard outputs, k-way merged.
+
+    Only one record per shard is held in memory at a time. The values found
+    in several shards are merged once.
+
+    Args:
+        file_paths (List[str]): The paths to the shard outputs, in any format
+            with a streaming reader.
+
+    Returns:
+        Iterator[Record]: The merged records, sorted.
+
+    Raises:
+        ParsingError: If a shard output is not sorted, or not in a streamed
+            format.
+    """
+    for file_path in file_paths:
+        if not is_streamed(file_path):
+            raise ParsingError(
+                f"Shard outputs must be text, csv, xml or binary, to be "
+                f"streamed: {file_path}"
+            )
+
+    readers = [
+        _check_sorted(iter_records_from_file(file_path), file_path)
+        for file_path in file_paths
+    ]
+    return compact_records(
+        _drop_duplicates(heapq.merge(*readers, key=record_sort_key))
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Merge shard outputs into the final exports.
+
+    Args:
+        argv (Optional[List[str]], optional): The command line arguments.
+            Defaults to None, in which case ``sys.argv`` is used.
+    """
+    parser = argparse.ArgumentParser(
+        description="Merge sorted shard outputs into the final exports."
+    )
+    parser.add_argument("shards", nargs="+", help="The shard outputs.")
+    parser.add_argument(
+        "-o",
+        "--output",
+        action="append",
+        required=True,
+        help="File to export to, the format is selected from the extension. "
+        "Can be given several times.",
+    )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=None,
+        help="Number of threads writing the outputs.",
+    )
+    parser.add_argument(
+        "--profile",
+        default=None,
+        metavar="DIR",
+        help="Directory to write a profile of the merge to, logging its "
+        "hotspots.",
+    )
+    args = parser.parse_args(argv)
+
+    profiler = Profiler(args.profile)
+    sinks = [get_sink(path) for path in args.output]
+    with profiler.stage("merge"):
+        fan_out(merge_records(args.shards), sinks, max_workers=args.max_workers)
+    profiler.write()
+    logger.success(
+        "Merged %d shards to %s", len(args.shards), ", ".join(args.output)
+    )
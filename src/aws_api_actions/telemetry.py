@@ -0,0 +1,224 @@
+"""Page load telemetry from the browser's Navigation Timing API.
+
+Once a page is rendered, the browser knows how long each phase of its load
+took. The phases are collected for every page and aggregated per host into
+latency histograms and percentiles, telling whether a crawl is bound by the
+server (time to first byte), the network (DNS and connection) or the
+rendering (DOMContentLoaded and load).
+
+Phases, in milliseconds:
+    - dns: The DNS lookup.
+    - connect: The TCP and TLS connection.
+    - ttfb: From the request to the first byte of the response.
+    - dom_content_loaded: From the navigation start to DOMContentLoaded.
+    - load: From the navigation start to the end of the load event.
+
+Usage example:
+    telemetry = TimingCollector()
+    fetcher = BrowserFetcher(telemetry=telemetry)
+    ...
+    telemetry.write_report("timings.json")
+"""
+
+import json
+import math
+import threading
+from typing import Any, Dict, List, NamedTuple, Union
+from urllib.parse import urlparse
+
+from aws_api_actions.exceptions import OutputError
+from aws_api_actions.logger import logger
+
+
+NAVIGATION_TIMING_SCRIPT = "return window.performance.timing.toJSON();"
+
+PHASES = ("dns", "connect", "ttfb", "dom_content_loaded", "load")
+# Upper bounds of the histogram buckets, in milliseconds.
+HISTOGRAM_BUCKETS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+PERCENTILES = (50, 90, 99)
+
+
+class PageTiming(NamedTuple):
+    """The load phases of a page, in milliseconds."""
+
+    url: str
+    dns: float
+    connect: float
+    ttfb: float
+    dom_content_loaded: float
+    load: float
+
+    @property
+    def host(self) -> str:
+        """Returns the host the page was loaded from."""
+        return urlparse(self.url).netloc
+
+
+def _elapsed(timing: Dict[str, float], start: str, end: str) -> float:
+    """Returns the time between two marks, or 0 if either is missing."""
+    if not timing.get(start) or not timing.get(end):
+        return 0.0
+
+    return max(0.0, float(timing[end] - timing[start]))
+
+
+def parse_navigation_timing(url: str, timing: Dict[str, float]) -> PageTiming:
+    """Returns the load phases from a ``performance.timing`` object.
+
+    Args:
+        url (str): The URL of the page.
+        timing (Dict[str, float]): The ``performance.timing`` marks, in
+            milliseconds since the epoch.
+
+    Returns:
+        PageTiming: The load phases.
+    """
+    return PageTiming(
+        url=url,
+        dns=_elapsed(timing, "domainLookupStart", "domainLookupEnd"),
+        connect=_elapsed(timing, "connectStart", "connectEnd"),
+        ttfb=_elapsed(timing, "requestStart", "responseStart"),
+        dom_content_loaded=_elapsed(
+            timing, "navigationStart", "domContentLoadedEventEnd"
+        ),
+        load=_elapsed(timing, "navigationStart", "loadEventEnd"),
+    )
+
+
+def get_percentile(values: List[float], percentile: float) -> float:
+    """Returns a percentile of the values, with the nearest-rank method.
+
+    Args:
+        values (List[float]): The sorted values.
+        percentile (float): The percentile, from 0 to 100.
+
+    Returns:
+        float: The percentile, or 0 if there are no values.
+    """
+    if not values:
+        return 0.0
+
+    rank = max(1, math.ceil(percentile / 100 * len(values)))
+    return values[rank - 1]
+
+
+def get_histogram(values: List[float]) -> Dict[str, int]:
+    """Returns the number of values in each histogram bucket.
+
+    Args:
+        values (List[float]): The values, in milliseconds.
+
+    Returns:
+        Dict[str, int]: The counts keyed by the bucket upper bound, "+Inf"
+            for the values above the last bound.
+    """
+    histogram = {f"<={bound}": 0 for bound in HISTOGRAM_BUCKETS}
+    histogram["+Inf"] = 0
+    for value in values:
+        bucket = next(
+            (f"<={bound}" for bound in HISTOGRAM_BUCKETS if value <= bound),
+            "+Inf",
+        )
+        histogram[bucket] += 1
+
+    return histogram
+
+
+class TimingCollector:
+    """Thread-safe collector of the page load phases."""
+
+    def __init__(self) -> None:
+        """Initialize an empty collector."""
+        self._lock = threading.Lock()
+        self.timings: List[PageTiming] = []
+
+    def record(self, timing: PageTiming) -> None:
+        """Record the load phases of a page.
+
+        Args:
+            timing (PageTiming): The load phases.
+        """
+        with self._lock:
+            self.timings.append(timing)
+
+    def record_driver(self, driver: Any, url: str) -> None:
+        """Record the load phases of the page currently shown by a webdriver.
+
+        Telemetry never fails a fetch, so errors are only logged.
+
+        Args:
+            driver (Any): The webdriver.
+            url (str): The URL of the page.
+        """
+        try:
+            timing = driver.execute_script(NAVIGATION_TIMING_SCRIPT)
+            self.record(parse_navigation_timing(url, timing))
+        except Exception as err:
+            logger.debug("Failed to collect the timing of %s: %s", url, err)
+
+    def summary(
+        self,
+    ) -> Dict[str, Dict[str, Dict[str, Union[float, Dict[str, int]]]]]:
+        """Returns the statistics of each phase, per host.
+
+        Returns:
+            Dict[str, Dict[str, Dict[str, Union[float, Dict[str, int]]]]]:
+                For each host and phase, the count, mean, max, percentiles
+                and histogram.
+        """
+        with self._lock:
+            timings = list(self.timings)
+
+        hosts: Dict[str, List[PageTiming]] = {}
+        for timing in timings:
+            hosts.setdefault(timing.host, []).append(timing)
+
+        summary: Dict[
+            str, Dict[str, Dict[str, Union[float, Dict[str, int]]]]
+        ] = {}
+        for host, host_timings in sorted(hosts.items()):
+            summary[host] = {}
+            for phase in PHASES:
+                values = sorted(getattr(t, phase) for t in host_timings)
+                stats: Dict[str, Union[float, Dict[str, int]]] = {
+                    "count": len(values),
+                    "mean": sum(values) / len(values),
+                    "max": values[-1],
+                }
+                for percentile in PERCENTILES:
+                    stats[f"p{percentile}"] = get_percentile(values, percentile)
+                stats["histogram"] = get_histogram(values)
+                summary[host][phase] = stats
+
+        return summary
+
+    def log_summary(self) -> None:
+        """Log the median and 90th percentile of each phase, per host."""
+        for host, phases in self.summary().items():
+            logger.info(
+                "Page load timings of %s: %s",
+                host,
+                ", ".join(
+                    f"{phase} p50={stats['p50']:.0f}ms p90={stats['p90']:.0f}ms"
+                    for phase, stats in phases.items()
+                ),
+            )
+
+    def write_report(self, file_path: str) -> None:
+        """Write the per-host statistics and the page timings as json.
+
+        Args:
+            file_path (str): The path to the report file.
+
+        Raises:
+            OutputError: If the report cannot be written.
+        """
+        with self._lock:
+            pages = [timing._asdict() for timing in self.timings]
+
+        report = {"hosts": self.summary(), "pages": pages}
+        try:
+            with open(file_path, "w", encoding="utf-8") as file:
+                json.dump(report, file, indent=4)
+        except OSError as err:
+            raise OutputError(f"Failed to write {file_path}: {err}") from err
@@ -1,10 +1,21 @@
 """Module provides utility functions for system information and paths."""
 
 import os
+import shutil
 import sys
 from glob import glob
 
 
+# Executable names of Chromium and Chrome on the PATH, in order of preference.
+CHROME_BINARY_NAMES = [
+    "chromium",
+    "chromium-browser",
+    "google-chrome",
+    "google-chrome-stable",
+    "chrome",
+]
+
+
 def get_sys_arch() -> str:
     """Returns the architecture of the current OS.
 
@@ -94,7 +105,6 @@ def get_venv_path() -> str:
     return venv_path
 
 
-# TODO: Need to add a function for detecting the Chrome binary path.
 # TODO: Add argument to specify the relative or absolute path to the binary.
 def get_firefox_binary_path() -> str:
     """Returns the path to the firefox binary.
@@ -167,3 +177,54 @@ def get_firefox_binary_path() -> str:
                     break
 
     return firefox_install_dir
+
+
+def get_chrome_binary_path() -> str:
+    """Returns the path to the Chromium or Chrome binary.
+
+    Chromium is preferred to Chrome, and a binary on the PATH to the default
+    install locations.
+
+    Args:
+        None
+
+    Returns:
+        str: The path to the binary, or an empty string if none is found.
+    """
+    for name in CHROME_BINARY_NAMES:
+        binary = shutil.which(name)
+        if binary is not None:
+            return binary
+
+    if get_sys_platform() == "win":
+        win_semi_paths = [
+            "%s:\\Program Files\\Chromium\\Application\\chrome.exe",
+            "%s:\\Program Files\\Google\\Chrome\\Application\\chrome.exe",
+            "%s:\\Program Files (x86)\\Google\\Chrome\\Application\\chrome.exe",
+        ]
+        candidates = [
+            semi_path % letter
+            for letter in "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+            if os.path.exists(f"{letter}:")
+            for semi_path in win_semi_paths
+        ]
+
+    elif get_sys_platform() == "macos":
+        candidates = [
+            "/Applications/Chromium.app/Contents/MacOS/Chromium",
+            "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+        ]
+
+    else:
+        candidates = [
+            "/usr/lib/chromium/chromium",
+            "/usr/lib64/chromium-browser/chromium-browser",
+            "/snap/bin/chromium",
+            "/opt/google/chrome/chrome",
+        ]
+
+    for candidate in candidates:
+        if os.path.isfile(candidate):
+            return candidate
+
+    return ""
@@ -0,0 +1,101 @@
+"""Test for the binary catalog format."""
+
+import struct
+from pathlib import Path
+
+import pytest
+
+from aws_api_actions.binary_catalog import HEADER, BinaryCatalog
+from aws_api_actions.exceptions import OutputError, ParsingError
+from aws_api_actions.exporter import output_to_binary
+from aws_api_actions.loader import load_from_file
+
+
+DATA = {
+    "s3": {"actions": ["PutObject", "GetObject", "DeleteObject", "GetObject"]},
+    "ec2": {
+        "actions": ["RunInstances", "DescribeInstances"],
+        "resource_types": ["instance"],
+    },
+    "übung": {"actions": ["Äpfel", "Zebra", "apfel"]},
+}
+
+
+def test_binary_catalog_lookups(tmp_path: Path) -> None:
+    """Test the lookups of a memory-mapped catalog."""
+    file_path = str(tmp_path / "actions.bin")
+    output_to_binary(file_path, DATA)
+
+    with BinaryCatalog(file_path) as catalog:
+        assert catalog.services() == ["ec2", "s3", "übung"]
+        assert catalog.has_service("ec2")
+        assert not catalog.has_service("iam")
+        assert catalog.categories("ec2") == ["actions", "resource_types"]
+        assert catalog.values("s3", "actions") == [
+            "DeleteObject",
+            "GetObject",
+            "GetObject",
+            "PutObject",
+        ]
+        assert catalog.has_value("s3", "actions", "GetObject")
+        assert catalog.has_value("übung", "actions", "Äpfel")
+        assert not catalog.has_value("s3", "actions", "ListBucket")
+        assert not catalog.has_value("iam", "actions", "GetObject")
+        assert catalog.values("s3", "resource_types") == []
+
+
+def test_binary_catalog_round_trip(tmp_path: Path) -> None:
+    """Test that a binary catalog can be loaded back."""
+    file_path = str(tmp_path / "actions.bin")
+    output_to_binary(file_path, DATA)
+
+    assert load_from_file(file_path) == {
+        service: {
+            category: sorted(values) for category, values in categories.items()
+        }
+        for service, categories in DATA.items()
+    }
+
+
+def test_binary_catalog_errors(tmp_path: Path) -> None:
+    """Test that invalid catalogs are rejected."""
+    with pytest.raises(OutputError):
+        output_to_binary(str(tmp_path / "actions.bin.gz"), DATA)
+
+    file_path = tmp_path / "actions.bin"
+    file_path.write_bytes(b"not a catalog at all")
+    with pytest.raises(ParsingError):
+        BinaryCatalog(str(file_path))
+
+
+def test_binary_catalog_truncated(tmp_path: Path) -> None:
+    """Test that a truncated catalog is rejected instead of misread."""
+    file_path = tmp_path / "actions.bin"
+    output_to_binary(str(file_path), DATA)
+    file_path.write_bytes(file_path.read_bytes()[:40])
+
+    with pytest.raises(ParsingError):
+        BinaryCatalog(str(file_path))
+
+
+def test_binary_catalog_corrupt_children(tmp_path: Path) -> None:
+    """Test that child ranges outside of their table are rejected."""
+    file_path = tmp_path / "actions.bin"
+    output_to_binary(str(file_path), DATA)
+    contents = bytearray(file_path.read_bytes())
+    # The child count of the first service record.
+    struct.pack_into("<I", contents, HEADER.size + 12, 1000)
+    file_path.write_bytes(bytes(contents))
+
+    with BinaryCatalog(str(file_path)) as catalog:
+        service = catalog.services()[0]
+        with pytest.raises(ParsingError):
+            catalog.categories(service)
+        with pytest.raises(ParsingError):
+            catalog.has_value(service, "actions", "GetObject")
+
+
+def test_load_compressed_binary_catalog(tmp_path: Path) -> None:
+    """Test that loading a compressed catalog raises a ParsingError."""
+    with pytest.raises(ParsingError):
+        load_from_file(str(tmp_path / "actions.bin.gz"))
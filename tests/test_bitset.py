@@ -0,0 +1,99 @@
+"""Test for the bitset-encoded permission sets."""
+
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from aws_api_actions.bitset import ActionIndex
+from aws_api_actions.exceptions import ParsingError
+
+
+DATA: Dict[str, Dict[str, List[str]]] = {
+    "s3": {
+        "actions": ["PutObject", "GetObject", "GetBucketPolicy"],
+        "access_level:write": ["PutObject"],
+        "access_level:read": ["GetObject", "GetBucketPolicy"],
+    },
+    "ec2": {
+        "actions": ["DescribeInstances", "RunInstances"],
+        "access_level:write": ["RunInstances"],
+    },
+    "iam": {},
+}
+
+
+def test_action_index_ids_are_stable(tmp_path: Path) -> None:
+    """Test that IDs survive updates, removals and a save and load."""
+    index = ActionIndex()
+    assert index.update(DATA) == 5
+    assert index.actions[0] == "ec2:DescribeInstances"
+
+    index_path = str(tmp_path / "actions.idx.json.gz")
+    index.save(index_path)
+    loaded = ActionIndex.load(index_path)
+    grown = {"ec2": DATA["ec2"], "lambda": {"actions": ["InvokeFunction"]}}
+
+    assert loaded.update(grown) == 1
+    assert loaded.actions[:5] == index.actions
+    assert loaded.get_id("lambda:invokefunction") == 5
+    assert "S3:GETOBJECT" in loaded and "s3:Nope" not in loaded
+
+
+def test_permission_set_algebra() -> None:
+    """Test the set operations, the population counts and the iteration."""
+    index = ActionIndex()
+    index.update(DATA)
+
+    granted = index.from_patterns(["s3:Get*", "ec2:*"])
+    used = index.from_actions(["s3:getobject", "ec2:RunInstances", "x:Y"])
+    writes = index.from_category(DATA, "access_level:write")
+
+    assert len(granted) == 4 and len(index.universe()) == 5
+    assert list(granted - used) == [
+        "ec2:DescribeInstances",
+        "s3:GetBucketPolicy",
+    ]
+    assert set(granted & writes) == {"ec2:RunInstances"}
+    assert granted | writes == index.universe()
+    assert list(granted ^ index.universe()) == ["s3:PutObject"]
+    assert used <= granted and granted >= used and not granted <= used
+    assert "s3:GetObject" in used and "s3:PutObject" not in used
+    assert not index.empty() and index.from_patterns(["*"]) == index.universe()
+
+    with pytest.raises(ValueError):
+        granted | ActionIndex(index.actions).universe()
+
+
+def test_permission_set_from_policy() -> None:
+    """Test the actions allowed by a policy document."""
+    index = ActionIndex()
+    index.update(DATA)
+    policy = {
+        "Statement": [
+            {"Effect": "Allow", "Action": ["s3:*", "ec2:Describe*"]},
+            {"Effect": "Deny", "Action": "s3:PutObject"},
+            {
+                "Effect": "Deny",
+                "Action": "s3:Get*",
+                "Condition": {"Bool": {"aws:SecureTransport": "false"}},
+            },
+            {"Effect": "Allow", "NotAction": ["s3:*", "ec2:Describe*"]},
+        ]
+    }
+
+    assert list(index.from_policy(policy)) == [
+        "ec2:DescribeInstances",
+        "ec2:RunInstances",
+        "s3:GetBucketPolicy",
+        "s3:GetObject",
+    ]
+
+    invalid: List[Dict[str, Any]] = [
+        {"Statement": "s3:*"},
+        {"Statement": {"Effect": "Allow", "Action": 1}},
+        {"Statement": {"Effect": "Allow", "Action": "s3"}},
+    ]
+    for document in invalid:
+        with pytest.raises(ParsingError):
+            index.from_policy(document)
@@ -0,0 +1,98 @@
+"""Test for the browser backends and the chromedriver management."""
+
+import zipfile
+from io import BytesIO
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from aws_api_actions import browser, chromedriver, utilities
+
+
+class _FakeDriver:
+    """Webdriver recording its options."""
+
+    def __init__(self, options: Any, service: Any) -> None:
+        """Record the options and the driver binary."""
+        self.options = options
+        self.service = service
+
+
+def test_setup_chromium_webdriver(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the user data directory and binary are passed to Chromium."""
+    monkeypatch.setattr("aws_api_actions.browser.webdriver.Chrome", _FakeDriver)
+
+    driver = browser.setup_chromium_webdriver(
+        "chromedriver", "chromium", ["--headless=new"], profile_path="/profile"
+    )
+
+    assert driver.options.arguments == [
+        "--headless=new",
+        "--user-data-dir=/profile",
+    ]
+    assert driver.options.binary_location == "chromium"
+    assert driver.service.path == "chromedriver"
+
+
+def test_get_browser_backend(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the default webdriver is started by the selected backend."""
+    monkeypatch.setattr("aws_api_actions.browser.webdriver.Chrome", _FakeDriver)
+    monkeypatch.setattr(
+        browser, "get_chrome_binary_path", lambda: "/usr/bin/chromium"
+    )
+
+    driver = browser.setup_default_webdriver(backend="Chromium")
+
+    assert driver.options.arguments == browser.DEFAULT_CHROMIUM_OPTIONS
+    assert isinstance(browser.get_browser_backend(), browser.FirefoxBackend)
+    with pytest.raises(ValueError):
+        browser.get_browser_backend("netscape")
+
+
+def test_get_chrome_binary_path(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that Chromium is preferred to Chrome on the PATH."""
+    found = {"google-chrome": "/usr/bin/google-chrome"}
+    monkeypatch.setattr("shutil.which", found.get)
+    assert utilities.get_chrome_binary_path() == "/usr/bin/google-chrome"
+
+    found["chromium"] = "/usr/bin/chromium"
+    assert utilities.get_chrome_binary_path() == "/usr/bin/chromium"
+
+
+def test_extract_chromedriver(tmp_path: Path) -> None:
+    """Test that the binary is extracted out of its platform directory."""
+    archive = BytesIO()
+    with zipfile.ZipFile(archive, "w") as zip_ref:
+        zip_ref.writestr("chromedriver-linux64/LICENSE.chromedriver", "")
+        zip_ref.writestr("chromedriver-linux64/chromedriver", "binary")
+    binary_path = tmp_path / "chromedriver"
+
+    chromedriver.extract_chromedriver(archive, str(binary_path))
+
+    assert binary_path.read_text() == "binary"
+    with pytest.raises(zipfile.BadZipFile):
+        chromedriver.extract_chromedriver(
+            BytesIO(archive.getvalue()), str(tmp_path / "geckodriver")
+        )
+
+
+@pytest.mark.skipif(
+    utilities.get_sys_platform() == "win", reason="Runs a shell script"
+)
+def test_chromedriver_version(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that the driver installed matches the browser milestone."""
+    binary = tmp_path / "chromium"
+    binary.write_text("#!/bin/sh\necho 'Chromium 126.0.6478.126 snap'\n")
+    binary.chmod(0o755)
+    monkeypatch.setattr(chromedriver, "get_sys_platform", lambda: "linux")
+    monkeypatch.setattr(chromedriver, "get_sys_arch", lambda: "64")
+
+    assert chromedriver.get_browser_milestone(str(binary)) == "126"
+    assert chromedriver.get_browser_milestone(str(tmp_path / "none")) is None
+    assert chromedriver.get_version_download_url("126.0.6478.126") == (
+        "https://storage.googleapis.com/chrome-for-testing-public/"
+        "126.0.6478.126/linux64/chromedriver-linux64.zip"
+    )
@@ -0,0 +1,168 @@
+"""Test for the least-privilege analysis of CloudTrail logs."""
+
+import gzip
+import io
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from aws_api_actions import cloudtrail
+from aws_api_actions.bitset import ActionIndex
+from aws_api_actions.exceptions import ParsingError
+from aws_api_actions.exporter import output_to_json
+
+
+ROLE = "arn:aws:iam::123456789012:role/app"
+USER = "arn:aws:iam::123456789012:user/alice"
+ROLE_SESSION = {
+    "type": "AssumedRole",
+    "arn": "arn:aws:sts::123456789012:assumed-role/app/session",
+    "sessionContext": {"sessionIssuer": {"type": "Role", "arn": ROLE}},
+}
+EVENTS: List[Dict[str, Any]] = [
+    {
+        "eventSource": "s3.amazonaws.com",
+        "eventName": "GetObject",
+        "userIdentity": ROLE_SESSION,
+    },
+    {
+        "eventSource": "lambda.amazonaws.com",
+        "eventName": "GetFunction20150331v2",
+        "userIdentity": ROLE_SESSION,
+    },
+    {
+        "eventSource": "s3.amazonaws.com",
+        "eventName": "PutObject",
+        "errorCode": "AccessDenied",
+        "userIdentity": ROLE_SESSION,
+    },
+    {
+        "eventSource": "monitoring.amazonaws.com",
+        "eventName": "PutMetricData",
+        "userIdentity": {"type": "IAMUser", "arn": USER},
+    },
+]
+
+
+def _write_log(file_path: Path, events: List[Dict[str, Any]]) -> None:
+    """Write a gzipped CloudTrail log file."""
+    with gzip.open(file_path, "wt", encoding="utf-8") as file:
+        json.dump({"Records": events}, file, indent=2)
+
+
+class _CountingFile(io.StringIO):
+    """Text file counting its reads."""
+
+    reads = 0
+
+    def read(self, size: Optional[int] = -1) -> str:
+        """Read and count."""
+        self.reads += 1
+        return super().read(size)
+
+
+def test_iter_cloudtrail_events(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that events split across chunks are decoded, and truncation."""
+    monkeypatch.setattr(cloudtrail, "CHUNK_SIZE", 7)
+    log_path = tmp_path / "log.json.gz"
+    _write_log(log_path, EVENTS)
+
+    assert list(cloudtrail.iter_cloudtrail_events(str(log_path))) == EVENTS
+
+    data = gzip.decompress(log_path.read_bytes())
+    truncated = tmp_path / "truncated.json"
+    truncated.write_bytes(data[: len(data) // 2])
+    with pytest.raises(ParsingError):
+        list(cloudtrail.iter_cloudtrail_events(str(truncated)))
+
+
+def test_iter_cloudtrail_events_malformed(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that a malformed event fails at once, without reading the rest."""
+    monkeypatch.setattr(cloudtrail, "CHUNK_SIZE", 64)
+    events = ",".join(json.dumps(event) for event in EVENTS * 100)
+    file = _CountingFile(f'{{"Records": [{{"eventName": x}}, {events}]}}')
+    monkeypatch.setattr(cloudtrail, "open_compressed", lambda path: file)
+
+    with pytest.raises(ParsingError, match="Invalid event"):
+        list(cloudtrail.iter_cloudtrail_events("log.json"))
+
+    assert file.reads == 1
+
+
+def test_load_grants_corrupt(tmp_path: Path) -> None:
+    """Test that a corrupt compressed policies file is a ParsingError."""
+    policies_path = tmp_path / "policies.json.gz"
+    policies_path.write_bytes(gzip.compress(b'{"a": []}')[:-8] + b"garbage!")
+
+    with pytest.raises(ParsingError):
+        cloudtrail.load_grants(str(policies_path), ActionIndex())
+
+
+def test_event_action_and_principal() -> None:
+    """Test the mapping of the events to actions and principals."""
+    actions = [cloudtrail.get_event_action(event) for event in EVENTS]
+    principals = [cloudtrail.get_principal(event) for event in EVENTS]
+
+    assert actions == [
+        "s3:GetObject",
+        "lambda:GetFunction",
+        "s3:PutObject",
+        "cloudwatch:PutMetricData",
+    ]
+    assert principals == [ROLE, ROLE, ROLE, USER]
+    assert cloudtrail.get_event_action({"eventName": "Get"}) is None
+
+
+def test_cloudtrail_main(tmp_path: Path) -> None:
+    """Test the report of the used and granted actions of each principal."""
+    catalog = str(tmp_path / "actions.json")
+    output_to_json(
+        catalog,
+        {
+            "s3": {"actions": ["GetObject", "PutObject", "DeleteObject"]},
+            "lambda": {"actions": ["GetFunction"]},
+        },
+    )
+    policies = tmp_path / "policies.json"
+    policies.write_text(
+        json.dumps(
+            {ROLE: [{"Statement": {"Effect": "Allow", "Action": "s3:*"}}]}
+        )
+    )
+    logs = tmp_path / "logs" / "2024" / "01"
+    logs.mkdir(parents=True)
+    _write_log(logs / "a.json.gz", EVENTS[:2])
+    _write_log(logs / "b.json.gz", EVENTS[2:])
+    (logs / "corrupt.json.gz").write_bytes(b"not gzip")
+    report_path = tmp_path / "report.json"
+
+    cloudtrail.main(
+        [
+            str(tmp_path / "logs"),
+            "--catalog",
+            catalog,
+            "--policies",
+            str(policies),
+            "--index",
+            str(tmp_path / "actions.idx.json"),
+            "--workers",
+            "2",
+            "--report",
+            str(report_path),
+        ]
+    )
+
+    report = json.loads(report_path.read_text())
+    assert report[ROLE] == {
+        "used": 2,
+        "granted": 3,
+        "unused": ["s3:DeleteObject", "s3:PutObject"],
+        "not_granted": ["lambda:GetFunction"],
+    }
+    assert report[USER]["not_granted"] == ["cloudwatch:PutMetricData"]
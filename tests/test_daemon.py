@@ -0,0 +1,108 @@
+"""Test for the resident scraper daemon."""
+
+import os
+import socket
+import threading
+import time
+from pathlib import Path
+from typing import Callable, List
+
+from aws_api_actions.daemon import ControlServer, FetcherPool, ScrapeDaemon
+from aws_api_actions.fetcher import Fetcher, HttpFetcher
+from aws_api_actions.loader import load_from_file
+from aws_api_actions.mock_server import MockDocsServer, generate_catalog
+
+
+def _wait_for(condition: Callable[[], bool], timeout: float = 30) -> None:
+    """Wait until the condition is met."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def _send(socket_path: str, command: str) -> str:
+    """Send a command to the control socket, returning the reply."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(socket_path)
+        client.sendall(f"{command}\n".encode("utf-8"))
+        return client.makefile().readline().strip()
+
+
+def test_fetcher_pool_reuses_fetchers() -> None:
+    """Test that closed fetchers return to the pool until it is closed."""
+    created: List[HttpFetcher] = []
+
+    def factory() -> Fetcher:
+        created.append(HttpFetcher())
+        return created[-1]
+
+    pool = FetcherPool(factory)
+    with pool.acquire(), pool.acquire():
+        pass
+    with pool.acquire():
+        pass
+
+    assert len(created) == 2
+    pool.close()
+    assert pool.fetchers == []
+
+
+def test_rebuild_swaps_outputs(tmp_path: Path) -> None:
+    """Test that rebuilds swap complete exports in, and keep them on error."""
+    catalog = generate_catalog(5, 3)
+    outputs = [str(tmp_path / "actions.json"), str(tmp_path / "a.csv.gz")]
+
+    with MockDocsServer(catalog) as server:
+        daemon = ScrapeDaemon(
+            outputs,
+            lambda: HttpFetcher(retries=0),
+            index_url=server.url,
+            fetch_workers=2,
+            parse_workers=1,
+        )
+        try:
+            assert daemon.rebuild().swapped
+            first = [os.stat(path).st_mtime_ns for path in outputs]
+            server.throttle = 1.0
+            result = daemon.rebuild()
+        finally:
+            daemon.close()
+
+    assert not result.swapped and result.error is not None
+    assert [os.stat(path).st_mtime_ns for path in outputs] == first
+    assert sorted(os.listdir(tmp_path)) == ["a.csv.gz", "actions.json"]
+    data = load_from_file(outputs[0])
+    assert {prefix: data[prefix]["actions"] for prefix in data} == catalog
+    assert len(daemon.pool.fetchers) == 0
+
+
+def test_daemon_control_socket(tmp_path: Path) -> None:
+    """Test the rebuilds on demand and the status of the control socket."""
+    socket_path = str(tmp_path / "daemon.sock")
+
+    with MockDocsServer(generate_catalog(2, 2)) as server:
+        daemon = ScrapeDaemon(
+            [str(tmp_path / "actions.json")],
+            HttpFetcher,
+            index_url=server.url,
+            interval=None,
+            fetch_workers=1,
+            parse_workers=1,
+        )
+        control = ControlServer(socket_path, daemon).start()
+        thread = threading.Thread(target=daemon.serve_forever)
+        thread.start()
+        try:
+            _wait_for(lambda: daemon.last_build is not None)
+            first = daemon.last_build
+            assert _send(socket_path, "rebuild") == "queued"
+            _wait_for(lambda: daemon.last_build is not first)
+            assert '"services": 2' in _send(socket_path, "status")
+            assert _send(socket_path, "help").startswith("unknown command")
+        finally:
+            daemon.stop()
+            thread.join()
+            control.stop()
+
+    assert not os.path.exists(socket_path)
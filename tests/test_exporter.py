@@ -0,0 +1,257 @@
+"""Test for the exporters and their matching loaders."""
+
+import gzip
+import json
+import os
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+import pytest
+
+from aws_api_actions.compression import get_compression
+from aws_api_actions.exceptions import OutputError, ParsingError
+from aws_api_actions.exporter import (
+    Record,
+    Sink,
+    fan_out,
+    get_sink,
+    iter_records,
+    output_to_csv,
+    output_to_json,
+    output_to_text,
+    output_to_xml,
+    sort_data,
+)
+from aws_api_actions.loader import load_from_csv, load_from_file
+
+
+DATA = {
+    "ec2": {
+        "actions": ["DescribeInstances", "RunInstances"],
+        "resource_types": ["instance"],
+    },
+    "s3": {
+        "actions": ["GetObject", "Put<Object> & more"],
+        "condition_keys": [],
+    },
+    "iam": {},
+}
+
+
+@pytest.mark.parametrize(
+    "exporter,filename",
+    [
+        (output_to_text, "actions.txt"),
+        (output_to_json, "actions.json"),
+        (output_to_csv, "actions.csv"),
+        (output_to_xml, "actions.xml"),
+        (output_to_text, "actions.txt.gz"),
+        (output_to_json, "actions.json.gz"),
+        (output_to_csv, "actions.csv.gz"),
+        (output_to_xml, "actions.xml.gz"),
+        (output_to_text, "actions.txt.zst"),
+        (output_to_json, "actions.json.zst"),
+        (output_to_csv, "actions.csv.zst"),
+        (output_to_xml, "actions.xml.zst"),
+    ],
+)
+def test_export_round_trip(
+    tmp_path: Path,
+    exporter: Callable[[str, Dict[str, Dict[str, List[str]]]], None],
+    filename: str,
+) -> None:
+    """Test that every exporter can be loaded back, compressed or not."""
+    if filename.endswith(".zst"):
+        pytest.importorskip("zstandard")
+
+    file_path = str(tmp_path / filename)
+    exporter(file_path, DATA)
+
+    assert load_from_file(file_path) == DATA
+
+
+def test_export_gzip_is_compressed(tmp_path: Path) -> None:
+    """Test that the .gz extension writes a gzip stream."""
+    file_path = tmp_path / "actions.json.gz"
+    output_to_json(str(file_path), DATA)
+
+    with gzip.open(file_path, "rt", encoding="utf-8") as file:
+        assert "DescribeInstances" in file.read()
+
+
+@pytest.mark.parametrize("compression", ["gzip", "zstd", "none"])
+def test_export_explicit_compression(tmp_path: Path, compression: str) -> None:
+    """Test the explicit compression argument, regardless of the extension."""
+    if compression == "zstd":
+        pytest.importorskip("zstandard")
+
+    file_path = str(tmp_path / "actions.data")
+    output_to_csv(file_path, DATA, compression=compression)
+
+    assert load_from_csv(file_path, compression=compression) == DATA
+
+
+def test_load_mislabelled_compression(tmp_path: Path) -> None:
+    """Test that data in an unexpected codec raises a ParsingError."""
+    file_path = str(tmp_path / "actions.json")
+    output_to_json(file_path, DATA, compression="gzip")
+
+    with pytest.raises(ParsingError):
+        load_from_file(file_path)
+
+    truncated = tmp_path / "actions.json.gz"
+    truncated.write_bytes(gzip.compress(b'{"s3": {}}')[:-8])
+    with pytest.raises(ParsingError):
+        load_from_file(str(truncated))
+
+
+def test_get_compression() -> None:
+    """Test the compression codec selection."""
+    assert get_compression("actions.json") == "none"
+    assert get_compression("actions.json.gz") == "gzip"
+    assert get_compression("actions.json.zst") == "zstd"
+    assert get_compression("actions.json", "GZIP") == "gzip"
+
+    with pytest.raises(OutputError):
+        get_compression("actions.json", "brotli")
+
+
+@pytest.mark.parametrize("max_workers", [None, 2, 8])
+def test_fan_out(tmp_path: Path, max_workers: Optional[int]) -> None:
+    """Test that a single pass writes every format."""
+    paths = [
+        str(tmp_path / name)
+        for name in ("actions.txt", "actions.json.gz", "actions.csv", "a.xml")
+    ]
+    fan_out(
+        iter_records(DATA),
+        [get_sink(path) for path in paths],
+        max_workers=max_workers,
+    )
+
+    for path in paths:
+        assert load_from_file(path) == DATA
+
+
+def test_json_sink_matches_json_dump(tmp_path: Path) -> None:
+    """Test that the streaming json sink writes the sorted json.dump document."""
+    file_path = tmp_path / "actions.json"
+    output_to_json(str(file_path), DATA)
+
+    expected = json.dumps(DATA, indent=4, sort_keys=True) + "\n"
+    assert file_path.read_text() == expected
+
+
+@pytest.mark.parametrize(
+    "filename",
+    ["actions.txt", "actions.json.gz", "actions.csv", "actions.xml", "a.bin"],
+)
+def test_unchanged_export_is_kept(tmp_path: Path, filename: str) -> None:
+    """Test that exporting the same data again leaves the file untouched."""
+    file_path = tmp_path / filename
+    fan_out(iter_records(sort_data(DATA)), [get_sink(str(file_path))])
+    contents = file_path.read_bytes()
+    os.utime(file_path, (0, 0))
+
+    # The same data in another order exports to the same bytes.
+    shuffled = {key: DATA[key] for key in reversed(list(DATA))}
+    sink = get_sink(str(file_path))
+    fan_out(iter_records(sort_data(shuffled)), [sink])
+
+    assert sink.changed is False
+    assert file_path.stat().st_mtime == 0
+    assert file_path.read_bytes() == contents
+    assert os.listdir(tmp_path) == [filename]
+
+
+def test_changed_export_is_replaced(tmp_path: Path) -> None:
+    """Test that an export with new contents replaces the file."""
+    file_path = tmp_path / "actions.json.gz"
+    output_to_json(str(file_path), DATA)
+    file_path.chmod(0o640)
+    os.utime(file_path, (0, 0))
+
+    data = {**DATA, "sqs": {"actions": ["SendMessage"]}}
+    output_to_json(str(file_path), data)
+
+    assert file_path.stat().st_mtime != 0
+    assert file_path.stat().st_mode & 0o777 == 0o640
+    assert load_from_file(str(file_path)) == data
+    assert os.listdir(tmp_path) == ["actions.json.gz"]
+
+
+def test_gzip_export_is_reproducible(tmp_path: Path) -> None:
+    """Test that gzip exports don't depend on the time or the file name."""
+    first, second = tmp_path / "a.json.gz", tmp_path / "b.json.gz"
+    output_to_json(str(first), DATA)
+    output_to_json(str(second), DATA)
+
+    assert first.read_bytes() == second.read_bytes()
+
+
+def test_failed_export_keeps_file(tmp_path: Path) -> None:
+    """Test that a failed export leaves the previous file in place."""
+    file_path = tmp_path / "actions.csv"
+    output_to_csv(str(file_path), DATA)
+    contents = file_path.read_bytes()
+
+    with pytest.raises(RuntimeError):
+        with get_sink(str(file_path)) as sink:
+            sink.write(("sqs", "actions", "SendMessage"))
+            raise RuntimeError("interrupted")
+
+    assert file_path.read_bytes() == contents
+    assert os.listdir(tmp_path) == ["actions.csv"]
+
+
+def test_get_sink_unsupported() -> None:
+    """Test that unknown file formats are rejected."""
+    with pytest.raises(OutputError):
+        get_sink("actions.yaml")
+
+
+def _failing_records() -> Iterator[Record]:
+    """Yield a single record, then fail."""
+    yield "s3", "actions", "GetObject"
+    raise RuntimeError("Scraping failed")
+
+
+@pytest.mark.parametrize("max_workers", [None, 2])
+def test_fan_out_failing_records(
+    tmp_path: Path, max_workers: Optional[int]
+) -> None:
+    """Test that failing records leave no partial output behind."""
+    paths = [str(tmp_path / name) for name in ("a.json", "a.xml", "a.bin")]
+
+    with pytest.raises(OutputError):
+        fan_out(
+            _failing_records(),
+            [get_sink(path) for path in paths],
+            max_workers=max_workers,
+        )
+
+    assert list(tmp_path.iterdir()) == []
+
+
+class _FailingSink(Sink):
+    """Sink failing on the first value."""
+
+    def write_value(self, value: str) -> None:
+        """Fail to write the value."""
+        raise RuntimeError("Disk full")
+
+
+@pytest.mark.parametrize("max_workers", [None, 2])
+def test_fan_out_failing_sink(
+    tmp_path: Path, max_workers: Optional[int]
+) -> None:
+    """Test that a failing sink raises an OutputError and is aborted."""
+    sinks = [
+        get_sink(str(tmp_path / "actions.json")),
+        _FailingSink(str(tmp_path / "actions.txt")),
+    ]
+
+    with pytest.raises(OutputError):
+        fan_out(iter_records(DATA), sinks, max_workers=max_workers)
+
+    assert not (tmp_path / "actions.txt").exists()
@@ -0,0 +1,220 @@
+"""Test for the page fetchers."""
+
+import threading
+from typing import Any, Dict, List, Optional
+
+from aws_api_actions.exceptions import ScrapingError
+from aws_api_actions.fetcher import (
+    LOADED_SCRIPT,
+    NAVIGATE_SCRIPT,
+    BrowserFetcher,
+    Fetcher,
+    HybridFetcher,
+    SharedFetcher,
+    get_url_pattern,
+    has_action_content,
+)
+
+
+STATIC_PAGE = "<h2>Actions defined by Amazon S3</h2>"
+RENDERED_PAGE = "<h2>Actions defined by AWS Lambda</h2>"
+SHELL_PAGE = "<div id='root'></div>"
+
+
+class _FakeFetcher(Fetcher):
+    """Fetcher serving canned pages and recording the fetched URLs."""
+
+    def __init__(self, pages: Dict[str, str]) -> None:
+        """Initialize the fetcher with the pages to serve."""
+        self.pages = pages
+        self.fetched: List[str] = []
+        self.closed = False
+
+    def fetch(self, url: str) -> str:
+        """Return the canned page."""
+        self.fetched.append(url)
+        return self.pages[url]
+
+    def close(self) -> None:
+        """Record that the fetcher was closed."""
+        self.closed = True
+
+
+def test_get_url_pattern() -> None:
+    """Test that pages of the same directory share a pattern."""
+    assert get_url_pattern("https://docs.aws.amazon.com/a/b/list_s3.html") == (
+        "docs.aws.amazon.com/a/b"
+    )
+
+
+def test_hybrid_fetcher_prefers_http() -> None:
+    """Test that static pages never start the browser."""
+    url = "https://docs.aws.amazon.com/static/list_s3.html"
+    http = _FakeFetcher({url: STATIC_PAGE})
+    browser = _FakeFetcher({})
+
+    with HybridFetcher(http, browser) as fetcher:
+        assert fetcher.fetch(url) == STATIC_PAGE
+
+    assert browser.fetched == []
+    assert http.closed and browser.closed
+
+
+def test_hybrid_fetcher_escalates_and_remembers() -> None:
+    """Test that rendered pages escalate, and their pattern skips HTTP."""
+    first = "https://docs.aws.amazon.com/rendered/list_lambda.html"
+    second = "https://docs.aws.amazon.com/rendered/list_sqs.html"
+    http = _FakeFetcher({first: SHELL_PAGE, second: SHELL_PAGE})
+    browser = _FakeFetcher({first: RENDERED_PAGE, second: RENDERED_PAGE})
+
+    fetcher = HybridFetcher(http, browser)
+    assert fetcher.fetch(first) == RENDERED_PAGE
+    assert fetcher.fetch(second) == RENDERED_PAGE
+
+    assert http.fetched == [first]
+    assert browser.fetched == [first, second]
+    assert has_action_content(RENDERED_PAGE)
+
+
+class _FakeTabDriver:
+    """Webdriver whose tabs load each page after a number of polls."""
+
+    def __init__(self, polls: Dict[str, Optional[int]]) -> None:
+        """Initialize the webdriver with the polls each page needs.
+
+        A page needing None polls never finishes loading.
+        """
+        self.polls = polls
+        self.tabs: Dict[str, List[Any]] = {"tab-0": [None, 0]}
+        self.current_window_handle = "tab-0"
+        self.max_loading = 0
+        self.switch_to = self
+
+    def window(self, handle: str) -> None:
+        """Switch to a tab."""
+        self.current_window_handle = handle
+
+    def new_window(self, kind: str) -> None:
+        """Open a tab and switch to it."""
+        self.current_window_handle = f"tab-{len(self.tabs)}"
+        self.tabs[self.current_window_handle] = [None, 0]
+
+    def close(self) -> None:
+        """Close the current tab."""
+        del self.tabs[self.current_window_handle]
+
+    def execute_script(self, script: str, *args: str) -> Any:
+        """Navigate the current tab, or check whether its page is loaded."""
+        tab = self.tabs[self.current_window_handle]
+        if script == NAVIGATE_SCRIPT:
+            tab[:] = [args[0], self.polls[args[0]]]
+            self.max_loading = max(
+                self.max_loading,
+                sum(
+                    polls is None or polls > 0
+                    for _, polls in self.tabs.values()
+                ),
+            )
+        elif script == LOADED_SCRIPT:
+            if tab[1] is None:
+                return False
+            tab[1] -= 1
+            return tab[1] <= 0
+        return None
+
+    @property
+    def page_source(self) -> str:
+        """Return the page of the current tab."""
+        return f"page {self.tabs[self.current_window_handle][0]}"
+
+    def quit(self) -> None:
+        """Quit the browser."""
+        self.tabs = {}
+
+
+def test_browser_fetcher_tabs() -> None:
+    """Test that pages load concurrently in tabs and finish in any order."""
+    polls: Dict[str, Optional[int]] = {"slow": 4, "a": 1, "b": 1, "c": 2}
+    driver = _FakeTabDriver(polls)
+    fetcher = BrowserFetcher(lambda: driver, tabs=3)
+
+    results = list(fetcher.fetch_many(["slow", "a", "b", "c"]))
+
+    assert sorted(results) == [(url, f"page {url}") for url in sorted(polls)]
+    assert results[-1] == ("slow", "page slow")
+    assert driver.max_loading == 3
+    assert list(driver.tabs) == ["tab-0"]
+
+
+def test_browser_fetcher_tab_timeout() -> None:
+    """Test that a page never loading yields an error, not the others."""
+    driver = _FakeTabDriver({"hung": None, "a": 1})
+    fetcher = BrowserFetcher(lambda: driver, tabs=2, timeout=0)
+
+    results = dict(fetcher.fetch_many(["hung", "a"]))
+
+    assert isinstance(results["hung"], ScrapingError)
+    assert results["a"] == "page a"
+
+
+def test_hybrid_fetcher_fetch_many() -> None:
+    """Test that pages needing the browser are fetched after the others."""
+    static = "https://docs.aws.amazon.com/static/list_s3.html"
+    rendered = "https://docs.aws.amazon.com/rendered/list_lambda.html"
+    http = _FakeFetcher({static: STATIC_PAGE, rendered: SHELL_PAGE})
+    browser = _FakeFetcher({rendered: RENDERED_PAGE})
+
+    fetcher = HybridFetcher(http, browser)
+    results = list(fetcher.fetch_many([rendered, static]))
+
+    assert results == [(static, STATIC_PAGE), (rendered, RENDERED_PAGE)]
+    assert fetcher.strategies == {
+        "docs.aws.amazon.com/static": "http",
+        "docs.aws.amazon.com/rendered": "browser",
+    }
+
+
+def test_shared_fetcher_batches_threads() -> None:
+    """Test that fetch threads share one browser, loading pages in its tabs."""
+    urls = [f"https://docs.aws.amazon.com/rendered/{i}.html" for i in range(8)]
+    driver = _FakeTabDriver({url: 5 for url in urls})
+    drivers: List[_FakeTabDriver] = []
+
+    def driver_factory() -> _FakeTabDriver:
+        drivers.append(driver)
+        return driver
+
+    shared = SharedFetcher(BrowserFetcher(driver_factory, tabs=4), 4)
+    results: Dict[str, Any] = {}
+
+    def fetch_thread(thread_urls: List[str]) -> None:
+        http = _FakeFetcher({url: SHELL_PAGE for url in thread_urls})
+        with HybridFetcher(http, shared.borrow()) as fetcher:
+            for url in thread_urls:
+                results.update(fetcher.fetch_many([url]))
+
+    threads = [
+        threading.Thread(target=fetch_thread, args=(urls[i::4],))
+        for i in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == {url: f"page {url}" for url in urls}
+    assert len(drivers) == 1
+    assert driver.max_loading > 1
+
+    shared.close()
+    assert driver.tabs == {}
+
+
+def test_hybrid_fetcher_fetch_static() -> None:
+    """Test that a static page without actions never starts the browser."""
+    url = "https://docs.aws.amazon.com/reference/index.html"
+    http = _FakeFetcher({url: SHELL_PAGE})
+    browser = _FakeFetcher({})
+
+    assert HybridFetcher(http, browser).fetch_static(url) == SHELL_PAGE
+    assert browser.fetched == []
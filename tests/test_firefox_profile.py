@@ -0,0 +1,73 @@
+"""Test for the Firefox profile template."""
+
+from pathlib import Path
+from typing import Any, List
+
+import pytest
+
+from aws_api_actions import browser
+from aws_api_actions.firefox_profile import (
+    build_profile_template,
+    copy_profile,
+    format_user_prefs,
+    measure_startup,
+)
+
+
+def test_format_user_prefs() -> None:
+    """Test that the preferences are written as sorted user_pref calls."""
+    assert format_user_prefs(
+        {"network.prefetch-next": False, "browser.startup.page": 0}
+    ) == (
+        'user_pref("browser.startup.page", 0);\n'
+        'user_pref("network.prefetch-next", false);\n'
+    )
+
+
+def test_copy_profile_template(tmp_path: Path) -> None:
+    """Test that copies of the template leave the lock files behind."""
+    template = build_profile_template(str(tmp_path / "template"))
+    (tmp_path / "template" / "parent.lock").write_text("")
+
+    copy = Path(copy_profile(template, str(tmp_path / "copy")))
+
+    assert (copy / "user.js").read_text().startswith("user_pref(")
+    assert not (copy / "parent.lock").exists()
+
+
+class _FakeDriver:
+    """Webdriver recording its options."""
+
+    def __init__(self, options: Any, service: Any) -> None:
+        """Record the options."""
+        self.options = options
+
+    def quit(self) -> None:
+        """Quit the webdriver."""
+
+
+def test_setup_webdriver_profile(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the profile directory is passed to Firefox."""
+    monkeypatch.setattr(
+        "aws_api_actions.browser.webdriver.Firefox", _FakeDriver
+    )
+
+    driver = browser.setup_webdriver(
+        "geckodriver", "firefox", ["--headless"], profile_path="/profile"
+    )
+
+    assert driver.options.arguments == ["--headless", "-profile", "/profile"]
+
+
+def test_measure_startup() -> None:
+    """Test that every run starts and quits a webdriver."""
+    started: List[_FakeDriver] = []
+
+    def factory() -> _FakeDriver:
+        started.append(_FakeDriver(None, None))
+        return started[-1]
+
+    timings = measure_startup(factory, runs=2)
+
+    assert len(timings) == 2 and len(started) == 2
+    assert all(timing >= 0 for timing in timings)
@@ -0,0 +1,120 @@
+"""Test for the HAR record and replay of the fetched responses."""
+
+import gzip
+from pathlib import Path
+from typing import List
+
+import pytest
+from seleniumwire.request import Request, Response
+
+from aws_api_actions.exceptions import ParsingError, ScrapingError
+from aws_api_actions.fetcher import HttpFetcher, ReplayFetcher
+from aws_api_actions.har import HarArchive
+from aws_api_actions.mock_server import MockDocsServer, generate_catalog
+from aws_api_actions.pipeline import run_pipeline
+from aws_api_actions.scraper import scrape_service_urls
+
+
+URL = "https://docs.aws.amazon.com/reference/list_s3.html"
+
+
+class _FakeDriver:
+    """Webdriver holding the requests captured by selenium-wire."""
+
+    def __init__(self, requests: List[Request]) -> None:
+        """Initialize the driver with the captured requests."""
+        self._requests = requests
+
+    @property
+    def requests(self) -> List[Request]:
+        """Return the captured requests."""
+        return self._requests
+
+    @requests.deleter
+    def requests(self) -> None:
+        """Clear the captured requests."""
+        self._requests = []
+
+
+def test_record_and_replay(tmp_path: Path) -> None:
+    """Test that a replayed crawl reproduces the recorded one offline."""
+    archive = HarArchive()
+    catalog = generate_catalog(4, 3)
+
+    with MockDocsServer(catalog) as server:
+
+        def record() -> HttpFetcher:
+            return HttpFetcher(har=archive)
+
+        with record() as fetcher:
+            urls = scrape_service_urls(fetcher, server.url)
+        data, _ = run_pipeline(record, urls, fetch_workers=2, parse_workers=1)
+
+    har_path = str(tmp_path / "pages.har.gz")
+    archive.save(har_path)
+    replayed = HarArchive.load(har_path)
+
+    def replay() -> ReplayFetcher:
+        return ReplayFetcher(replayed)
+
+    with replay() as fetcher:
+        assert scrape_service_urls(fetcher, server.url) == urls
+    assert run_pipeline(replay, urls, parse_workers=1) == (data, [])
+    assert len(replayed) == len(archive) == len(urls) + 1
+
+
+def test_replay_fetcher_errors() -> None:
+    """Test the redirects, recorded errors and missing pages of a replay."""
+    archive = HarArchive()
+    archive.add("GET", URL, 301, "", [], [("Location", "s3.html")], b"")
+    archive.add("GET", URL.replace("list_", ""), 200, "OK", [], [], b"page")
+    archive.add("GET", URL + "#fragment", 200, "OK", [], [], b"latest")
+    archive.add("GET", URL.replace("s3", "ec2"), 500, "", [], [], b"")
+
+    fetcher = ReplayFetcher(archive)
+    assert fetcher.fetch(URL.replace("list_", "")) == "page"
+    assert fetcher.fetch(URL) == "latest"
+
+    archive.add("GET", URL, 302, "", [], [("location", "s3.html")], b"")
+    assert fetcher.fetch(URL) == "page"
+    for url in (URL.replace("s3", "ec2"), URL.replace("s3", "iam")):
+        with pytest.raises(ScrapingError):
+            fetcher.fetch(url)
+
+
+def test_record_driver_and_intercept() -> None:
+    """Test that the browser requests are recorded and replayed."""
+    request = Request(method="GET", url=URL, headers=[("Accept", "*/*")])
+    request.response = Response(
+        status_code=200,
+        reason="OK",
+        headers=[("Content-Encoding", "gzip"), ("Content-Type", "text/html")],
+        body=gzip.compress(b"<html>rendered</html>"),
+    )
+    pending = Request(method="GET", url=URL + "?q", headers=[])
+    driver = _FakeDriver([request, pending])
+
+    archive = HarArchive()
+    archive.record_driver(driver)
+
+    assert len(archive) == 1 and driver.requests == []
+
+    replayed = Request(method="GET", url=URL, headers=[])
+    archive.intercept(replayed)
+    assert replayed.response is not None
+    assert replayed.response.body == b"<html>rendered</html>"
+    assert "Content-Encoding" not in replayed.response.headers
+
+    missing = Request(method="GET", url=URL.replace("s3", "ec2"), headers=[])
+    archive.intercept(missing)
+    assert missing.response is not None
+    assert missing.response.status_code == 404
+
+
+def test_load_invalid_archive(tmp_path: Path) -> None:
+    """Test that an invalid HAR file raises a ParsingError."""
+    har_path = tmp_path / "pages.har"
+    har_path.write_text('{"entries": []}')
+
+    with pytest.raises(ParsingError):
+        HarArchive.load(str(har_path))
@@ -0,0 +1,117 @@
+"""Test for the memory tracking and budgets."""
+
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, List
+
+import pytest
+
+from aws_api_actions.fetcher import BrowserFetcher
+from aws_api_actions.memory import (
+    MIB,
+    MemoryMonitor,
+    get_driver_pid,
+    get_process_tree,
+    get_rss,
+    get_tree_rss,
+)
+from aws_api_actions.page_store import PageStore
+
+
+pytestmark = pytest.mark.skipif(
+    not os.path.exists("/proc/self/status"), reason="Reads the RSS from /proc"
+)
+
+
+class _FakeDriver:
+    """Webdriver whose driver process is the test process."""
+
+    def __init__(self, started: List["_FakeDriver"]) -> None:
+        """Initialize the webdriver, recording that it was started."""
+        self.service = SimpleNamespace(process=SimpleNamespace(pid=os.getpid()))
+        self.page_source = "page"
+        self.quit_called = False
+        started.append(self)
+
+    def get(self, url: str) -> None:
+        """Load a page."""
+
+    def quit(self) -> None:
+        """Quit the webdriver."""
+        self.quit_called = True
+
+
+def test_process_tree_rss() -> None:
+    """Test that the RSS of a process tree includes its children."""
+    child = subprocess.Popen(  # noqa: S603
+        [sys.executable, "-c", "import time; time.sleep(30)"]
+    )
+    try:
+        assert child.pid in get_process_tree(os.getpid())
+        assert get_tree_rss(os.getpid()) > get_rss(os.getpid()) > 0
+    finally:
+        child.kill()
+        child.wait()
+
+    assert get_rss(child.pid) == 0
+    assert get_driver_pid(object()) is None
+
+
+def test_monitor_stages() -> None:
+    """Test that the Python peak of each stage is tracked separately."""
+    monitor = MemoryMonitor()
+
+    with monitor.stage("large"):
+        data = bytearray(8 * MIB)
+        del data
+    with monitor.stage("small"):
+        pass
+
+    assert monitor.stages["large"].python_peak >= 8 * MIB
+    assert monitor.stages["small"].python_peak < MIB
+    assert monitor.stages["small"].rss_peak > 0
+    assert monitor.process_peak >= monitor.stages["small"].rss_peak
+
+
+def test_monitor_stage_rss_peak() -> None:
+    """Test that the RSS of a stage is its peak, not its RSS at the end."""
+    monitor = MemoryMonitor(trace_python=False, sample_interval=0.01)
+
+    with monitor.stage("transient"):
+        data = b"x" * (64 * MIB)
+        time.sleep(0.2)
+        del data
+
+    assert monitor.stages["transient"].rss_peak >= (
+        monitor.sample_process() + 32 * MIB
+    )
+
+
+def test_browser_fetcher_restarts_driver_over_budget() -> None:
+    """Test that a webdriver above its budget is replaced on the next page."""
+    started: List[Any] = []
+    monitor = MemoryMonitor(driver_budget=1, trace_python=False)
+    fetcher = BrowserFetcher(lambda: _FakeDriver(started), memory=monitor)
+
+    assert fetcher.fetch("a") == "page"
+    assert fetcher.fetch("b") == "page"
+
+    assert len(started) == 2 and all(d.quit_called for d in started)
+    assert monitor.driver_restarts == 2
+    assert monitor.driver_peak > 0
+
+
+def test_process_budget_flushes_page_store(tmp_path: Path) -> None:
+    """Test the process budget, and the flush keeping the results on disk."""
+    store = PageStore(str(tmp_path))
+    digest = store.put("https://a", "page")
+    store.set_memo(digest, ["s3", {}])
+    store.flush()
+
+    assert MemoryMonitor(process_budget=1).is_process_over_budget()
+    assert not MemoryMonitor().is_process_over_budget()
+    assert store.get_memo(digest) == ["s3", {}]
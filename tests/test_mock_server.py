@@ -0,0 +1,107 @@
+"""Test for the synthetic documentation server and the benchmark."""
+
+from typing import List
+
+import requests
+
+from aws_api_actions.benchmark import measure_backend, run_scenario
+from aws_api_actions.fetcher import HttpFetcher, has_action_content
+from aws_api_actions.mock_server import (
+    MockDocsServer,
+    generate_catalog,
+    get_access_level,
+)
+from aws_api_actions.pipeline import run_pipeline
+from aws_api_actions.scraper import scrape_service_urls
+
+
+def test_generate_catalog() -> None:
+    """Test that the catalog is deterministic and of the requested size."""
+    catalog = generate_catalog(5, 10, seed=1)
+
+    assert catalog == generate_catalog(5, 10, seed=1)
+    assert list(catalog) == [f"svc{i}" for i in range(5)]
+    assert all(len(actions) == 10 for actions in catalog.values())
+
+
+def test_mock_server_pages_parse() -> None:
+    """Test that the served pages parse back into the generated catalog."""
+    catalog = generate_catalog(6, 5)
+
+    with MockDocsServer(catalog) as server, HttpFetcher() as fetcher:
+        urls = scrape_service_urls(fetcher, server.url)
+        data, failed = run_pipeline(
+            HttpFetcher, urls, fetch_workers=2, parse_workers=1
+        )
+
+    assert failed == []
+    assert {prefix: data[prefix]["actions"] for prefix in data} == catalog
+    action = catalog["svc0"][0]
+    category = "access_level:" + get_access_level(action).lower().replace(
+        " ", "_"
+    )
+    assert action in data["svc0"][category]
+
+
+def test_mock_server_throttling_and_rendering() -> None:
+    """Test the throttled requests, retried, and the rendered pages."""
+    catalog = generate_catalog(10, 3)
+
+    with MockDocsServer(catalog, throttle=0.5, rendered=1.0) as server:
+        with HttpFetcher(retries=30, backoff=0) as fetcher:
+            pages = [
+                fetcher.fetch(server.url.replace("index", f"list_{prefix}"))
+                for prefix in catalog
+            ]
+        response = requests.get(server.url + "/missing", timeout=5)
+
+    assert server.throttled > 0
+    assert response.status_code == 404
+    assert not any(has_action_content(html) for html in pages)
+    assert all("atob(" in html for html in pages)
+
+
+def test_run_scenario() -> None:
+    """Test that a small scenario scrapes every page and reports it."""
+    result = run_scenario(2, services=3, actions=4, parse_workers=1)
+
+    assert result.pages == result.services == 6
+    assert result.failed == 0
+    assert result.pages_per_second > 0
+
+
+class _RequestsDriver:
+    """Webdriver loading the pages with requests, without rendering them."""
+
+    def __init__(self) -> None:
+        """Initialize the webdriver without a page."""
+        self.page_source = ""
+        self.quit_count = 0
+
+    def get(self, url: str) -> None:
+        """Load a page."""
+        self.page_source = requests.get(url, timeout=10).text
+
+    def quit(self) -> None:
+        """Quit the webdriver."""
+        self.quit_count += 1
+
+
+def test_measure_backend() -> None:
+    """Test that the startup and page load times of a backend are measured."""
+    drivers: List[_RequestsDriver] = []
+
+    def factory() -> _RequestsDriver:
+        drivers.append(_RequestsDriver())
+        return drivers[-1]
+
+    with MockDocsServer(generate_catalog(4, 3)) as server:
+        with HttpFetcher() as fetcher:
+            urls = scrape_service_urls(fetcher, server.url)
+        result = measure_backend("fake", urls, runs=2, driver_factory=factory)
+
+    assert result.backend == "fake"
+    assert result.pages == 4 and result.failed == 0
+    assert 0 < result.page_mean <= result.page_p95
+    assert len(drivers) == 3
+    assert all(driver.quit_count == 1 for driver in drivers)
@@ -0,0 +1,69 @@
+"""Test for the content-addressed page store."""
+
+import shutil
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from aws_api_actions.exceptions import ParsingError
+from aws_api_actions.page_store import PageStore, get_digest
+
+
+def test_page_store_deduplicates(tmp_path: Path) -> None:
+    """Test that identical bodies are stored once and found from every URL."""
+    store = PageStore(str(tmp_path))
+    digest = store.put("https://a.example.com/list_s3.html", "<p>s3</p>")
+
+    assert store.put("https://b.example.com/list_s3.html", "<p>s3</p>") == (
+        digest
+    )
+    assert digest == get_digest("<p>s3</p>")
+    assert len(list((tmp_path / "blobs").rglob("*.gz"))) == 1
+    assert store.get("https://b.example.com/list_s3.html") == "<p>s3</p>"
+    assert store.get("https://c.example.com/list_s3.html") is None
+
+    store.save()
+    reopened = PageStore(str(tmp_path))
+    assert len(reopened) == 2
+    assert reopened.get("https://a.example.com/list_s3.html") == "<p>s3</p>"
+
+
+def test_page_store_memoize(tmp_path: Path) -> None:
+    """Test that a body is parsed once, including across store instances."""
+    calls: List[str] = []
+
+    def parse(content: str) -> List[str]:
+        calls.append(content)
+        return content.split()
+
+    store = PageStore(str(tmp_path))
+    digest = store.put("https://a.example.com/", "a b")
+
+    assert store.memoize(digest, parse) == ["a", "b"]
+    assert store.memoize(digest, parse) == ["a", "b"]
+    assert PageStore(str(tmp_path)).memoize(digest, parse) == ["a", "b"]
+    assert calls == ["a b"]
+
+    assert store.memoize(digest, parse, namespace="v2") == ["a", "b"]
+    assert len(calls) == 2
+
+
+def test_page_store_memoize_content(tmp_path: Path) -> None:
+    """Test that a body passed to memoize isn't read back from its blob."""
+    store = PageStore(str(tmp_path))
+    digest = store.put("https://a.example.com/", "a b")
+    shutil.rmtree(tmp_path / "blobs")
+
+    assert store.memoize(digest, str.split, content="a b") == ["a", "b"]
+
+
+def test_page_store_errors(tmp_path: Path) -> None:
+    """Test that a corrupt index or a missing blob raises a ParsingError."""
+    store = PageStore(str(tmp_path))
+    with pytest.raises(ParsingError):
+        store.get_content(get_digest("missing"))
+
+    (tmp_path / "index.json").write_text("{")
+    with pytest.raises(ParsingError):
+        PageStore(str(tmp_path))
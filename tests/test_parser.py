@@ -0,0 +1,136 @@
+"""Test for the Service Authorization Reference parser."""
+
+from pathlib import Path
+from typing import Dict
+
+import pytest
+
+from aws_api_actions import scraper
+from aws_api_actions.exceptions import ParsingError, ScrapingError
+from aws_api_actions.fetcher import Fetcher
+from aws_api_actions.loader import load_from_file
+from aws_api_actions.parser import (
+    get_access_level_category,
+    parse_service_index,
+    parse_service_page,
+)
+
+
+INDEX_HTML = """
+<div id="main-col-body">
+  <a href="./list_amazons3.html">Amazon S3</a>
+  <a href="list_amazonec2.html#amazonec2-actions-as-permissions">EC2</a>
+  <a href="./list_amazons3.html">Amazon S3 again</a>
+  <a href="reference_policies_elements.html">Elements</a>
+</div>
+"""
+
+SERVICE_HTML = """
+<p>Amazon S3 (service prefix: <code>s3</code>) provides the following.</p>
+<h2>Actions defined by Amazon S3</h2>
+<table>
+  <tr>
+    <th>Actions</th><th>Description</th><th>Access level</th>
+    <th>Resource types (*required)</th><th>Condition keys</th>
+    <th>Dependent actions</th>
+  </tr>
+  <tr>
+    <td rowspan="2"><a>GetObject</a></td><td>Grants permission</td>
+    <td>Read</td><td>object*</td><td></td><td></td>
+  </tr>
+  <tr><td></td><td>s3:ExistingObjectTag/${TagKey}</td><td></td></tr>
+  <tr>
+    <td><a>PutBucketPolicy</a> [permission only]</td><td>Grants</td>
+    <td>Permissions management</td><td>bucket*</td><td></td><td></td>
+  </tr>
+</table>
+<h2>Resource types defined by Amazon S3</h2>
+<table>
+  <tr><th>Resource types</th><th>ARN</th><th>Condition keys</th></tr>
+  <tr><td>bucket</td><td>arn:${Partition}:s3:::${BucketName}</td><td></td></tr>
+  <tr><td>object</td><td>arn:${Partition}:s3:::${Key}</td><td></td></tr>
+</table>
+<h2>Condition keys for Amazon S3</h2>
+<table>
+  <tr><th>Condition keys</th><th>Description</th><th>Type</th></tr>
+  <tr><td>s3:ExistingObjectTag/${TagKey}</td><td>Filters</td><td>String</td></tr>
+  <tr><td>s3:prefix</td><td>Filters</td><td>String</td></tr>
+</table>
+"""
+
+
+def test_parse_service_index() -> None:
+    """Test that the service pages are found and made absolute."""
+    base_url = "https://docs.aws.amazon.com/service-authorization/reference/"
+
+    assert parse_service_index(INDEX_HTML, base_url) == [
+        f"{base_url}list_amazons3.html",
+        f"{base_url}list_amazonec2.html",
+    ]
+
+
+def test_parse_service_page() -> None:
+    """Test that every category is extracted from a single page."""
+    prefix, categories = parse_service_page(SERVICE_HTML)
+
+    assert prefix == "s3"
+    assert categories == {
+        "actions": ["GetObject", "PutBucketPolicy"],
+        "access_level:read": ["GetObject"],
+        "access_level:permissions_management": ["PutBucketPolicy"],
+        "resource_types": ["bucket", "object"],
+        "condition_keys": ["s3:ExistingObjectTag/${TagKey}", "s3:prefix"],
+    }
+
+
+def test_parse_service_page_errors() -> None:
+    """Test that pages missing the service prefix or actions are rejected."""
+    with pytest.raises(ParsingError):
+        parse_service_page(SERVICE_HTML.replace("service prefix", "prefix"))
+
+    with pytest.raises(ParsingError):
+        parse_service_page(SERVICE_HTML.replace("<th>Actions</th>", "<th/>"))
+
+
+def test_get_access_level_category() -> None:
+    """Test the access level category names."""
+    assert get_access_level_category(" Tagging ") == "access_level:tagging"
+    assert (
+        get_access_level_category("Permissions  management")
+        == "access_level:permissions_management"
+    )
+
+
+class _PageFetcher(Fetcher):
+    """Fetcher serving pages from a dictionary."""
+
+    def __init__(self, pages: Dict[str, str]) -> None:
+        """Initialize the fetcher with its pages."""
+        self.pages = pages
+
+    def fetch(self, url: str) -> str:
+        """Return the page, or fail if it is unknown."""
+        if url not in self.pages:
+            raise ScrapingError(f"Not found: {url}")
+
+        return self.pages[url]
+
+
+def test_scraper_main(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the scraper exports every category and reports failures."""
+    index_url = "https://docs.example.com/reference/index.html"
+    fetcher = _PageFetcher(
+        {
+            index_url: INDEX_HTML,
+            "https://docs.example.com/reference/list_amazons3.html": (
+                SERVICE_HTML
+            ),
+        }
+    )
+    monkeypatch.setattr(scraper, "_create_http_fetcher", lambda *args: fetcher)
+    output = str(tmp_path / "actions.json")
+
+    with pytest.raises(SystemExit):
+        scraper.main(["--index-url", index_url, "--output", output])
+
+    assert load_from_file(output) == {"s3": parse_service_page(SERVICE_HTML)[1]}
@@ -0,0 +1,129 @@
+"""Test for the staged scraping pipeline."""
+
+from pathlib import Path
+from typing import Dict
+
+import pytest
+
+from aws_api_actions.exceptions import ScrapingError
+from aws_api_actions.fetcher import Fetcher
+from aws_api_actions.memory import MemoryMonitor
+from aws_api_actions.page_store import PageStore
+from aws_api_actions.parser import SERVICE_PAGE_NAMESPACE
+from aws_api_actions.pipeline import run_pipeline
+from aws_api_actions.profiling import BACKEND_CPROFILE, Profiler
+
+
+PAGE = """
+<p>(service prefix: <code>{prefix}</code>)</p>
+<table>
+  <tr><th>Actions</th><th>Description</th><th>Access level</th></tr>
+  <tr><td>{action}</td><td>Grants</td><td>Read</td></tr>
+</table>
+"""
+
+
+class _PageFetcher(Fetcher):
+    """Fetcher serving pages from a dictionary."""
+
+    def __init__(self, pages: Dict[str, str]) -> None:
+        """Initialize the fetcher with its pages."""
+        self.pages = pages
+
+    def fetch(self, url: str) -> str:
+        """Return the page, or fail if it is unknown."""
+        if url not in self.pages:
+            raise ScrapingError(f"Not found: {url}")
+
+        return self.pages[url]
+
+
+PAGES = {
+    **{
+        f"https://docs.example.com/list_svc{i}.html": PAGE.format(
+            prefix=f"svc{i}", action=f"Get{i}"
+        )
+        for i in range(20)
+    },
+    # A second page of the same service, merged into it.
+    "https://docs.example.com/list_svc0_v2.html": PAGE.format(
+        prefix="svc0", action="Put0"
+    ),
+    "https://docs.example.com/list_broken.html": "<p>Not a service</p>",
+}
+
+
+def test_run_pipeline(tmp_path: Path) -> None:
+    """Test that every page is fetched, parsed and merged once."""
+    urls = [*PAGES, "https://docs.example.com/list_missing.html"]
+    store = PageStore(str(tmp_path))
+
+    data, failed = run_pipeline(
+        lambda: _PageFetcher(PAGES),
+        urls,
+        store,
+        fetch_workers=3,
+        parse_workers=2,
+        queue_size=1,
+    )
+
+    assert len(data) == 20
+    assert sorted(data["svc0"]["actions"]) == ["Get0", "Put0"]
+    assert data["svc7"]["access_level:read"] == ["Get7"]
+    assert sorted(failed) == [
+        "https://docs.example.com/list_broken.html",
+        "https://docs.example.com/list_missing.html",
+    ]
+
+    digest = store.get_digest("https://docs.example.com/list_svc7.html")
+    assert digest is not None
+    assert store.get_memo(digest, SERVICE_PAGE_NAMESPACE) is not None
+
+
+def test_run_pipeline_memory_budget(tmp_path: Path) -> None:
+    """Test that the caches are only flushed when there is a page store."""
+    for store, flushes in ((None, 0), (PageStore(str(tmp_path)), 1)):
+        memory = MemoryMonitor(process_budget=1, trace_python=False)
+        run_pipeline(
+            lambda: _PageFetcher(PAGES),
+            list(PAGES)[:16],
+            store,
+            fetch_workers=1,
+            parse_workers=1,
+            memory=memory,
+        )
+
+        assert memory.flushes == flushes
+
+
+def test_run_pipeline_stage_failure() -> None:
+    """Test that a failing stage raises a ScrapingError instead of hanging."""
+
+    def factory() -> Fetcher:
+        raise RuntimeError("No browser")
+
+    with pytest.raises(ScrapingError):
+        run_pipeline(factory, list(PAGES), fetch_workers=2, parse_workers=1)
+
+
+def test_run_pipeline_profiled(tmp_path: Path) -> None:
+    """Test that each stage of a profiled run gets a profile."""
+    profiler = Profiler(str(tmp_path), backend=BACKEND_CPROFILE)
+
+    data, failed = run_pipeline(
+        lambda: _PageFetcher(PAGES),
+        list(PAGES),
+        fetch_workers=2,
+        parse_workers=2,
+        profiler=profiler,
+    )
+    profiler.write()
+
+    assert len(data) == 20
+    assert failed == ["https://docs.example.com/list_broken.html"]
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "collect.prof",
+        "dispatch.prof",
+        "fetch.prof",
+        "parse.prof",
+    ]
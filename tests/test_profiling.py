@@ -0,0 +1,118 @@
+"""Test for the profiling of the stages of a run."""
+
+import pstats
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from aws_api_actions import profiling
+from aws_api_actions.profiling import (
+    BACKEND_CPROFILE,
+    CONCURRENT_PROFILES,
+    Profiler,
+    get_backend,
+    profile_call,
+)
+
+
+def _work(count: int) -> int:
+    """Spend a little time in a function easy to find in a profile."""
+    return sum(number * number for number in range(count))
+
+
+def test_profiler_disabled(tmp_path: Path) -> None:
+    """Test that a profiler without a directory profiles nothing."""
+    profiler = Profiler()
+    with profiler.stage("index"):
+        _work(1000)
+    profiler.write()
+
+    assert not profiler.enabled
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_profiler_merges_threads(tmp_path: Path) -> None:
+    """Test that a stage entered by several threads gets one profile."""
+    profiler = Profiler(str(tmp_path / "profiles"), backend=BACKEND_CPROFILE)
+
+    def fetch() -> None:
+        with profiler.stage("fetch"):
+            _work(1000)
+
+    threads = [threading.Thread(target=fetch) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    with profiler.stage("export"):
+        _work(1000)
+    profiler.write()
+
+    assert sorted(path.name for path in (tmp_path / "profiles").iterdir()) == [
+        "export.prof",
+        "fetch.prof",
+    ]
+    stats = pstats.Stats(str(tmp_path / "profiles" / "fetch.prof"))
+    calls = {
+        function[2]: value[1]
+        for function, value in stats.stats.items()  # type: ignore[attr-defined]
+    }
+    if CONCURRENT_PROFILES:
+        assert calls["_work"] == 3
+    else:
+        assert 1 <= calls["_work"] <= 3
+
+
+def test_profiler_single_active_profile(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that stages overlapping a profiled one are skipped if needed."""
+    monkeypatch.setattr(profiling, "CONCURRENT_PROFILES", False)
+    profiler = Profiler(str(tmp_path), backend=BACKEND_CPROFILE)
+    entered, done = threading.Event(), threading.Event()
+
+    def fetch() -> None:
+        with profiler.stage("fetch"):
+            entered.set()
+            done.wait()
+
+    thread = threading.Thread(target=fetch)
+    thread.start()
+    entered.wait()
+    with profiler.stage("collect"):
+        _work(1000)
+    done.set()
+    thread.join()
+    profiler.write()
+
+    assert [path.name for path in tmp_path.iterdir()] == ["fetch.prof"]
+
+
+def test_profile_call_in_process_pool(tmp_path: Path) -> None:
+    """Test that the profiles of pool processes are merged into a stage."""
+    profiler = Profiler(str(tmp_path), backend=BACKEND_CPROFILE)
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(profile_call, _work, 100) for _ in range(4)]
+        for future in futures:
+            result, raw_stats = future.result()
+            profiler.add_stats("parse", raw_stats)
+
+    assert result == _work(100)
+    profiler.write()
+    stats = pstats.Stats(str(tmp_path / "parse.prof"))
+    assert any(
+        function[2] == "_work" and value[1] == 4
+        for function, value in stats.stats.items()  # type: ignore[attr-defined]
+    )
+
+
+def test_get_backend(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that cProfile is used when pyinstrument is missing."""
+    monkeypatch.setitem(sys.modules, "pyinstrument", None)
+    assert get_backend() == BACKEND_CPROFILE
+
+    with pytest.raises(ValueError):
+        get_backend("perf")
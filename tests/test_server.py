@@ -0,0 +1,225 @@
+"""Test for the catalog lookup service."""
+
+import json
+import os
+import signal
+import threading
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Any, Iterator, Tuple
+
+import pytest
+
+from aws_api_actions.catalog import expand_action
+from aws_api_actions.exporter import output_to_json, sort_data
+from aws_api_actions.server import (
+    CatalogServer,
+    CatalogState,
+    main,
+    watch_dataset,
+)
+
+
+DATA = {
+    "s3": {"actions": ["GetObject", "GetBucketPolicy", "PutObject"]},
+    "ec2": {"actions": ["DescribeInstances"]},
+}
+
+
+@pytest.fixture
+def server(tmp_path: Path) -> Iterator[CatalogServer]:
+    """Serve the test dataset on a random port."""
+    file_path = str(tmp_path / "actions.json")
+    output_to_json(file_path, DATA)
+
+    catalog_server = CatalogServer(("127.0.0.1", 0), CatalogState(file_path))
+    thread = threading.Thread(target=catalog_server.serve_forever, daemon=True)
+    thread.start()
+
+    yield catalog_server
+
+    catalog_server.shutdown()
+    catalog_server.server_close()
+
+
+def _send(
+    server: CatalogServer, path: str, method: str = "GET"
+) -> Tuple[int, Any]:
+    """Send a request to the server and return the status and json body."""
+    host, port = server.server_address[:2]
+    request = urllib.request.Request(
+        f"http://{host!s}:{port}{path}", method=method
+    )
+    try:
+        with urllib.request.urlopen(request) as response:  # noqa: S310
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as err:
+        return err.code, json.loads(err.read())
+
+
+def _request(server: CatalogServer, path: str, method: str = "GET") -> Any:
+    """Send a successful request to the server and return the json body."""
+    status, body = _send(server, path, method)
+    assert status == 200
+    return body
+
+
+def _rewrite(file_path: str, data: Any) -> None:
+    """Rewrite the dataset with a modification time in the future."""
+    output_to_json(file_path, data)
+    mtime = time.time() + 10
+    os.utime(file_path, (mtime, mtime))
+
+
+def test_expand_action() -> None:
+    """Test the expansion of action patterns."""
+    assert expand_action(DATA, "s3:Get*") == [
+        "s3:GetBucketPolicy",
+        "s3:GetObject",
+    ]
+    assert expand_action(DATA, "*:describe*") == ["ec2:DescribeInstances"]
+    assert expand_action(DATA, "iam:*") == []
+    assert expand_action(DATA, "S3:GET?BJECT") == ["s3:GetObject"]
+    assert expand_action(DATA, "s3:[G]et*") == []
+    assert len(expand_action(DATA, "*")) == 4
+
+
+def test_server_lookups(server: CatalogServer) -> None:
+    """Test the lookup endpoints."""
+    assert _request(server, "/services") == ["ec2", "s3"]
+    assert _request(server, "/services/ec2/actions") == ["DescribeInstances"]
+    assert _request(server, "/services/EC2") == DATA["ec2"]
+    assert _request(server, "/expand?action=s3:Get*") == [
+        "s3:GetBucketPolicy",
+        "s3:GetObject",
+    ]
+
+
+def test_server_reload(server: CatalogServer) -> None:
+    """Test that reloading swaps in the new dataset."""
+    assert _request(server, "/expand?action=iam:*") == []
+
+    output_to_json(
+        server.state.file_path, {**DATA, "iam": {"actions": ["GetRole"]}}
+    )
+    assert _request(server, "/reload", method="POST") == {"services": 3}
+    assert _request(server, "/expand?action=iam:*") == ["iam:GetRole"]
+
+
+def test_server_errors(server: CatalogServer) -> None:
+    """Test the error responses."""
+    assert _send(server, "/services/iam")[0] == 404
+    assert _send(server, "/services/iam/actions")[0] == 404
+    assert _send(server, "/services/s3/unknown")[0] == 404
+    assert _send(server, "/unknown")[0] == 404
+    assert _send(server, "/unknown", method="POST")[0] == 404
+    assert _send(server, "/expand")[0] == 400
+    assert _send(server, "/expand?action=s3")[0] == 400
+
+    os.remove(server.state.file_path)
+    assert _send(server, "/reload", method="POST")[0] == 500
+    assert _request(server, "/services") == ["ec2", "s3"]
+
+
+def test_expand_cache_is_case_insensitive(tmp_path: Path) -> None:
+    """Test that patterns differing only by case share a cache entry."""
+    file_path = str(tmp_path / "actions.json")
+    output_to_json(file_path, DATA)
+    state = CatalogState(file_path)
+
+    assert state.expand("S3:GET*") is state.expand("s3:get*")
+
+
+def test_snapshot_survives_reload(tmp_path: Path) -> None:
+    """Test that a snapshot keeps its dataset consistent across a reload."""
+    file_path = str(tmp_path / "actions.json")
+    output_to_json(file_path, DATA)
+    state = CatalogState(file_path)
+    snapshot = state.snapshot
+
+    _rewrite(file_path, {"iam": {"actions": ["GetRole"]}})
+    state.reload()
+
+    service = snapshot.find_service("S3")
+    assert service is not None
+    assert snapshot.data[service] == sort_data(DATA)["s3"]
+    assert snapshot.expand("s3:GetObject") == ("s3:GetObject",)
+    assert state.find_service("s3") is None
+
+
+def test_reload_if_changed(tmp_path: Path) -> None:
+    """Test that the dataset is only reloaded when its file changes."""
+    file_path = str(tmp_path / "actions.json")
+    output_to_json(file_path, DATA)
+    state = CatalogState(file_path)
+
+    data = state.data
+    state.reload_if_changed()
+    assert state.data is data
+
+    _rewrite(file_path, {"iam": {"actions": ["GetRole"]}})
+    state.reload_if_changed()
+    assert state.data == {"iam": {"actions": ["GetRole"]}}
+
+
+def test_failed_reload_keeps_dataset(tmp_path: Path) -> None:
+    """Test that a failed reload keeps serving the current dataset."""
+    file_path = tmp_path / "actions.json"
+    output_to_json(str(file_path), DATA)
+    state = CatalogState(str(file_path))
+
+    file_path.write_text("{not json")
+    state.safe_reload()
+    assert state.data == sort_data(DATA)
+
+    file_path.unlink()
+    state.reload_if_changed()
+    assert state.data == sort_data(DATA)
+
+
+def test_watch_dataset(tmp_path: Path) -> None:
+    """Test that the watcher reloads the dataset when its file changes."""
+    file_path = str(tmp_path / "actions.json")
+    output_to_json(file_path, DATA)
+    state = CatalogState(file_path)
+
+    stop = threading.Event()
+    thread = watch_dataset(state, 0.01, stop)
+    try:
+        _rewrite(file_path, {"iam": {"actions": ["GetRole"]}})
+        deadline = time.monotonic() + 5
+        while "iam" not in state.data and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        stop.set()
+        thread.join()
+
+    assert "iam" in state.data
+
+
+def test_main(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the serve entry point until it is interrupted."""
+    file_path = str(tmp_path / "actions.json")
+    output_to_json(file_path, DATA)
+    previous_handler = signal.getsignal(signal.SIGHUP)
+
+    def serve_forever(self: CatalogServer) -> None:
+        handler = signal.getsignal(signal.SIGHUP)
+        assert callable(handler)
+        handler(signal.SIGHUP, None)
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(CatalogServer, "serve_forever", serve_forever)
+    main([file_path, "--port", "0", "--watch-interval", "0.01"])
+
+    assert signal.getsignal(signal.SIGHUP) == previous_handler
+
+
+def test_main_missing_dataset(tmp_path: Path) -> None:
+    """Test that a missing dataset exits with an error instead of crashing."""
+    with pytest.raises(SystemExit) as exc_info:
+        main([str(tmp_path / "missing.json"), "--port", "0"])
+
+    assert exc_info.value.code == 1
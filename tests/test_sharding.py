@@ -0,0 +1,128 @@
+"""Test for the sharded crawls and the merge of their outputs."""
+
+from pathlib import Path
+
+import pytest
+
+from aws_api_actions.exceptions import OutputError, ParsingError
+from aws_api_actions.exporter import (
+    fan_out,
+    get_sink,
+    iter_records,
+    sort_data,
+)
+from aws_api_actions.loader import iter_records_from_file, load_from_file
+from aws_api_actions.sharding import (
+    Shard,
+    get_shard_number,
+    merge_records,
+    parse_shard,
+    select_shard_urls,
+)
+
+
+DATA = {
+    "s3": {
+        "condition_keys": [],
+        "actions": ["PutObject", "GetObject"],
+    },
+    "ec2": {"actions": ["RunInstances"]},
+    "iam": {},
+    "lambda": {"actions": ["InvokeFunction"], "resource_types": ["function"]},
+}
+
+
+def test_parse_shard() -> None:
+    """Test the ``i/N`` shard notation."""
+    assert parse_shard("2/4") == Shard(2, 4)
+    assert str(Shard(2, 4)) == "2/4"
+
+    for text in ("0/4", "5/4", "4", "a/b"):
+        with pytest.raises(ValueError):
+            parse_shard(text)
+
+
+def test_select_shard_urls() -> None:
+    """Test that every page belongs to exactly one shard, on any host."""
+    urls = [
+        f"https://docs.aws.amazon.com/list_service{i}.html" for i in range(40)
+    ]
+    shards = [select_shard_urls(urls, Shard(i, 4)) for i in range(1, 5)]
+
+    assert sorted(url for shard in shards for url in shard) == sorted(urls)
+    assert all(shards)
+    # The assignment must never change between machines or releases.
+    assert get_shard_number("list_amazons3", 4) == 2
+    assert select_shard_urls(
+        ["https://mirror.example.com/v2/list_amazons3.htm"], Shard(2, 4)
+    ) == ["https://mirror.example.com/v2/list_amazons3.htm"]
+
+
+@pytest.mark.parametrize(
+    "filename", ["a.txt", "a.csv.gz", "a.xml", "a.bin", "a.json"]
+)
+def test_iter_records_from_file(tmp_path: Path, filename: str) -> None:
+    """Test that the streaming readers yield the exported records."""
+    file_path = str(tmp_path / filename)
+    fan_out(iter_records(sort_data(DATA)), [get_sink(file_path)])
+
+    assert list(iter_records_from_file(file_path)) == list(
+        iter_records(sort_data(DATA))
+    )
+
+
+def test_merge_shards(tmp_path: Path) -> None:
+    """Test that sorted shards in any format merge into the sorted data."""
+    shards = [
+        ("shard-1.csv.gz", ["s3", "iam"]),
+        ("shard-2.txt", ["lambda"]),
+        ("shard-3.bin", ["ec2"]),
+    ]
+    paths = []
+    for filename, services in shards:
+        paths.append(str(tmp_path / filename))
+        shard_data = {service: DATA[service] for service in services}
+        fan_out(iter_records(sort_data(shard_data)), [get_sink(paths[-1])])
+
+    output = str(tmp_path / "actions.json")
+    fan_out(merge_records(paths), [get_sink(output)])
+
+    assert list(load_from_file(output).items()) == list(sort_data(DATA).items())
+
+
+def test_merge_shards_of_a_service(tmp_path: Path) -> None:
+    """Test that a service in several shards merges its values once."""
+    paths = [str(tmp_path / "shard-1.csv"), str(tmp_path / "shard-2.xml")]
+    shards = [
+        {"s3": {"actions": ["GetObject", "PutObject"]}},
+        {"s3": {"actions": ["DeleteObject", "GetObject"], "arns": []}},
+    ]
+    for path, shard_data in zip(paths, shards, strict=True):
+        fan_out(iter_records(sort_data(shard_data)), [get_sink(path)])
+
+    assert list(merge_records(paths)) == [
+        ("s3", "actions", "DeleteObject"),
+        ("s3", "actions", "GetObject"),
+        ("s3", "actions", "PutObject"),
+        ("s3", "arns", None),
+    ]
+
+
+def test_merge_json_shard(tmp_path: Path) -> None:
+    """Test that json shards, loaded whole, are rejected."""
+    shard = str(tmp_path / "shard.json")
+    fan_out(iter_records(sort_data(DATA)), [get_sink(shard)])
+
+    with pytest.raises(ParsingError):
+        merge_records([shard])
+
+
+def test_merge_unsorted_shard(tmp_path: Path) -> None:
+    """Test that an unsorted shard fails the merge without an output."""
+    shard = str(tmp_path / "shard.csv")
+    fan_out(iter_records(DATA), [get_sink(shard)])
+
+    with pytest.raises(OutputError):
+        fan_out(merge_records([shard]), [get_sink(str(tmp_path / "a.json"))])
+
+    assert not (tmp_path / "a.json").exists()
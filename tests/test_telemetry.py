@@ -0,0 +1,81 @@
+"""Test for the page load telemetry."""
+
+import json
+from pathlib import Path
+from typing import Any, Dict
+
+from aws_api_actions.fetcher import BrowserFetcher
+from aws_api_actions.telemetry import (
+    NAVIGATION_TIMING_SCRIPT,
+    PageTiming,
+    TimingCollector,
+    get_histogram,
+    get_percentile,
+    parse_navigation_timing,
+)
+
+
+TIMING: Dict[str, float] = {
+    "navigationStart": 1000,
+    "domainLookupStart": 1010,
+    "domainLookupEnd": 1030,
+    "connectStart": 1030,
+    "connectEnd": 1080,
+    "requestStart": 1080,
+    "responseStart": 1280,
+    "domContentLoadedEventEnd": 1500,
+    "loadEventEnd": 0,
+}
+
+
+def test_parse_navigation_timing() -> None:
+    """Test the phases computed from the Navigation Timing marks."""
+    timing = parse_navigation_timing("https://docs.aws.amazon.com/a", TIMING)
+
+    assert timing == PageTiming(
+        "https://docs.aws.amazon.com/a", 20, 50, 200, 500, 0
+    )
+    assert timing.host == "docs.aws.amazon.com"
+
+
+def test_percentiles_and_histogram() -> None:
+    """Test the nearest-rank percentiles and the histogram buckets."""
+    values = [float(value) for value in range(1, 101)]
+
+    assert get_percentile(values, 50) == 50
+    assert get_percentile(values, 99) == 99
+    assert get_percentile([], 50) == 0
+
+    histogram = get_histogram([5, 10, 11, 20000])
+    assert histogram["<=10"] == 2 and histogram["<=25"] == 1
+    assert histogram["+Inf"] == 1 and sum(histogram.values()) == 4
+
+
+class _FakeDriver:
+    """Webdriver returning canned Navigation Timing marks."""
+
+    page_source = "<html></html>"
+
+    def get(self, url: str) -> None:
+        """Load the page."""
+
+    def execute_script(self, script: str) -> Any:
+        """Return the Navigation Timing marks."""
+        assert script == NAVIGATION_TIMING_SCRIPT
+        return TIMING
+
+
+def test_browser_fetcher_telemetry(tmp_path: Path) -> None:
+    """Test that the browser records every page in the report."""
+    telemetry = TimingCollector()
+    fetcher = BrowserFetcher(lambda: _FakeDriver(), telemetry=telemetry)
+    fetcher.fetch("https://docs.aws.amazon.com/a")
+    fetcher.fetch("https://docs.aws.amazon.com/b")
+
+    report_path = tmp_path / "timings.json"
+    telemetry.write_report(str(report_path))
+    report = json.loads(report_path.read_text())
+
+    ttfb = report["hosts"]["docs.aws.amazon.com"]["ttfb"]
+    assert ttfb["count"] == 2 and ttfb["p90"] == 200
+    assert len(report["pages"]) == 2